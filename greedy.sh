@@ -12,6 +12,8 @@ processingStyle="avx512<v512<uint64_t>>"
 queries="1.1 1.2 1.3 2.1 2.2 2.3 3.1 3.2 3.3 3.4 4.1 4.2 4.3"
 findBest=""
 findWorst=""
+restart=""
+status=""
 pathArtifacts="."
 pathMal=""
 pathRefRes=""
@@ -22,7 +24,7 @@ pathRefRes=""
 
 function print_help () {
     echo "Usage: greedy.sh [-h] [-sf N] [-r N] [-ps PROCESSING_STYLE] [-q {N.N}]"
-    echo "                 [--findBest] [--findWorst]"
+    echo "                 [--findBest] [--findWorst] [--restart] [--status]"
     echo "                 [--pathArtifacts] [--pathMal] [--pathRefRes]"
     echo ""
     echo "Determines the best and/or worst format combination w.r.t. "
@@ -53,6 +55,16 @@ function print_help () {
     echo "  --findWorst            Determine the worst format combination for "
     echo "                         each query. Output is stored to directory "
     echo "                         '$actualWorstDirName'."
+    echo "  --restart              Discard the runtimes measured so far and "
+    echo "                         search again for all queries. By default, "
+    echo "                         the queries for which the search has already "
+    echo "                         been completed are skipped, and an "
+    echo "                         interrupted search resumes with the first "
+    echo "                         format combination and repetition not "
+    echo "                         measured yet."
+    echo "  --status               Do not search, but show the progress of the "
+    echo "                         search, i.e., how many candidate evaluations "
+    echo "                         have been measured and remain per query."
 }
 
 # *****************************************************************************
@@ -90,6 +102,12 @@ do
         --findWorst)
             findWorst=1
             ;;
+        --restart)
+            restart=1
+            ;;
+        --status)
+            status=1
+            ;;
         --pathArtifacts)
             pathArtifacts=$2
             shift
@@ -113,6 +131,31 @@ done
 pathBest=$pathArtifacts/ssb_formats_bestperf_sf$scaleFactor
 pathWorst=$pathArtifacts/ssb_formats_worstperf_sf$scaleFactor
 
+pathRoot=$(pwd)
+greedyStatus="python3 scripts/greedy_status.py -sf $scaleFactor -r $repetitions --pathArtifacts $pathArtifacts"
+
+# *****************************************************************************
+# Progress of the greedy algorithm
+# *****************************************************************************
+
+if [[ $status ]]
+then
+    $greedyStatus -q $queries
+    exit 0
+fi
+
+# Returns successfully if the given search (best/worst) has already been
+# completed for the given query and we shall not restart it. When restarting,
+# the results and runtimes of the search in the given directory are deleted.
+function is_done () {
+    if [[ $restart ]]
+    then
+        rm -f $3/q$2.csv $3/q${2}_runtimes.csv
+        return 1
+    fi
+    (cd $pathRoot && $greedyStatus -q $2 --isDone $1)
+}
+
 # *****************************************************************************
 # Creation of the results directories
 # *****************************************************************************
@@ -133,18 +176,30 @@ cd MorphStore/Benchmarks/ssb
 # Execution of the greedy algorithm
 # *****************************************************************************
 
+# The search persists each measured runtime and resumes from them, see
+# scripts/greedy_search.py.
 # TODO The reference results should not be necessary here.
-defaultArgs="-sf $scaleFactor -ps $processingStyle -r $repetitions --pathArtifacts $pathArtifacts --pathMal $pathMal --pathRefRes $pathRefRes"
+greedySearch="$pathRoot/scripts/greedy_search.py -sf $scaleFactor -ps $processingStyle -r $repetitions --pathArtifacts $pathArtifacts --pathMal $pathMal --pathRefRes $pathRefRes"
 
 for q in $queries
 do
     if [[ $findBest ]]
     then
-        ./greedy.py $defaultArgs -q $q -o $pathBest --findBest
+        if is_done best $q $pathBest
+        then
+            echo "Skipping the search for the best combination for query $q (already done)."
+        else
+            $greedySearch -q $q -o $pathBest --findBest
+        fi
     fi
     if [[ $findWorst ]]
     then
-        ./greedy.py $defaultArgs -q $q -o $pathWorst --findWorst
+        if is_done worst $q $pathWorst
+        then
+            echo "Skipping the search for the worst combination for query $q (already done)."
+        else
+            $greedySearch -q $q -o $pathWorst --findWorst
+        fi
     fi
 done
 
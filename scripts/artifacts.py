@@ -0,0 +1,155 @@
+"""
+Some utilities for reading the artifacts (CSV files) produced by MorphStore,
+for exporting the data behind the diagrams, and for tracking the dependencies
+between artifacts, required by the diagram generation of both the micro
+benchmarks and the Star Schema Benchmark.
+"""
+
+import io
+import itertools
+import os
+
+import pandas as pd
+
+import cache
+
+# -----------------------------------------------------------------------------
+# Reading MorphStore's monitoring CSV files.
+# -----------------------------------------------------------------------------
+
+# The line separating the preamble of a MorphStore monitoring CSV file from
+# the actual measurements.
+_MEA_MARKER = "[MEA]"
+
+def _parseValue(value):
+    """
+    Converts a field of a MorphStore monitoring CSV file to the type pandas
+    would infer for it.
+    """
+
+    for conv in [int, float]:
+        try:
+            return conv(value)
+        except ValueError:
+            pass
+    return value
+
+def _skipPreamble(f, filePath):
+    """
+    Skips the preamble of the given open MorphStore monitoring CSV file, such
+    that the next line is the header.
+    """
+
+    for line in f:
+        if line.rstrip("\n") == _MEA_MARKER:
+            return
+    raise RuntimeError(
+            "no '{}' line in file '{}'".format(_MEA_MARKER, filePath)
+    )
+
+def readMorphStoreRows(filePath):
+    """
+    Reads all measurements from a MorphStore monitoring CSV file. Returns a
+    list with a dictionary mapping the column names to the values of each row.
+
+    In contrast to csvutils.readMorphStoreCsv, this function does not depend
+    on MorphStore's benchmark tools. The section of results following the
+    measurements (if any) is ignored.
+    """
+
+    rows = []
+    with open(filePath) as f:
+        _skipPreamble(f, filePath)
+        header = next(f).rstrip("\n").split("\t")
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("["):
+                break
+            if line:
+                rows.append(dict(zip(header, map(_parseValue, line.split("\t")))))
+    return rows
+
+def readMorphStoreCsv(filePath, dtype=None):
+    """
+    Reads all measurements from a MorphStore monitoring CSV file into a data
+    frame, optionally with the given types of (some of) its columns, see
+    pandas.read_csv.
+
+    In contrast to csvutils.readMorphStoreCsv, this function does not depend
+    on MorphStore's benchmark tools and allows choosing compact types for the
+    columns. The section of results following the measurements (if any) is
+    ignored.
+    """
+
+    with open(filePath) as f:
+        _skipPreamble(f, filePath)
+        lines = itertools.takewhile(lambda line: not line.startswith("["), f)
+        return pd.read_csv(io.StringIO("".join(lines)), sep="\t", dtype=dtype)
+
+def readMorphStoreQueryRow(filePath):
+    """
+    Reads only the measurements of the entire query (the row with opIdx 0)
+    from a MorphStore monitoring CSV file.
+
+    In contrast to csvutils.readMorphStoreCsv, this function does not parse
+    the entire file, but stops reading as soon as the row of the query has
+    been found, which is usually the first row after the header. Returns a
+    dictionary mapping the column names to the values of that row.
+    """
+
+    with open(filePath) as f:
+        _skipPreamble(f, filePath)
+        # Read the header and seek the row of the entire query.
+        header = next(f).rstrip("\n").split("\t")
+        idxOpIdx = header.index("opIdx")
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) > idxOpIdx and fields[idxOpIdx] == "0":
+                return dict(zip(header, map(_parseValue, fields)))
+
+    raise RuntimeError("no row with opIdx 0 in file '{}'".format(filePath))
+
+# -----------------------------------------------------------------------------
+# Exporting data frames.
+# -----------------------------------------------------------------------------
+
+# The file formats supported by writeTable.
+EXPORT_FORMATS = ["csv", "json", "parquet"]
+
+def writeTable(df, pathDir, name, fmt):
+    """
+    Writes the given data frame to the file <name>.<fmt> in the given
+    directory, using one of the file formats in EXPORT_FORMATS.
+    """
+
+    os.makedirs(pathDir, exist_ok=True)
+    filePath = os.path.join(pathDir, "{}.{}".format(name, fmt))
+    if fmt == "csv":
+        df.to_csv(filePath, index=False)
+    elif fmt == "json":
+        df.to_json(filePath, orient="records")
+    elif fmt == "parquet":
+        df.to_parquet(filePath, index=False)
+    else:
+        raise RuntimeError("unsupported export format: '{}'".format(fmt))
+
+# -----------------------------------------------------------------------------
+# Regarding dependencies between artifacts.
+# -----------------------------------------------------------------------------
+
+def isOutdated(outFilePaths, inPaths):
+    """
+    Returns whether any of the given output files (e.g., the PDF files of a
+    diagram) is missing or older than any of the files in the given input
+    paths (files or directories, see cache.listFiles), like make would decide.
+    """
+
+    try:
+        oldestOut = min(os.path.getmtime(path) for path in outFilePaths)
+    except (OSError, ValueError):
+        # Some output file is missing (or there are no output files at all).
+        return True
+    return any(
+            os.path.getmtime(path) > oldestOut
+            for path in cache.listFiles(inPaths)
+    )
@@ -0,0 +1,247 @@
+"""
+Some utilities for caching the post-processed measurements on disk, required by
+the diagram generation of both the micro benchmarks and the Star Schema
+Benchmark.
+
+Each cache entry holds the data frame returned by one loader. It is keyed by
+the loader's arguments as well as the paths, sizes, and modification times of
+all files the loader reads. Thus, touching any of these files invalidates the
+entry. Besides that, the results of individual expensive computations, such as
+the format selection, can be memoized, keyed by the contents of the files they
+read. All keys also include a fingerprint of the code of the loaders (see
+codeModules), such that changing a loader invalidates the entries.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+
+import pandas as pd
+
+# If pyarrow is available, we store the data frames in the columnar parquet
+# format. Otherwise, we fall back to pickle files.
+try:
+    import pyarrow
+    _ext = "parquet"
+except ImportError:
+    _ext = "pkl"
+
+# -----------------------------------------------------------------------------
+# Configuration.
+# -----------------------------------------------------------------------------
+
+# The directory to store the cache entries in.
+pathCache = None
+
+# Whether to use the cache at all.
+useCache = True
+
+# -----------------------------------------------------------------------------
+# Utilities for building the keys of cache entries.
+# -----------------------------------------------------------------------------
+
+# The modules whose code determines the cached data frames and memoized
+# results, i.e., the loaders and everything they use to read and prepare the
+# measurements. Only those imported by the running program are considered.
+codeModules = [
+    "__main__",
+    "artifacts", "cache", "datachars", "dias_microbenchmarks", "dias_ssb",
+    "formatstrings", "jobs", "roofline", "warehouse",
+    "csvutils", "mal2morphstore.compr", "mal2morphstore.formats",
+    "mal2morphstore.processingstyles",
+]
+
+_codeFingerprint = None
+
+def _fingerprintCode():
+    """
+    Returns a hash of the source code of the imported modules in codeModules,
+    computed once per program run.
+    """
+
+    global _codeFingerprint
+    if _codeFingerprint is None:
+        filePaths = set()
+        for name in codeModules:
+            filePath = getattr(sys.modules.get(name), "__file__", None)
+            if filePath is not None and filePath.endswith(".py"):
+                filePaths.add(os.path.abspath(filePath))
+        h = hashlib.sha1()
+        for filePath in sorted(filePaths):
+            h.update(os.path.basename(filePath).encode())
+            with open(filePath, "rb") as f:
+                h.update(f.read())
+        _codeFingerprint = h.hexdigest()
+    return _codeFingerprint
+
+def _describeFiles(filePaths):
+    """Returns the path, size, and modification time of each given file."""
+
+    desc = []
+    for filePath in sorted(filePaths):
+        st = os.stat(filePath)
+        desc.append([filePath, st.st_size, st.st_mtime_ns])
+    return desc
+
+def listFiles(paths):
+    """
+    Returns the paths of all files in the given paths. Files are returned as
+    they are, directories are traversed recursively, non-existent paths are
+    skipped.
+    """
+
+    filePaths = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirPath, dirNames, fileNames in os.walk(path):
+                dirNames.sort()
+                filePaths.extend(
+                        os.path.join(dirPath, fileName)
+                        for fileName in sorted(fileNames)
+                )
+        elif os.path.exists(path):
+            filePaths.append(path)
+    return filePaths
+
+def hashFiles(paths):
+    """
+    Returns a hash of the paths and contents of all files in the given paths
+    (see listFiles).
+    """
+
+    h = hashlib.sha1()
+    for filePath in listFiles(paths):
+        h.update(filePath.encode())
+        with open(filePath, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+def describe(obj):
+    """
+    Returns a JSON-serializable description of the given object, which is
+    stable across program runs. Objects of user-defined classes are described
+    by their type and attributes.
+    """
+
+    if isinstance(obj, dict):
+        return {str(key): describe(val) for key, val in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [describe(val) for val in obj]
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    if hasattr(obj, "__dict__"):
+        return dict(type=type(obj).__name__, attrs=describe(vars(obj)))
+    return str(obj)
+
+def _makeKey(params, filePaths):
+    """Builds the key of a cache entry."""
+
+    return hashlib.sha1(json.dumps(
+            dict(
+                params=params, files=_describeFiles(filePaths),
+                code=_fingerprintCode()
+            ),
+            sort_keys=True, default=str
+    ).encode()).hexdigest()
+
+# -----------------------------------------------------------------------------
+# Utility for loading through the cache.
+# -----------------------------------------------------------------------------
+
+def _writeDf(df, filePath):
+    if _ext == "parquet":
+        df.to_parquet(filePath)
+    else:
+        df.to_pickle(filePath)
+
+def _readDf(filePath):
+    if _ext == "parquet":
+        return pd.read_parquet(filePath)
+    else:
+        return pd.read_pickle(filePath)
+
+def load(name, params, filePaths, loadFn):
+    """
+    Returns the data frame produced by loadFn, which reads the given files and
+    depends on the given parameters (a JSON-serializable dictionary).
+
+    If the cache holds an entry with the given name for exactly these
+    parameters and files (unchanged since the entry was stored), the data
+    frame is served from the cache. Otherwise, loadFn is called and its result
+    replaces the entry.
+    """
+
+    if not useCache:
+        return loadFn()
+    if pathCache is None:
+        raise RuntimeError("you must set cache.pathCache first")
+
+    key = _makeKey(params, filePaths)
+    keyFilePath = os.path.join(pathCache, "{}.key".format(name))
+    dfFilePath = os.path.join(pathCache, "{}.{}".format(name, _ext))
+
+    # Try to serve the data frame from the cache.
+    if os.path.exists(keyFilePath) and os.path.exists(dfFilePath):
+        with open(keyFilePath) as f:
+            cachedKey = f.read().strip()
+        if cachedKey == key:
+            return _readDf(dfFilePath)
+
+    # Load the data frame and (re-)place it in the cache. The key is written
+    # last, such that an interrupted write does not leave a valid entry.
+    df = loadFn()
+    os.makedirs(pathCache, exist_ok=True)
+    if os.path.exists(keyFilePath):
+        os.remove(keyFilePath)
+    _writeDf(df, dfFilePath)
+    with open(keyFilePath, "w") as f:
+        f.write(key)
+    return df
+
+# -----------------------------------------------------------------------------
+# Utility for memoizing arbitrary results.
+# -----------------------------------------------------------------------------
+
+def memoize(name, params, fn):
+    """
+    Returns the result of fn, which depends only on the given parameters (a
+    JSON-serializable dictionary, which should include hashes of the contents
+    of the files fn reads, see hashFiles).
+
+    If the cache holds an entry with the given name for exactly these
+    parameters, the result is served from the cache. Otherwise, fn is called
+    and its result replaces the (stale) entry. The result must be picklable.
+    """
+
+    if not useCache:
+        return fn()
+    if pathCache is None:
+        raise RuntimeError("you must set cache.pathCache first")
+
+    key = _makeKey(params, [])
+    pathMemo = os.path.join(pathCache, "memo")
+    filePath = os.path.join(pathMemo, "{}.pkl".format(name))
+
+    # Try to serve the result from the cache. Entries which cannot be read
+    # anymore, e.g., since the classes of the pickled objects have changed,
+    # are treated like stale entries.
+    if os.path.exists(filePath):
+        try:
+            with open(filePath, "rb") as f:
+                cachedKey, result = pickle.load(f)
+            if cachedKey == key:
+                return result
+        except Exception:
+            pass
+
+    # Compute the result and (re-)place it in the cache.
+    result = fn()
+    os.makedirs(pathMemo, exist_ok=True)
+    tmpFilePath = "{}.{}.tmp".format(filePath, os.getpid())
+    with open(tmpFilePath, "wb") as f:
+        pickle.dump((key, result), f)
+    os.replace(tmpFilePath, filePath)
+    return result
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+
+"""
+This script calibrates the bit width profiles of our cost model for
+lightweight integer compression algorithms with an adaptive sampling of the
+bit widths (see the calibrate step in vldb2020_ssb.sh), or evaluates this
+sampling on complete profiles.
+
+Profiling each format with every bit width from 1 to 64 is expensive, although
+most runtime curves are almost linear in the bit width. The adaptive sampling
+starts with a few bit widths and bisects an interval of bit widths only if the
+runtimes measured in its middle deviate from the linear interpolation between
+its ends by more than a tolerance. Thus, bit widths are sampled densely where
+the runtime curve changes and sparsely where it is flat. The decisions are
+based on the measured bit widths only. Since one calibration binary profiles
+all formats at once, each round measures the bit widths any format needs. The
+runtimes of all other bit widths are interpolated.
+
+With --measure, the script runs the given calibration binary for the selected
+processing style and a list of bit widths per round, and writes the profile
+with the interpolated runtimes to the standard output. Otherwise, it replays
+the sampling on complete profiles and reports how many bit widths it samples,
+how much of the calibration time this takes, and how accurate the
+interpolated runtimes are.
+"""
+
+import argparse
+import io
+import os
+import shutil
+import subprocess
+import sys
+
+import pandas as pd
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Regarding the calibration profiles
+# -----------------------------------------------------------------------------
+
+# The profiles which are calibrated for all bit widths.
+BW_PROFILES = ["bw_prof_alone.csv", "bw_prof_casc.csv"]
+
+# The internal name of the uncompressed format, whose profile serves as the
+# baseline for all processing styles.
+_FMT_UNCOMPR = "uncompr_f"
+
+# The number of lines before the header of a profile.
+_countPreambleLines = 2
+
+bwMin = 1
+bwMax = 64
+
+def _parseProfile(f, processingStyle):
+    preamble = [next(f) for _ in range(_countPreambleLines)]
+    df = pd.read_csv(f, sep="\t")
+    if processingStyle is not None:
+        df = df[
+                (df["vector_extension"] == processingStyle) |
+                (df["format"] == _FMT_UNCOMPR)
+        ]
+    return preamble, df
+
+def readProfile(filePath, processingStyle=None):
+    """
+    Loads one calibration profile, optionally restricted to the formats of the
+    given processing style. Returns the lines preceding the header and the
+    data frame.
+    """
+
+    with open(filePath) as f:
+        return _parseProfile(f, processingStyle)
+
+def writeProfile(f, preamble, df):
+    """Writes one calibration profile in the format read by readProfile."""
+
+    f.writelines(preamble)
+    df.to_csv(f, sep="\t", index=False)
+
+def _runtimeCols(df):
+    return [col for col in df.columns if col.startswith("runtime")]
+
+# -----------------------------------------------------------------------------
+# Regarding the adaptive sampling
+# -----------------------------------------------------------------------------
+
+# The bit widths sampled in any case. Besides the extremes, these are the
+# powers of two, at which the runtimes of vectorized bit packing tend to
+# change.
+bwsInitial = [1, 8, 16, 32, 64]
+
+def _isLinear(yLo, yMid, yHi, bwLo, bwMid, bwHi, tolerance):
+    yLerp = yLo + (yHi - yLo) * (bwMid - bwLo) / (bwHi - bwLo)
+    return abs(yMid - yLerp) <= tolerance * max(abs(yLo), abs(yMid), abs(yHi))
+
+def _nextBitwidthsFormat(dfMean, tolerance):
+    # The bit widths still to be measured for one format, given the mean
+    # runtimes measured so far (indexed by the bit width).
+    measured = set(dfMean.index)
+    bws = [bw for bw in bwsInitial if bw not in measured]
+    if bws:
+        return bws
+    intervals = list(zip(bwsInitial[:-1], bwsInitial[1:]))
+    while intervals:
+        bwLo, bwHi = intervals.pop()
+        if bwHi - bwLo < 2:
+            continue
+        bwMid = (bwLo + bwHi) // 2
+        if bwMid not in measured:
+            bws.append(bwMid)
+        elif not all(
+                _isLinear(
+                        dfMean.at[bwLo, col], dfMean.at[bwMid, col],
+                        dfMean.at[bwHi, col], bwLo, bwMid, bwHi, tolerance
+                )
+                for col in dfMean.columns
+        ):
+            intervals.append((bwLo, bwMid))
+            intervals.append((bwMid, bwHi))
+    return bws
+
+def nextBitwidths(df, tolerance):
+    """
+    Returns the sorted bit widths to be measured next, given the profile
+    measured so far, or an empty list if the sampling is complete. An
+    interval of bit widths is bisected if any runtime of any format measured
+    in its middle deviates from the linear interpolation between its ends by
+    more than the given relative tolerance.
+    """
+
+    cols = _runtimeCols(df)
+    bws = set(bwsInitial) - set(df["bitwidth"])
+    for _, dfFmt in df.groupby(["vector_extension", "format"], sort=False):
+        bws.update(_nextBitwidthsFormat(
+                dfFmt.groupby("bitwidth")[cols].mean(), tolerance
+        ))
+    return sorted(bws)
+
+def sampleBitwidths(measure, tolerance):
+    """
+    Samples the bit widths adaptively in rounds, see the module's docstring.
+    measure(bws) must return the profile measured with the given bit widths.
+    Returns the profile of all sampled bit widths.
+    """
+
+    dfs = []
+    bws = bwsInitial
+    while bws:
+        dfs.append(measure(bws))
+        bws = nextBitwidths(pd.concat(dfs, ignore_index=True), tolerance)
+    return pd.concat(dfs, ignore_index=True)
+
+def interpolateProfile(df):
+    """
+    Returns the given profile of the sampled bit widths completed with the
+    bit widths from bwMin to bwMax, separately for each pair of processing
+    style and format and each repetition. The runtimes of the added bit widths
+    are interpolated linearly. Of the other columns, only those with the same
+    value at all sampled bit widths (e.g., the number of data elements) are
+    filled in, the others (e.g., the sizes) are left empty, since they were
+    not measured.
+    """
+
+    cols = _runtimeCols(df)
+    dfsOut = []
+    for _, dfGroup in df.groupby(
+            ["vector_extension", "format", "repetition"], sort=False
+    ):
+        dfGroup = dfGroup.set_index("bitwidth").sort_index()
+        dfGroup = dfGroup.reindex(range(bwMin, bwMax + 1))
+        dfGroup[cols] = dfGroup[cols].interpolate(method="index").round()
+        for col in dfGroup.columns.difference(cols):
+            if dfGroup[col].nunique() == 1:
+                dfGroup[col] = dfGroup[col].ffill().bfill()
+        dfsOut.append(dfGroup.reset_index())
+    dfOut = pd.concat(dfsOut, ignore_index=True)[df.columns]
+    return dfOut.astype({
+        col: "Int64" if pd.api.types.is_integer_dtype(dtype) else dtype
+        for col, dtype in df.dtypes.items()
+    })
+
+def measureProfile(binary, repetitions, processingStyle, bws):
+    """
+    Runs the given calibration binary for the given processing style and bit
+    widths. Returns the lines preceding the header and the data frame of the
+    profile it prints.
+    """
+
+    out = subprocess.run(
+            [binary, str(repetitions), processingStyle] + [str(bw) for bw in bws],
+            stdout=subprocess.PIPE, check=True, universal_newlines=True
+    ).stdout
+    return _parseProfile(io.StringIO(out), processingStyle)
+
+def evaluateProfile(df, tolerance):
+    """
+    Replays the adaptive sampling on the given complete profile. Returns the
+    sampled bit widths as well as a data frame with, per pair of processing
+    style and format, the calibration time of all bit widths, the share of it
+    the sampled ones take, and the mean and maximum relative error of the
+    interpolated runtimes.
+    """
+
+    bws = sorted(int(bw) for bw in sampleBitwidths(
+            lambda bws: df[df["bitwidth"].isin(bws)], tolerance
+    )["bitwidth"].unique())
+
+    cols = _runtimeCols(df)
+    rows = []
+    for (ve, fmt), dfFmt in df.groupby(["vector_extension", "format"], sort=False):
+        dfMean = dfFmt.groupby("bitwidth")[cols].mean()
+        dfInterp = dfMean.loc[bws].reindex(dfMean.index).interpolate(method="index")
+        # Ignore runtimes which are (almost) zero, e.g., for compressing
+        # uncompressed data.
+        dfRelErr = ((dfInterp - dfMean).abs() / dfMean.abs()).where(
+                dfMean.abs() >= 0.01 * dfMean.abs().max()
+        )
+        rows.append({
+            "vector_extension": ve,
+            "format": fmt,
+            "time all [s]": dfFmt[cols[0]].sum() / 1000 / 1000,
+            "time share [%]": dfMean.loc[bws, cols[0]].sum() / dfMean[cols[0]].sum() * 100,
+            "mean error [%]": dfRelErr.stack().mean() * 100,
+            "max error [%]": dfRelErr.stack().max() * 100,
+        })
+    return bws, pd.DataFrame(rows)
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Defaults.
+    processingStyle = "avx512<v512<uint64_t>>"
+    tolerance = 0.02
+    repetitions = 10
+    pathProfiles = os.path.join("artifacts", "ssb", "compr_profiles")
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "-ps", "--processingStyle", metavar="PROCESSING_STYLE",
+            help="Only consider the formats of this processing style (and "
+                 "the uncompressed baseline). Defaults to "
+                 "'{}'.".format(processingStyle),
+            default=processingStyle
+    )
+    parser.add_argument(
+            "-t", "--tolerance", metavar="FRACTION", type=float,
+            help="Bisect an interval of bit widths if a runtime in its middle "
+                 "deviates from the linear interpolation by more than this "
+                 "fraction. Defaults to {}.".format(tolerance),
+            default=tolerance
+    )
+    parser.add_argument(
+            "--measure", metavar="BINARY",
+            help="Calibrate a profile by running this calibration binary, "
+                 "which must accept the number of repetitions, the processing "
+                 "style, and the bit widths as arguments, and write it to the "
+                 "standard output.",
+            default=None
+    )
+    parser.add_argument(
+            "-r", "--repetitions", metavar="N", type=int,
+            help="The number of repetitions of the calibration binary. "
+                 "Defaults to {}.".format(repetitions),
+            default=repetitions
+    )
+    parser.add_argument(
+            "--pathProfiles", metavar="PATH",
+            help="The directory of the complete calibration profiles to "
+                 "evaluate the sampling on. Defaults to "
+                 "'{}'.".format(pathProfiles),
+            default=pathProfiles
+    )
+    parser.add_argument(
+            "--pathOut", metavar="PATH",
+            help="Write the profiles interpolated from the sampled bit widths "
+                 "of the evaluated profiles (and copies of the other profiles) "
+                 "to this directory.",
+            default=None
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+    processingStyle = args.processingStyle
+    tolerance = args.tolerance
+    binary = args.measure
+    repetitions = args.repetitions
+    pathProfiles = args.pathProfiles
+    pathOut = args.pathOut
+
+    # -------------------------------------------------------------------------
+    # Calibration
+    # -------------------------------------------------------------------------
+
+    if binary is not None:
+        preambles = []
+        def measure(bws):
+            print("measuring the bit widths {}".format(bws), file=sys.stderr)
+            preamble, df = measureProfile(binary, repetitions, processingStyle, bws)
+            preambles.append(preamble)
+            return df
+        df = sampleBitwidths(measure, tolerance)
+        print(
+                "sampled {} of {} bit widths".format(
+                        df["bitwidth"].nunique(), bwMax - bwMin + 1
+                ),
+                file=sys.stderr
+        )
+        writeProfile(sys.stdout, preambles[0], interpolateProfile(df))
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Evaluation
+    # -------------------------------------------------------------------------
+
+    if pathOut is not None:
+        os.makedirs(pathOut, exist_ok=True)
+        for fileName in sorted(os.listdir(pathProfiles)):
+            if fileName not in BW_PROFILES:
+                shutil.copy(os.path.join(pathProfiles, fileName), pathOut)
+
+    dfsEval = []
+    for fileName in BW_PROFILES:
+        preamble, df = readProfile(
+                os.path.join(pathProfiles, fileName), processingStyle
+        )
+        bws, dfEval = evaluateProfile(df, tolerance)
+        print("{}: sampled {} of {} bit widths: {}".format(
+                fileName, len(bws), bwMax - bwMin + 1, bws
+        ))
+        dfEval.insert(0, "profile", fileName)
+        dfsEval.append(dfEval)
+
+        if pathOut is not None:
+            with open(os.path.join(pathOut, fileName), "w") as f:
+                writeProfile(
+                        f, preamble,
+                        interpolateProfile(df[df["bitwidth"].isin(bws)])
+                )
+
+    dfEval = pd.concat(dfsEval)
+    print()
+    with pd.option_context("display.float_format", "{:.2f}".format):
+        print(dfEval.to_string(index=False))
+    print()
+    print(
+            "The sampled bit widths take {:.1f}% of the time for calibrating "
+            "all bit widths (tolerance {}).".format(
+                    (dfEval["time share [%]"] * dfEval["time all [s]"]).sum() /
+                    dfEval["time all [s]"].sum(),
+                    tolerance
+            )
+    )
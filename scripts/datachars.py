@@ -0,0 +1,126 @@
+"""
+Some utilities for loading the data characteristics of the columns of the
+Star Schema Benchmark queries (see dc_sf<N>), required by the size
+estimation, the tools regarding the greedy format selection, and the diagram
+generation of the Star Schema Benchmark.
+
+Each row of the data characteristics describes one column accessed by one
+operator, including the column's bit width histogram in 64 columns bwHist_1
+to bwHist_64. These are loaded into one contiguous 2-D array of unsigned
+64-bit integers, such that computations on the histograms of all columns are
+operations on that array. The remaining attributes are loaded into a data
+frame with compact types, i.e., the flags as booleans and the names as
+categoricals. Most buckets of the histograms are zero, but a dense array of
+64 buckets per row is still small compared to the data frame of the other
+attributes, so it is not worth a sparse representation.
+"""
+
+import collections
+
+import numpy as np
+import pandas as pd
+
+import artifacts
+
+# -----------------------------------------------------------------------------
+# Columns of the data characteristics.
+# -----------------------------------------------------------------------------
+
+# The bit widths and the columns of their buckets in the histograms.
+BWS = np.arange(1, 64 + 1)
+BW_COLS = ["bwHist_{}".format(bw) for bw in BWS]
+
+# The columns of flags (0 or 1).
+FLAG_COLS = [
+    "Sorted", "Unique", "isResult", "hasRndAccessUnsorted",
+    "hasRndAccessSorted", "isForcedUncompr",
+]
+
+# The columns of names.
+NAME_COLS = ["opName", "colRole", "colName"]
+
+# The types of the columns when reading the files. The flags are converted to
+# booleans afterwards, since pandas does not parse 0 and 1 as booleans.
+_DTYPES = dict(
+        [(col, np.uint64) for col in BW_COLS] +
+        [(col, np.uint8) for col in FLAG_COLS] +
+        [(col, "category") for col in NAME_COLS]
+)
+
+# -----------------------------------------------------------------------------
+# Loading the data characteristics.
+# -----------------------------------------------------------------------------
+
+class DataCharacteristics(collections.namedtuple(
+        "DataCharacteristics", ["attrs", "hist"]
+)):
+    """
+    The data characteristics of the columns of a query (see load).
+
+    - attrs: a data frame with all attributes except for the bit width
+      histograms, indexed from 0
+    - hist: a 2-D array of unsigned 64-bit integers with the bit width
+      histogram in each row of attrs, with one column per bit width (see BWS)
+    """
+
+    __slots__ = ()
+
+    def frame(self):
+        """
+        Returns a data frame with all attributes including the bit width
+        histograms in the columns of BW_COLS, like in the files.
+        """
+
+        dfHist = pd.DataFrame(self.hist, columns=BW_COLS, index=self.attrs.index)
+        cols = list(self.attrs.columns)
+        # In the files, the histograms precede the number of data elements.
+        pos = cols.index("valueCount") if "valueCount" in cols else len(cols)
+        return pd.concat(
+                [self.attrs.iloc[:, :pos], dfHist, self.attrs.iloc[:, pos:]],
+                axis=1
+        )
+
+    def firstPerColumn(self):
+        """
+        Returns the data characteristics of only the first row of each column,
+        since all rows of a column have the same data characteristics, but
+        different access characteristics.
+        """
+
+        isFirst = ~self.attrs["colName"].duplicated().to_numpy()
+        return DataCharacteristics(
+                self.attrs[isFirst].reset_index(drop=True),
+                self.hist[isFirst]
+        )
+
+    def bwProbs(self):
+        """
+        Returns the relative bit width histograms, i.e., a 2-D array of the
+        probability of each bit width in each row.
+        """
+
+        hist = self.hist.astype(float)
+        return hist / np.maximum(hist.sum(axis=1, keepdims=True), 1)
+
+    def bwMax(self):
+        """
+        Returns the maximum bit width of the data elements in each row, or 1 if
+        the histogram is empty.
+        """
+
+        isUsed = self.hist > 0
+        bwMax = len(BWS) - np.argmax(isUsed[:, ::-1], axis=1)
+        return np.where(isUsed.any(axis=1), bwMax, 1)
+
+def load(filePath):
+    """
+    Loads the data characteristics of a query from the given file, see
+    DataCharacteristics.
+    """
+
+    df = artifacts.readMorphStoreCsv(filePath, dtype=_DTYPES)
+    hist = np.ascontiguousarray(df[BW_COLS].to_numpy(dtype=np.uint64))
+    attrs = df.drop(columns=BW_COLS)
+    for col in FLAG_COLS:
+        attrs[col] = attrs[col].astype(bool)
+    return DataCharacteristics(attrs, hist)
@@ -5,23 +5,35 @@ This script generates the diagrams for micro benchmark experiments.
 
 In particular, it generates Figures 4, 5, and 6 in the paper, using the
 measurements obtained through the vldb2020_microbenchmarks.sh script.
+Alternatively, it can export the data behind these diagrams without drawing
+them, analyze whether the operators of the simple query are bandwidth-bound
+or compute-bound (roofline analysis), or analyze up to which selectivity the
+operator classes of Figure 4 working on compressed data beat uncompressed
+processing (selectivity sweep).
 """
 
 import argparse
+import functools
+import math
 import os
 import sys
 
-import matplotlib as mpl
-import matplotlib.patches as patches
-import matplotlib.pyplot as plt
+# Note that matplotlib and seaborn are imported only when the diagrams are
+# drawn.
+import numpy as np
 import pandas as pd
-import seaborn as sns
 
 _pathMorphStore = "MorphStore"
 sys.path.append(os.path.join(_pathMorphStore, "Benchmarks", "tools", "mal2x"))
 import mal2morphstore.processingstyles as pss
 
+import artifacts
+import cache
+import formatstrings
+import jobs
+import roofline
 import utils
+import warehouse
 
 # *****************************************************************************
 # Utility functions
@@ -31,132 +43,168 @@ import utils
 # Loading measurements
 # -----------------------------------------------------------------------------
 
-def loadMeaFigure4():
-    """Loads the measurements for Figure 4 (experiment on operator classes)."""
+def _filesMea(prefix):
+    """
+    Returns the paths of the files of all repetitions of the experiment with
+    the given prefix, e.g., "example", or of the warehouse, if it is used.
+    """
     
-    # Utility function.
-    def getInputSize(inDataFmt):
-        countValues = 512 * 1024 * 1024
-        if inDataFmt == "uncompr_f":
-            bytes = countValues * 8
-        elif inDataFmt.startswith("static_vbp_f<vbp_l<4, "):
-            bytes =  countValues * 4 / 8
-        elif inDataFmt.startswith("static_vbp_f<vbp_l<3, "):
-            bytes =  countValues * 3 / 8
-        else:
-            raise RuntimeError()
-        return bytes / 1024 ** 3
+    if pathWarehouse is not None:
+        return [pathWarehouse]
+    return [
+        os.path.join(pathArtifacts, "{}_{}.csv".format(prefix, repIdx))
+        for repIdx in range(1, countReps + 1)
+    ]
+
+def _readMea(prefix, repIdx):
+    """
+    Reads one repetition of the experiment with the given prefix, e.g.,
+    "example", from its file or from the warehouse, if it is used.
+    """
     
-    # Load the measurements from the individual repetitions.
-    dfs = []
-    for repIdx in range(1, countReps + 1):
-        df = pd.read_csv(
-                os.path.join(pathArtifacts, "example_{}.csv".format(repIdx)),
-                sep="\t",
-                skiprows=2
-        ).query("vector_extension != 'ps_scalar'")
-        dfs.append(df)
+    if pathWarehouse is not None:
+        return warehouse.loadMeasurements(
+                pathWarehouse, prefix, source=warehouseSource, rep=repIdx
+        ).drop(columns=warehouse.RUN_COLS, errors="ignore")
+    return pd.read_csv(
+            os.path.join(pathArtifacts, "{}_{}.csv".format(prefix, repIdx)),
+            sep="\t",
+            skiprows=2
+    )
+
+def _loadMeaFigure4Rep(repIdx):
+    """Loads one repetition of the measurements for Figure 4."""
     
-    # Combine the repetitions.
-    dfMea = pd.concat(dfs)
+    return _readMea("example", repIdx).query("vector_extension != 'ps_scalar'")
+
+def prepareMeaFigure4(dfMea, variantMap):
+    """
+    Derives the attributes required for Figure 4 from the given measurements
+    of all repetitions, using the given long names of the operator classes.
+    """
+    
+    dfMea = formatstrings.categorize(dfMea.copy())
+    
+    # The size of the input column, given its bit width.
+    countValues = 512 * 1024 * 1024
+    bws = formatstrings.mapFormats(dfMea["in_data_f"], "bw")
+    if bws.isna().any():
+        raise RuntimeError("unsupported format: {}".format(
+                dfMea["in_data_f"][bws.isna()].iloc[0]
+        ))
     
     # Derive some attributes and convert units.
-    dfMea["operator_class_long"] = \
-        dfMea.apply(lambda row: variantMap[row["operator_class"]], axis=1)
+    dfMea["operator_class_long"] = dfMea["operator_class"].map(variantMap)
     dfMea["runtime [ms]"] = dfMea["runtime:µs"] / 1000
-    dfMea["input size [MiB]"] = dfMea["in_data_f"].apply(getInputSize) * 1024
+    dfMea["input size [MiB]"] = \
+            bws.astype(float) * countValues / 8 / 1024 ** 3 * 1024
     
     return dfMea
 
-def loadMeaFigure5():
+def loadMeaFigure4():
+    """Loads the measurements for Figure 4 (experiment on operator classes)."""
+    
+    # Load the measurements from the individual repetitions.
+    dfs = jobs.starmap(
+            _loadMeaFigure4Rep, [(repIdx,) for repIdx in range(1, countReps + 1)]
+    )
+    
+    # Combine the repetitions.
+    return prepareMeaFigure4(pd.concat(dfs), variantMap)
+
+def _loadMeaFigure5Rep(repIdx):
+    """Loads one repetition of the measurements for Figure 5."""
+    
+    df = _readMea("singleop", repIdx)
+    df.drop(columns=["pred", "check", "runtime:µs"])
+    return df
+
+# The input columns of Figure 5 and the index of the column of each dataset
+# (modulo 6), or -1 if the dataset is not used.
+_colsFigure5 = ["C1", "C2", "C3", "C4", "C5"]
+_colCodesFigure5 = np.array([0, 1, 2, -1, 3, 4])
+
+def prepareMeaFigure5(dfMea):
     """
-    Loads the measurements for Figure 5 (experiment on a single on-the-fly
-    de/re-compression operator).
+    Derives the attributes required for Figure 5 from the given measurements
+    of all repetitions and calculates their mean.
     """
     
-    # Load the measurements of the individual repetitions.
-    dfs = []
-    for repIdx in range(1, countReps + 1):
-        df = pd.read_csv(
-                os.path.join(pathArtifacts, "singleop_{}.csv".format(repIdx)),
-                sep="\t",
-                skiprows=2
-        )
-        df.drop(columns=["pred", "check", "runtime:µs"])
-        df["sel"] = df["datasetIdx"].apply(
-                lambda datasetIdx: 0.01 if datasetIdx <= 6 else 0.9
-        )
-        df["col"] = (df["datasetIdx"] - 1).mod(6).map({
-            0: "C1",
-            1: "C2",
-            2: "C3",
-            3: "(not used)",
-            4: "C4",
-            5: "C5",
-        })
-        df = df.query("col != '(not used)'").copy()
-        dfs.append(df)
+    # Derive the selectivity and the column from the dataset.
+    colCodes = _colCodesFigure5[(dfMea["datasetIdx"].to_numpy() - 1) % 6]
+    isUsed = colCodes >= 0
+    dfMea = dfMea[isUsed].copy()
+    dfMea["sel"] = np.where(dfMea["datasetIdx"] <= 6, 0.01, 0.9)
+    dfMea["col"] = pd.Categorical.from_codes(
+            colCodes[isUsed], categories=_colsFigure5
+    )
     
-    # Combine the repetitions and calculate the mean.
-    dfMea = pd.concat(dfs).groupby(
+    # Calculate the mean.
+    dfMea = formatstrings.categorize(dfMea).groupby(
             ["vector_extension", "out_pos_f", "in_data_f", "datasetIdx", "sel", "col"],
-            as_index=False
+            as_index=False, observed=True
     ).mean()
     
     # Derive some attributes and convert units.
     dfMea["runtime [ms]"] = dfMea["runtime select:µs"] / 1000
-    def classify(row):
-        outPosF = row["out_pos_f"]
-        inDataF = row["in_data_f"]
-        if outPosF == "uncompr_f" and inDataF == "uncompr_f":
-            return "alluncompr"
-        elif outPosF == "uncompr_f" and inDataF != "uncompr_f":
-            return "outuncompr"
-        else:
-            return "outcompr"
-    dfMea["class"] = dfMea.apply(classify, axis=1)
+    isOutUncompr = \
+            formatstrings.mapFormats(dfMea["out_pos_f"], "family") == "uncompr"
+    isInUncompr = \
+            formatstrings.mapFormats(dfMea["in_data_f"], "family") == "uncompr"
+    dfMea["class"] = np.where(
+            isOutUncompr & isInUncompr, "alluncompr",
+            np.where(isOutUncompr, "outuncompr", "outcompr")
+    )
     
     return dfMea
 
-def loadMeaFigure6():
-    """Loads the measurements for Figure 6 (experiment on a simple query)."""
+def loadMeaFigure5():
+    """
+    Loads the measurements for Figure 5 (experiment on a single on-the-fly
+    de/re-compression operator).
+    """
     
     # Load the measurements of the individual repetitions.
-    dfs = []
-    for repIdx in range(1, countReps + 1):
-        # Load the data.
-        df = pd.read_csv(
-            os.path.join(pathArtifacts, "simplequery_{}.csv".format(repIdx)),
-            sep="\t",
-            skiprows=2
-        )
-        # Discard the warm-up measurement.
-        df = df.query("settingIdx > 1").copy()
-        # Derive some attributes for later.
-        df["case"] = df["settingIdx"].map({
-            2: "case 1\nX=C1\nY=C1",
-            3: "case 2\nX=C1\nY=C4",
-            4: "case 3\nX=C2\nY=C3",
-        })
-        df["fmts"] = df.apply(
-            lambda row: "{} {} {} {}".format(
-                    row["in_data_x_f"][0:2],
-                    row["in_data_y_f"][0:2],
-                    row["mid_pos_xc_f"][0:2],
-                    row["mid_data_yc_f"][0:2]
-            ),
-            axis=1
-        )
-        dfs.append(df)
+    dfs = jobs.starmap(
+            _loadMeaFigure5Rep, [(repIdx,) for repIdx in range(1, countReps + 1)]
+    )
+    
+    # Combine the repetitions.
+    return prepareMeaFigure5(pd.concat(dfs))
+
+def _loadMeaFigure6Rep(repIdx):
+    """Loads one repetition of the measurements for Figure 6."""
+    
+    # Load the data and discard the warm-up measurement.
+    return _readMea("simplequery", repIdx).query("settingIdx > 1")
+
+def prepareMeaFigure6(dfMea):
+    """
+    Derives the attributes required for Figure 6 from the given measurements
+    of all repetitions and calculates their mean.
+    """
     
-    # Combine the repetitions and calculate the mean.
-    dfMea = pd.concat(dfs).groupby(
+    dfMea = formatstrings.categorize(dfMea.copy())
+    dfMea["case"] = dfMea["settingIdx"].map({
+        2: "case 1\nX=C1\nY=C1",
+        3: "case 2\nX=C1\nY=C4",
+        4: "case 3\nX=C2\nY=C3",
+    })
+    # The abbreviations of the formats of the four columns, e.g., "st st de de".
+    abbrevs = [
+        formatstrings.mapFormats(dfMea[colName], "abbrev").astype(str)
+        for colName in ["in_data_x_f", "in_data_y_f", "mid_pos_xc_f", "mid_data_yc_f"]
+    ]
+    dfMea["fmts"] = abbrevs[0].str.cat(abbrevs[1:], sep=" ").astype("category")
+    
+    # Calculate the mean.
+    dfMea = dfMea.groupby(
             [
                 "vector_extension",
                 "in_data_x_f", "in_data_y_f", "mid_pos_xc_f", "mid_data_yc_f",
                 "settingIdx", "case", "fmts"
             ],
-            as_index=False
+            as_index=False, observed=True
     ).mean()
 
     # Convert units of runtimes and sizes.
@@ -169,6 +217,244 @@ def loadMeaFigure6():
         
     return dfMea
 
+def loadMeaFigure6():
+    """Loads the measurements for Figure 6 (experiment on a simple query)."""
+    
+    # Load the measurements of the individual repetitions.
+    dfs = jobs.starmap(
+            _loadMeaFigure6Rep, [(repIdx,) for repIdx in range(1, countReps + 1)]
+    )
+    
+    # Combine the repetitions.
+    return prepareMeaFigure6(pd.concat(dfs))
+
+# -----------------------------------------------------------------------------
+# Regarding the selectivity sweep
+# -----------------------------------------------------------------------------
+
+# The operator classes of the experiment for Figure 4. All but the first one
+# work on compressed data.
+operatorClassesFigure4 = [
+    "uncompressed", "otf de/re-compression", "specialized", "otf morphing"
+]
+
+def calcSelectivitySweep(dfMea):
+    """
+    Averages the runtimes of the given measurements for Figure 4 (see
+    loadMeaFigure4) per operator class and selectivity, and calculates the
+    speedup of each operator class over uncompressed processing at the same
+    selectivity.
+    """
+    
+    dfSweep = dfMea.groupby(
+            ["vector_extension", "operator_class", "sel"], as_index=False
+    )[["runtime [ms]"]].mean()
+    dfUncompr = dfSweep.query("operator_class == 'uncompressed'")[
+            ["vector_extension", "sel", "runtime [ms]"]
+    ].rename(columns={"runtime [ms]": "runtime uncompressed [ms]"})
+    dfSweep = dfSweep.merge(dfUncompr, on=["vector_extension", "sel"], how="left")
+    dfSweep["speedup"] = \
+            dfSweep["runtime uncompressed [ms]"] / dfSweep["runtime [ms]"]
+    # Order the operator classes like in Figure 4.
+    dfSweep["classIdx"] = dfSweep["operator_class"].map(
+            {name: idx for idx, name in enumerate(operatorClassesFigure4)}
+    )
+    return dfSweep.sort_values(
+            ["vector_extension", "classIdx", "sel"]
+    ).drop(columns="classIdx").reset_index(drop=True)
+
+def _interpolateCrossover(sel0, speedup0, sel1, speedup1):
+    """
+    Returns the selectivity between sel0 and sel1 at which the speedup drops
+    to 1, interpolating linearly in the logarithms of the selectivity (if
+    both are positive) and of the speedup.
+    """
+    
+    frac = math.log(speedup0) / (math.log(speedup0) - math.log(speedup1))
+    if sel0 > 0:
+        return math.exp(
+                math.log(sel0) + frac * (math.log(sel1) - math.log(sel0))
+        )
+    return sel0 + frac * (sel1 - sel0)
+
+def findCrossovers(dfSweep):
+    """
+    Determines the crossover selectivity of each compressed operator class in
+    the given sweep (see calcSelectivitySweep), i.e., the selectivity at which
+    it stops beating uncompressed processing. That is where its speedup first
+    drops to 1 or below when the selectivity increases.
+    
+    Returns one row per vector extension and compressed operator class with
+    the crossover selectivity and its status: "crossover" if it lies within
+    the measured selectivities, "always faster" if the class is faster at all
+    of them (the crossover is larger than the largest one, if any), and
+    "never faster" if the class is not faster even at the smallest one, and
+    "no reference" if uncompressed processing was not measured at the same
+    selectivities.
+    """
+    
+    rows = []
+    for (vectorExtension, operatorClass), dfClass in dfSweep.groupby(
+            ["vector_extension", "operator_class"], sort=False
+    ):
+        if operatorClass == "uncompressed":
+            continue
+        dfClass = dfClass.dropna(subset=["speedup"])
+        sels = dfClass["sel"].tolist()
+        speedups = dfClass["speedup"].tolist()
+        crossover = float("nan")
+        if not sels:
+            status = "no reference"
+        elif speedups[0] <= 1:
+            status = "never faster"
+        else:
+            status = "always faster"
+            for i in range(1, len(sels)):
+                if speedups[i] <= 1:
+                    crossover = _interpolateCrossover(
+                            sels[i - 1], speedups[i - 1], sels[i], speedups[i]
+                    )
+                    status = "crossover"
+                    break
+        rows.append({
+            "vector_extension": vectorExtension,
+            "operator_class": operatorClass,
+            "status": status,
+            "crossover sel": crossover,
+            "sel min": sels[0] if sels else float("nan"),
+            "sel max": sels[-1] if sels else float("nan"),
+            "speedup at sel min": speedups[0] if sels else float("nan"),
+            "speedup at sel max": speedups[-1] if sels else float("nan"),
+        })
+    return pd.DataFrame(rows, columns=[
+        "vector_extension", "operator_class", "status", "crossover sel",
+        "sel min", "sel max", "speedup at sel min", "speedup at sel max",
+    ])
+
+def drawSelectivitySweep(dfSweep, dfCrossovers, variantMap):
+    """
+    Draws the runtime of each operator class over the selectivity (one
+    diagram per vector extension), with the crossover selectivities of the
+    compressed classes as dashed vertical lines.
+    """
+    
+    vectorExtensions = list(dfSweep["vector_extension"].unique())
+    colors = sns.color_palette(n_colors=len(operatorClassesFigure4))
+    fig, axs = plt.subplots(
+            1, len(vectorExtensions), squeeze=False,
+            figsize=(7.5 * len(vectorExtensions), 5)
+    )
+    for ax, vectorExtension in zip(axs[0], vectorExtensions):
+        for operatorClass, color in zip(operatorClassesFigure4, colors):
+            dfClass = dfSweep.query(
+                    "vector_extension == @vectorExtension and "
+                    "operator_class == @operatorClass"
+            )
+            if not len(dfClass):
+                continue
+            ax.plot(
+                    dfClass["sel"], dfClass["runtime [ms]"], "o-",
+                    color=color,
+                    label=variantMap.get(operatorClass, operatorClass).replace("\n", ", ")
+            )
+            crossovers = dfCrossovers.query(
+                    "vector_extension == @vectorExtension and "
+                    "operator_class == @operatorClass"
+            )["crossover sel"].dropna()
+            for crossover in crossovers:
+                ax.axvline(crossover, color=color, ls="--", lw=1)
+        if (dfSweep["sel"] > 0).all():
+            ax.set_xscale("log")
+        ax.set_xlabel("selectivity")
+        ax.set_ylabel("runtime [ms]")
+        ax.set_ylim(bottom=0)
+        ax.set_title(vectorExtension)
+    axs[0][-1].legend(loc="upper left", bbox_to_anchor=(1, 1), fontsize="small")
+    
+    sns.despine()
+    fig.tight_layout()
+    utils.saveFig("selectivity_sweep")
+    plt.close("all")
+
+# -----------------------------------------------------------------------------
+# Regarding the roofline analysis
+# -----------------------------------------------------------------------------
+
+# The columns each operator of the simple query (Figure 6) reads and writes.
+# Note that project accesses the data column Y only at the selected positions,
+# but since the selectivity is high, we count the entire column.
+colsByOpSimpleQuery = {
+    "select": ["inDataX", "midPosXC"],
+    "project": ["inDataY", "midPosXC", "midDataYC"],
+    "agg_sum": ["midDataYC"],
+}
+
+def calcTrafficFigure6(dfMea):
+    """
+    Determines the total size (in bytes) and number of data elements of all
+    columns each operator of the simple query reads and writes, along with
+    its runtime, from the measurements for Figure 6.
+    """
+    
+    dfs = []
+    for opName, colNames in colsByOpSimpleQuery.items():
+        df = dfMea[[
+            "vector_extension",
+            "in_data_x_f", "in_data_y_f", "mid_pos_xc_f", "mid_data_yc_f",
+            "case", "fmts"
+        ]].copy()
+        df["opName"] = opName
+        df["bytes"] = sum(
+                dfMea["{}_sizeUsedByte".format(colName)] for colName in colNames
+        )
+        df["values"] = sum(
+                dfMea["{}_countValues".format(colName)] for colName in colNames
+        )
+        df["runtime [s]"] = dfMea["{} [s]".format(opName)]
+        dfs.append(df)
+        
+    return pd.concat(dfs, ignore_index=True)
+
+def drawRooflineFigure6(dfRoofline, bandwidthCeiling):
+    """
+    Draws the roofline diagram of the operators of the simple query in all
+    format combinations, colored by the operator.
+    """
+    
+    colors = ["#7cc8ec", "#f8d35e", "#f47264"]
+    opNames = list(colsByOpSimpleQuery.keys())
+    
+    filename = "roofline_simplequery"
+    
+    fig = plt.figure(figsize=(7, 5))
+    ax = fig.add_subplot(111)
+    roofline.drawRoofline(
+            ax, dfRoofline, bandwidthCeiling, "opName", opNames, colors,
+            "simple query (ceiling {:.1f} GB/s)".format(bandwidthCeiling)
+    )
+    sns.despine()
+    fig.tight_layout()
+    utils.saveFig(filename)
+    
+    utils.drawLegendRect(opNames, colors)
+    utils.saveFig(filename + "_legend")
+
+# -----------------------------------------------------------------------------
+# Regarding diagrams
+# -----------------------------------------------------------------------------
+
+def _drawInContext(drawFn, *args):
+    """
+    Sets up seaborn's plotting context and matplotlib's rcParams, calls the
+    given function for drawing a diagram with the given arguments, and closes
+    all figures afterwards.
+    """
+    
+    sns.set_context("talk")
+    utils.setMatplotlibRcParamsLikeInJupyterNotebook()
+    drawFn(*args)
+    plt.close("all")
+
 # -----------------------------------------------------------------------------
 # Generation of the individual diagrams in the paper.
 # -----------------------------------------------------------------------------
@@ -443,6 +729,67 @@ if __name__ == "__main__":
             help="",
             default=countReps
     )
+    parser.add_argument(
+            "-j", "--jobs", metavar="N", type=int,
+            help="The number of worker processes to use for loading the "
+                 "measurements and for drawing the diagrams. Defaults to 1 "
+                 "(no parallelism).",
+            default=1,
+    )
+    parser.add_argument(
+            "--noCache", dest="useCache", action="store_false",
+            help="Do not use the cache of loaded measurements, but always "
+                 "load them from the artifacts.",
+            default=True,
+    )
+    parser.add_argument(
+            "-f", "--force", action="store_true",
+            help="Regenerate all diagrams, even those which are newer than "
+                 "all artifacts they depend on.",
+            default=False,
+    )
+    parser.add_argument(
+            "--export", metavar="FORMAT",
+            help="Do not draw the diagrams, but export the (averaged) data "
+                 "behind them to files of the given format.",
+            default=None, choices=artifacts.EXPORT_FORMATS,
+    )
+    parser.add_argument(
+            "--roofline", action="store_true",
+            help="Do not draw the diagrams in the paper, but analyze which "
+                 "operators of the simple query (select, project, agg_sum) "
+                 "are bandwidth-bound or compute-bound, by comparing the "
+                 "memory bandwidth they achieve to the bandwidth of this "
+                 "machine.",
+            default=False,
+    )
+    parser.add_argument(
+            "--bandwidth", metavar="GB/S", type=float,
+            help="The memory bandwidth ceiling to use with --roofline. "
+                 "Defaults to the bandwidth measured on this machine.",
+            default=None,
+    )
+    parser.add_argument(
+            "--selectivitySweep", action="store_true",
+            help="Do not draw the diagrams in the paper, but analyze the "
+                 "runtimes of the operator classes of Figure 4 at all "
+                 "measured selectivities, including the selectivity at "
+                 "which each class working on compressed data stops beating "
+                 "uncompressed processing.",
+            default=False,
+    )
+    parser.add_argument(
+            "--warehouse", metavar="FILE",
+            help="Read the measurements from this warehouse (see "
+                 "warehouse.py) instead of the artifact files.",
+            default=None,
+    )
+    parser.add_argument(
+            "--warehouseSource", metavar="NAME",
+            help="The artifact tree in the warehouse to read from with "
+                 "--warehouse. Defaults to 'artifacts'.",
+            default="artifacts",
+    )
     gr = parser.add_mutually_exclusive_group()
     gr.add_argument(
             "--onlyExample", action="store_true",
@@ -464,6 +811,10 @@ if __name__ == "__main__":
     args = parser.parse_args()
     processingStyle = args.processingStyle
     countReps = args.repetitions
+    jobs.countJobs = args.jobs
+    cache.useCache = args.useCache
+    pathWarehouse = args.warehouse
+    warehouseSource = args.warehouseSource
     if args.onlyExample:
         useSingleOp = False
         useSimpleQuery = False
@@ -482,6 +833,10 @@ if __name__ == "__main__":
     # -------------------------------------------------------------------------
     
     pathArtifacts = os.path.join("artifacts", "microbenchmarks")
+    pathCache = os.path.join(pathArtifacts, "cache")
+    pathExport = os.path.join(pathArtifacts, "export")
+    pathRoofline = os.path.join(pathArtifacts, "roofline")
+    pathSelectivity = os.path.join(pathArtifacts, "selectivity")
     
     # -------------------------------------------------------------------------
     # Some more settings
@@ -499,6 +854,152 @@ if __name__ == "__main__":
         "otf morphing"         : VAR_OTFM,
     }
     
+    # -------------------------------------------------------------------------
+    # Roofline analysis
+    # -------------------------------------------------------------------------
+    
+    if args.roofline:
+        if args.bandwidth is None:
+            print("Measuring the memory bandwidth... ", end="")
+            sys.stdout.flush()
+            bandwidths = roofline.measureBandwidth()
+            bandwidthCeiling = max(bandwidths.values())
+            print("done ({}).".format(", ".join(
+                    "{}: {:.1f} GB/s".format(name, bw)
+                    for name, bw in sorted(bandwidths.items())
+            )))
+        else:
+            bandwidthCeiling = args.bandwidth
+        
+        print("Loading measurements... ", end="")
+        sys.stdout.flush()
+        
+        cache.pathCache = pathCache
+        dfRoofline = roofline.analyze(
+                calcTrafficFigure6(cache.load(
+                        "figure6",
+                        dict(
+                            ps=processingStyle, reps=countReps,
+                            source=warehouseSource
+                        ),
+                        _filesMea("simplequery"),
+                        loadMeaFigure6
+                )),
+                bandwidthCeiling
+        )
+        
+        print("done.")
+        
+        # The table is written as a CSV file, unless another format is
+        # requested.
+        artifacts.writeTable(
+                dfRoofline, pathRoofline, "roofline_simplequery",
+                args.export or "csv"
+        )
+        
+        print()
+        print(dfRoofline.assign(
+                case=dfRoofline["case"].str.replace("\n", " ")
+        )[[
+            "case", "fmts", "opName", "bandwidth [GB/s]", "ceiling share [%]",
+            "bound"
+        ]].to_string(index=False, float_format="{:.1f}".format))
+        
+        if not args.export:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+            
+            sns.set_context("talk")
+            utils.setMatplotlibRcParamsLikeInJupyterNotebook()
+            utils.pathDias = pathRoofline
+            drawRooflineFigure6(dfRoofline, bandwidthCeiling)
+        
+        print()
+        print("The roofline analysis is in '{}'.".format(pathRoofline))
+        sys.exit(0)
+    
+    # -------------------------------------------------------------------------
+    # Selectivity sweep
+    # -------------------------------------------------------------------------
+    
+    if args.selectivitySweep:
+        print("Loading measurements... ", end="")
+        sys.stdout.flush()
+        
+        cache.pathCache = pathCache
+        dfSweep = calcSelectivitySweep(cache.load(
+                "figure4",
+                dict(
+                    ps=processingStyle, reps=countReps,
+                    source=warehouseSource, variantMap=variantMap
+                ),
+                _filesMea("example"),
+                loadMeaFigure4
+        ))
+        dfCrossovers = findCrossovers(dfSweep)
+        
+        print("done.")
+        
+        # The tables are written as CSV files, unless another format is
+        # requested.
+        artifacts.writeTable(
+                dfSweep, pathSelectivity, "selectivity_sweep",
+                args.export or "csv"
+        )
+        artifacts.writeTable(
+                dfCrossovers, pathSelectivity, "crossovers",
+                args.export or "csv"
+        )
+        
+        print()
+        print(dfCrossovers.to_string(
+                index=False, float_format="{:.4g}".format
+        ))
+        
+        if not args.export:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+            
+            sns.set_context("talk")
+            utils.setMatplotlibRcParamsLikeInJupyterNotebook()
+            utils.pathDias = pathSelectivity
+            drawSelectivitySweep(dfSweep, dfCrossovers, variantMap)
+        
+        print()
+        print("The selectivity sweep is in '{}'.".format(pathSelectivity))
+        sys.exit(0)
+    
+    # -------------------------------------------------------------------------
+    # Selection of the diagrams to (re-)generate
+    # -------------------------------------------------------------------------
+    
+    # Like make, we regenerate only those diagrams which are older than any of
+    # the artifacts they depend on (the measurements and the scripts), unless
+    # we are forced to regenerate all or only export the data.
+    if not args.force and not args.export:
+        depsScripts = [__file__, utils.__file__]
+        def isOutdated(filenames, prefix):
+            return artifacts.isOutdated(
+                    [
+                        os.path.join(pathArtifacts, "{}.pdf".format(filename))
+                        for filename in filenames
+                    ],
+                    _filesMea(prefix) + depsScripts
+            )
+        useExample = useExample and isOutdated(
+                ["figure4_example"], "example"
+        )
+        useSingleOp = useSingleOp and isOutdated(
+                ["figure5_singleop", "figure5_singleop_legend"], "singleop"
+        )
+        useSimpleQuery = useSimpleQuery and isOutdated(
+                ["figure6_simplequery", "figure6_simplequery_legend"],
+                "simplequery"
+        )
+        if not (useExample or useSingleOp or useSimpleQuery):
+            print("All diagrams are up to date.")
+            sys.exit(0)
+    
     # -------------------------------------------------------------------------
     # Load the measurements
     # -------------------------------------------------------------------------
@@ -506,15 +1007,60 @@ if __name__ == "__main__":
     print("Loading measurements... ", end="")
     sys.stdout.flush()
 
+    cache.pathCache = pathCache
+    # The parameters all cache entries depend on.
+    cacheParams = dict(
+            ps=processingStyle, reps=countReps, source=warehouseSource
+    )
+
     if useExample:
-        dfMeaFigure4 = loadMeaFigure4()
+        dfMeaFigure4 = cache.load(
+                "figure4",
+                dict(cacheParams, variantMap=variantMap),
+                _filesMea("example"),
+                loadMeaFigure4
+        )
     if useSingleOp:
-        dfMeaFigure5 = loadMeaFigure5()
+        dfMeaFigure5 = cache.load(
+                "figure5", cacheParams, _filesMea("singleop"), loadMeaFigure5
+        )
     if useSimpleQuery:
-        dfMeaFigure6 = loadMeaFigure6()
+        dfMeaFigure6 = cache.load(
+                "figure6", cacheParams, _filesMea("simplequery"), loadMeaFigure6
+        )
         
     print("done.")
     
+    # -------------------------------------------------------------------------
+    # Data export
+    # -------------------------------------------------------------------------
+    
+    if args.export:
+        print("Exporting data... ", end="")
+        sys.stdout.flush()
+        
+        # The measurements for Figures 5 and 6 are already averaged over the
+        # repetitions, those for Figure 4 are not.
+        tables = dict()
+        if useExample:
+            tables["figure4_example"] = dfMeaFigure4.groupby(
+                    [
+                        "vector_extension", "out_pos_f", "in_data_f",
+                        "operator_name", "operator_class",
+                        "operator_class_long", "sel"
+                    ],
+                    as_index=False, sort=False, observed=True
+            )[["runtime [ms]", "input size [MiB]"]].mean()
+        if useSingleOp:
+            tables["figure5_singleop"] = dfMeaFigure5
+        if useSimpleQuery:
+            tables["figure6_simplequery"] = dfMeaFigure6
+        for name, df in tables.items():
+            artifacts.writeTable(df, pathExport, name, args.export)
+        
+        print("done.")
+        sys.exit(0)
+    
     # -------------------------------------------------------------------------
     # Diagram generation
     # -------------------------------------------------------------------------
@@ -522,16 +1068,25 @@ if __name__ == "__main__":
     print("Generating diagrams... ", end="")
     sys.stdout.flush()
     
-    sns.set_context("talk")
-
+    import matplotlib.patches as patches
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     utils.pathDias = pathArtifacts
-    utils.setMatplotlibRcParamsLikeInJupyterNotebook()
 
+    # The diagrams to draw and their arguments.
+    figures = []
     if useExample:
-        drawFigure4(dfMeaFigure4, 1 / 10000)
+        figures.append((drawFigure4, dfMeaFigure4, 1 / 10000))
     if useSingleOp:
-        drawFigure5(dfMeaFigure5)
+        figures.append((drawFigure5, dfMeaFigure5))
     if useSimpleQuery:
-        drawFigure6(dfMeaFigure6)
+        figures.append((drawFigure6, dfMeaFigure6))
+
+    # Each diagram sets up its own plotting context, such that they can be
+    # drawn in isolated worker processes.
+    jobs.runIsolated(
+            functools.partial(_drawInContext, *figure) for figure in figures
+    )
     
     print("done.")
\ No newline at end of file
@@ -4,18 +4,22 @@
 This script generates the diagrams for the Star Schema Benchmark experiments.
 
 In particular, it generates Figures 1, 7, 8, 9, and 10 in the paper, using the
-measurements obtained through the vldb2020_ssb.sh script.
+measurements obtained through the vldb2020_ssb.sh script. Alternatively, it can
+export the data behind these diagrams without drawing them, report the
+runtimes of the individual operators of the queries, analyze whether these
+operators are bandwidth-bound or compute-bound (roofline analysis), or project
+the memory footprints and runtimes measured at small scale factors to larger
+ones.
 """
 
 import argparse
+import functools
 import os
 import sys
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+# Note that matplotlib and seaborn are imported only when the diagrams are
+# drawn.
 import pandas as pd
-import seaborn as sns
 
 _pathMorphStore = "MorphStore"
 sys.path.append(os.path.join(_pathMorphStore, "Benchmarks", "tools", "mal2x"))
@@ -26,7 +30,15 @@ import mal2morphstore.formats as formats
 import mal2morphstore.processingstyles as pss
 import csvutils
 
+import artifacts
+import cache
+import datachars
+import jobs
+import projection
+import repetitions
+import roofline
 import utils
+import warehouse
 
 # *****************************************************************************
 # Utility functions
@@ -36,28 +48,12 @@ import utils
 # Regarding memory footprints
 # -----------------------------------------------------------------------------
 
-def _getSizes(q, cs):
+def _chooseFormats(q, cs):
+    """
+    Chooses the compressed formats of all columns (base, intermediate) of the
+    given query using the specified strategy. Returns the chosen format and
+    the number of data elements of each column.
     """
-    Retrieves the physical sizes (in bytes) of all columns (base, intermediate)
-    of the given query using the specified strategy to determine the compressed
-    formats.
-    """
-    
-    def sizeStaticVBP(row):
-        countValues = row[csvutils.ColInfoCols.countValues]
-        bw = row["format"]._bw
-        blockSize = pss.PS_INFOS[processingStyle].vectorSizeBit
-        return int(
-                # That many data elements...
-                int(countValues / blockSize) * blockSize
-                # ... are represented with bw bits each...
-                * bw
-                # ..., which is that many bytes.
-                / 8
-                # The remaining data elements are represented with 8 bytes each
-                # (uncompressed 64-bit integers).
-                + countValues % blockSize * 8
-        )
     
     # Set the query-specific parameters for the cost-based format selection.
     if cs in ["ActualBestMem", "ActualBestBaseMem", "ActualWorstMem"]:
@@ -80,37 +76,64 @@ def _getSizes(q, cs):
     dfColInfos = csvutils.getColInfos(
             os.path.join(pathDataCh, "q{}.csv".format(q))
     )
-    # Load the sizes of each column in each format, so that we can use the size
-    # achieved with the selected format later on.
-    # TODO There is a function for that in csvutils.
-    dfSizes = csvutils.readMorphStoreCsv(
-            os.path.join(pathSizes, "q{}.csv".format(q))
-    )
     
     # Choose the compressed formats of all columns (base, intermediate)
     # involved in the specified query using the specified compression strategy.
-    df = compr.choose(
-        dfColInfos, processingStyle,
-        objective="perf" if "Perf" in cs else "mem",
-        **querySpecificParams, **chooseParams[cs],
+    # Since this can be expensive, the chosen formats are memoized. The entry
+    # depends on the contents of all files the format selection reads. Each
+    # scale factor and processing style has its own entries, such that they do
+    # not replace each other when several scale factors are loaded.
+    referencedPaths = [os.path.join(pathDataCh, "q{}.csv".format(q))]
+    referencedPaths.extend(querySpecificParams.values())
+    if "profileDirPath" in chooseParams[cs]:
+        referencedPaths.append(chooseParams[cs]["profileDirPath"])
+    df = cache.memoize(
+        "choose_sf{}_{}_q{}_{}".format(
+                scaleFactor, psNames[processingStyle], q, cs
+        ),
+        dict(
+            sf=scaleFactor, query=q, cs=cs, ps=processingStyle,
+            chooseParams=cache.describe(chooseParams[cs]),
+            files=cache.hashFiles(referencedPaths),
+        ),
+        lambda: compr.choose(
+            dfColInfos, processingStyle,
+            objective="perf" if "Perf" in cs else "mem",
+            **querySpecificParams, **chooseParams[cs],
+        )
     ).reset_index()
     df.columns = ["colName", "format"]
-    df["formatWithBw"] = df["format"].apply(lambda fmt: fmt.getInternalName())
     df["query"] = q
     df["cs"] = cs
 
     # Fetch the column information (data and access characteristics) of each
     # column involved in the query.
-    df = df.merge(
+    return df.merge(
             dfColInfos.reset_index()[
                     ["colName", csvutils.ColInfoCols.countValues]
             ],
             on=["colName"]
     )
+
+def _getSizes(tasks):
+    """
+    Retrieves the physical sizes (in bytes) of all columns (base, intermediate)
+    of the given queries using the specified strategies to determine the
+    compressed formats. Each task is a pair of a query and a strategy. The
+    sizes of all tasks are calculated in one go.
+    """
+    
+    # Choose the formats of the columns of all tasks.
+    df = pd.concat(jobs.starmap(_chooseFormats, tasks), ignore_index=True)
     
-    sIsStaticVBP = df["format"].apply(
-            lambda fmt: isinstance(fmt, formats.StaticVBPFormat)
+    # Look at each chosen format only once.
+    sFormat = df["format"]
+    df["formatWithBw"] = [fmt.getInternalName() for fmt in sFormat]
+    sIsStaticVBP = pd.Series(
+            [isinstance(fmt, formats.StaticVBPFormat) for fmt in sFormat],
+            index=df.index
     )
+    
     # Calculate the memory footprint of each column for which the format
     # static_vbp was chosen using the chosen bit width. Note two things:
     # - This footprint can be calculated accurately without knowing the actual
@@ -118,49 +141,89 @@ def _getSizes(q, cs):
     # - Since this can easily be calculated, we do not measure it when we
     #   determine the size of each column in each format.
     dfStatic = df[sIsStaticVBP].copy()
-    if len(dfStatic):
-        dfStatic["sizeUsedByte"] = dfStatic.apply(sizeStaticVBP, axis=1)
-    else:
-        dfStatic["sizeUsedByte"] = 0 # only to add the column to the data frame
+    countValues = dfStatic[csvutils.ColInfoCols.countValues]
+    bw = pd.Series(
+            [fmt._bw for fmt in dfStatic["format"]],
+            index=dfStatic.index, dtype="int64"
+    )
+    blockSize = pss.PS_INFOS[processingStyle].vectorSizeBit
+    dfStatic["sizeUsedByte"] = (
+            # That many data elements...
+            countValues // blockSize * blockSize
+            # ... are represented with bw bits each...
+            * bw
+            # ..., which is that many bytes.
+            / 8
+            # The remaining data elements are represented with 8 bytes each
+            # (uncompressed 64-bit integers).
+            + countValues % blockSize * 8
+    ).astype("int64")
+    
     # Fetch the memory footprint of each column for which another format than
     # static_vbp was chosen, using the format chosen for the particular column.
-    dfOther = df[~sIsStaticVBP]
-    dfOther = dfOther.merge(
-            dfSizes[["colName", "formatWithBw", "sizeUsedByte"]],
-            on=["colName", "formatWithBw"]
+    # To this end, we load the sizes of each column in each format for all
+    # involved queries.
+    # TODO There is a function for that in csvutils.
+    colsSizes = ["query", "colName", "formatWithBw", "sizeUsedByte"]
+    if pathWarehouse is not None:
+        dfSizes = warehouse.loadMeasurements(
+                pathWarehouse, "sizes", source=warehouseSource,
+                sf=scaleFactor, query=sorted(set(q for q, cs in tasks))
+        )[colsSizes]
+    else:
+        dfsSizes = []
+        for q in sorted(set(q for q, cs in tasks)):
+            dfSizes = csvutils.readMorphStoreCsv(
+                    os.path.join(pathSizes, "q{}.csv".format(q))
+            )
+            dfSizes["query"] = q
+            dfsSizes.append(dfSizes[colsSizes])
+        dfSizes = pd.concat(dfsSizes)
+    dfOther = df[~sIsStaticVBP].merge(
+            dfSizes, on=["query", "colName", "formatWithBw"]
     )
-    # Combine everything.
-    df = dfStatic.append(dfOther)
     
-    return df
+    # Combine everything.
+    return pd.concat([dfStatic, dfOther])
 
 # -----------------------------------------------------------------------------
 # Loading measurements
 # -----------------------------------------------------------------------------
 
-def loadFootprintsMorphStore():
-    """Loads the memory footprints in MorphStore."""
-    
-    # Utility function.
-    def enrichDf(df, q, ps, cs):
-        df["query"] = q
-        df["ps"] = ps
-        df["cs"] = cs
-        return df
+def _filesFootprintsMorphStore():
+    """Returns the paths of all files read by loadFootprintsMorphStore."""
     
-    # Retrieve the memory footprints of the individual columns according to the
-    # format combination implied by the respective compression strategy.
-    dfs = []
-    for q in queries:
-        for cs in [cs.format(obj="Mem") for cs in comprStrategiesFss]:
-            dfs.append(enrichDf(_getSizes(q, cs), q, processingStyle, cs))
-    dfMem = pd.concat(dfs)
+    return cache.listFiles(
+            [os.path.join(pathDataCh, "q{}.csv".format(q)) for q in queries] +
+            (
+                [pathWarehouse] if pathWarehouse is not None else
+                [os.path.join(pathSizes, "q{}.csv".format(q)) for q in queries]
+            ) +
+            [pathProfiles]
+    )
 
+def loadColumnFootprintsMorphStore():
+    """
+    Loads the memory footprints of the individual columns in MorphStore
+    according to the format combination implied by the respective compression
+    strategy.
+    """
+    
+    dfMem = _getSizes([
+        (q, cs)
+        for q in queries
+        for cs in [cs.format(obj="Mem") for cs in comprStrategiesFss]
+    ])
+    dfMem["ps"] = processingStyle
+    
     # Drop some unnecessary attributes.
-    dfMem.drop(
-            columns=["colName", "format", "formatWithBw", "countValues:"],
-            inplace=True
-    )
+    return dfMem.drop(columns=["format", "formatWithBw", "countValues:"])
+
+def loadFootprintsMorphStore():
+    """Loads the memory footprints in MorphStore."""
+    
+    # Retrieve the memory footprints of the individual columns.
+    dfMem = loadColumnFootprintsMorphStore().drop(columns="colName")
     # Calculate the total memory footprint for each query by adding up the
     # footprints of all involved columns.
     dfMem = dfMem.groupby(["query", "cs", "ps"], as_index=False).sum()
@@ -177,47 +240,139 @@ def loadFootprintsMorphStore():
     
     return dfMem
 
-def loadRuntimesMorphStore():
-    """Loads the measured MorphStore runtimes."""
+def _loadRuntimesMorphStoreFile(filePath, q, ps, cs, allOperators):
+    """
+    Loads the measured MorphStore runtimes from a single file, see
+    loadRuntimesMorphStore.
+    """
     
-    # Utility function.
-    def enrichDf(df, q, ps, cs):
-        # TODO So actually, we need to load/parse only the fifth line of each
-        # file... Could be faster...
-        # Consider only the runtime of the entire query (not those of the
-        # individual operators).
-        df = df[df["opIdx"] == 0].copy()
-        # Drop unnecessary columns.
-        df.drop(columns=["opIdx", "opName"], inplace=True)
+    if allOperators:
+        df = csvutils.readMorphStoreCsv(filePath)
         # Add some attributes given by the context.
         df["query"] = q
         df["ps"] = ps
         df["cs"] = cs
         return df
     
-    # Load the measured runtimes.
-    dfs = []
+    # We need only the row of the entire query, which is near the beginning of
+    # the file, so we do not parse the rest.
+    row = artifacts.readMorphStoreQueryRow(filePath)
+    return dict(runtime=row["runtime"], query=q, ps=ps, cs=cs)
+
+def _tasksRuntimesMorphStore(allOperators):
+    """
+    Returns the arguments of _loadRuntimesMorphStoreFile for each file read by
+    loadRuntimesMorphStore.
+    
+    Since the run step may stop the repetitions of a compression strategy
+    early, the repetitions after the number it recorded in its log are
+    skipped. All other files must exist.
+    """
+    
+    countRepsByCs = repetitions.readLog(
+            os.path.join(pathTimesMorphStore, "repetitions.csv")
+    )
+    tasks = []
     csUncomprScalar = "UncomprScalar"
     for repIdx in range(1, countReps + 1):
         for q in queries:
             for cs in [cs.format(obj="Perf") for cs in comprStrategiesFss + [csUncomprScalar]]:
-                dfs.append(enrichDf(
-                        csvutils.readMorphStoreCsv(os.path.join(
-                                pathTimesMorphStore,
-                                "{}_{}".format(cs, repIdx),
-                                "q{}.csv".format(q)
-                        )),
-                        q,
-                        psNames[
-                                # For the uncompressed compression strategy, we
-                                # also used the scalar processing style.
-                                pss.PS_SCALAR
-                                if cs == csUncomprScalar
-                                else processingStyle
-                        ],
-                        cs
-                ))
-    dfPerf = pd.concat(dfs)
+                if repIdx > countRepsByCs.get(cs, countReps):
+                    continue
+                filePath = os.path.join(
+                        pathTimesMorphStore,
+                        "{}_{}".format(cs, repIdx),
+                        "q{}.csv".format(q)
+                )
+                # For the uncompressed compression strategy, we also used the
+                # scalar processing style.
+                ps = psNames[
+                        pss.PS_SCALAR
+                        if cs == csUncomprScalar
+                        else processingStyle
+                ]
+                if not os.path.exists(filePath):
+                    raise RuntimeError(
+                            "the timing file '{}' does not exist".format(filePath)
+                    )
+                tasks.append((filePath, q, ps, cs, allOperators))
+    return tasks
+
+def _loadRuntimesMorphStoreWarehouse(css, allOperators):
+    """
+    Loads the measured MorphStore runtimes of the given compression strategies
+    from the warehouse, in the same shape as _loadRuntimesMorphStoreFile
+    returns them for all files.
+    """
+    
+    filters = dict(
+            source=warehouseSource, sf=scaleFactor, query=queries, cs=css,
+            rep=list(range(1, countReps + 1))
+    )
+    if not allOperators:
+        filters["opIdx"] = 0
+    df = warehouse.loadMeasurements(pathWarehouse, "times_MorphStore", **filters)
+    # Order the runtimes like the files of the tasks of the loaders.
+    df = df.assign(
+            qIdx=df["query"].map({q: idx for idx, q in enumerate(queries)}),
+            csIdx=df["cs"].map({cs: idx for idx, cs in enumerate(css)}),
+    ).sort_values(["rep", "qIdx", "csIdx"], kind="mergesort")
+    df["ps"] = [
+        psNames[pss.PS_SCALAR if cs == "UncomprScalar" else processingStyle]
+        for cs in df["cs"]
+    ]
+    if allOperators:
+        return df[["opName", "opIdx", "runtime", "query", "ps", "cs"]]
+    return df[["runtime", "query", "ps", "cs"]].set_index(
+            pd.Index([0] * len(df))
+    )
+
+def _filesRuntimes(fnTasks):
+    """
+    Returns the paths of all files read by a loader of runtimes, given the
+    function returning the loader's tasks: the warehouse, if it is used, or
+    the files of all tasks.
+    """
+    
+    if pathWarehouse is not None:
+        return [pathWarehouse]
+    return [task[0] for task in fnTasks()]
+
+def loadRuntimesMorphStore(allOperators=False):
+    """
+    Loads the measured MorphStore runtimes.
+    
+    By default, only the runtime of the entire query is read from each file.
+    If allOperators is True, each file is parsed entirely and the runtimes of
+    the individual operators are kept as well (with their opIdx and opName).
+    """
+    
+    # Load the measured runtimes.
+    if pathWarehouse is not None:
+        dfPerf = _loadRuntimesMorphStoreWarehouse(
+                [cs.format(obj="Perf") for cs in comprStrategiesFss + ["UncomprScalar"]],
+                allOperators
+        )
+    else:
+        results = jobs.starmap(
+                _loadRuntimesMorphStoreFile,
+                _tasksRuntimesMorphStore(allOperators)
+        )
+        if allOperators:
+            dfPerf = pd.concat(results)
+        else:
+            # The row of the entire query is the first one in each file, so
+            # each row gets the index 0, as if we had parsed the whole file.
+            dfPerf = pd.DataFrame(
+                    results, columns=["runtime", "query", "ps", "cs"],
+                    index=[0] * len(results)
+            )
+    
+    if allOperators:
+        # Averages over all queries are not meaningful for the individual
+        # operators, so we only convert the runtimes to seconds.
+        dfPerf["runtime [s]"] = dfPerf["runtime"] / 1000 / 1000
+        return dfPerf
 
     # Calculate the average runtime over all queries.
     dfPerfAvg = dfPerf.groupby(["ps", "cs"], as_index=False).mean()
@@ -235,9 +390,16 @@ def loadRuntimesMonetDB(intType):
     """Loads the measured MonetDB runtimes."""
     
     # Load the measured runtimes.
-    dfPerf = pd.read_csv(
-            os.path.join(pathTimesMonetDB, "{}.csv".format(intType)), sep="\t"
-    )
+    if pathWarehouse is not None:
+        dfPerf = warehouse.loadMeasurements(
+                pathWarehouse, "times_MonetDB", source=warehouseSource,
+                sf=scaleFactor, cs=intType
+        )[["query", "repetition", "runtime [ms]"]]
+    else:
+        dfPerf = pd.read_csv(
+                os.path.join(pathTimesMonetDB, "{}.csv".format(intType)),
+                sep="\t"
+        )
     
     # Drop the first two repetitions, since they are usually slow.
     dfPerf = dfPerf[dfPerf["repetition"] > 2]
@@ -262,6 +424,416 @@ def loadRuntimesMonetDB(intType):
 
     return dfPerf
 
+def _loadRuntimesMonetDBCached(intType, cacheParams):
+    """Loads the measured MonetDB runtimes through the cache."""
+    
+    return cache.load(
+            "runtimesMonetDB_sf{}_{}".format(scaleFactor, intType),
+            cacheParams,
+            [pathWarehouse] if pathWarehouse is not None else
+            [os.path.join(pathTimesMonetDB, "{}.csv".format(intType))],
+            lambda: loadRuntimesMonetDB(intType)
+    )
+
+# -----------------------------------------------------------------------------
+# Regarding the runtimes of individual operators
+# -----------------------------------------------------------------------------
+
+# The compression strategies compared by the operator report. The speedups of
+# the operators refer to the first one.
+csOperatorReport = ["Uncompr", "ActualBestPerf", "CostBasedBestPerf"]
+
+def _tasksOperatorRuntimesMorphStore():
+    """
+    Returns the arguments of _loadRuntimesMorphStoreFile for each file read by
+    loadOperatorRuntimesMorphStore.
+    """
+    
+    return [
+        task for task in _tasksRuntimesMorphStore(True)
+        if task[3] in csOperatorReport
+    ]
+
+def loadOperatorRuntimesMorphStore():
+    """
+    Loads the measured MorphStore runtimes of the individual operators in the
+    compression strategies of the operator report, averaged over all
+    repetitions.
+
+    Besides the runtime, each operator gets its share of the runtime of the
+    entire query (the row with opIdx 0, which is dropped).
+    """
+
+    # Load the measured runtimes of all operators, but only for the compared
+    # compression strategies.
+    if pathWarehouse is not None:
+        dfOps = _loadRuntimesMorphStoreWarehouse(csOperatorReport, True)
+    else:
+        dfOps = pd.concat(jobs.starmap(
+                _loadRuntimesMorphStoreFile, _tasksOperatorRuntimesMorphStore()
+        ))
+    dfOps["runtime [s]"] = dfOps["runtime"] / 1000 / 1000
+    dfOps = dfOps.groupby(
+            ["query", "ps", "cs", "opIdx", "opName"], as_index=False, sort=False
+    )[["runtime [s]"]].mean()
+
+    # Calculate the share of each operator in the runtime of its query.
+    isQuery = dfOps["opIdx"] == 0
+    dfQuery = dfOps[isQuery][["query", "ps", "cs", "runtime [s]"]].rename(
+            columns={"runtime [s]": "query runtime [s]"}
+    )
+    dfOps = dfOps[~isQuery].merge(dfQuery, on=["query", "ps", "cs"])
+    dfOps["share [%]"] = dfOps["runtime [s]"] / dfOps["query runtime [s]"] * 100
+    dfOps.drop(columns="query runtime [s]", inplace=True)
+
+    return dfOps
+
+def _loadOperatorRuntimesMorphStoreCached():
+    """
+    Loads the measured MorphStore runtimes of the individual operators through
+    the cache.
+    """
+    
+    return cache.load(
+            "operatorsMorphStore_sf{}".format(scaleFactor),
+            dict(
+                sf=scaleFactor, ps=processingStyle, queries=queries,
+                reps=countReps, css=csOperatorReport, source=warehouseSource
+            ),
+            _filesRuntimes(_tasksOperatorRuntimesMorphStore),
+            loadOperatorRuntimesMorphStore
+    )
+
+def calcOperatorSpeedups(dfOps):
+    """
+    Returns the runtime of each operator in each compression strategy of the
+    operator report side by side, along with its speedups (values greater
+    than one) or slowdowns (values less than one) compared to the first
+    strategy, and between the last two strategies.
+
+    The operators are aligned by their opIdx, since the query plan is the same
+    for all compression strategies.
+    """
+
+    dfSpeedups = dfOps.pivot_table(
+            index=["query", "ps", "opIdx", "opName"],
+            columns="cs", values="runtime [s]"
+    ).reset_index()
+    dfSpeedups.columns.name = None
+
+    csBase = csOperatorReport[0]
+    for cs in csOperatorReport[1:]:
+        dfSpeedups["speedup {} vs. {}".format(cs, csBase)] = \
+                dfSpeedups[csBase] / dfSpeedups[cs]
+    csA, csB = csOperatorReport[-2:]
+    dfSpeedups["speedup {} vs. {}".format(csB, csA)] = \
+            dfSpeedups[csA] / dfSpeedups[csB]
+
+    return dfSpeedups
+
+def findHotOperators(dfOps, dfSpeedups, countTop):
+    """
+    Returns the countTop operators with the highest runtimes (over all queries)
+    for each compression strategy of the operator report, along with their
+    speedups.
+    """
+
+    dfs = []
+    for cs in csOperatorReport:
+        df = dfOps[dfOps["cs"] == cs].nlargest(countTop, "runtime [s]")
+        df.insert(0, "rank", range(1, len(df) + 1))
+        dfs.append(df)
+    dfHot = pd.concat(dfs)
+
+    colsSpeedup = [col for col in dfSpeedups.columns if col.startswith("speedup ")]
+    return dfHot.merge(
+            dfSpeedups[["query", "ps", "opIdx"] + colsSpeedup],
+            on=["query", "ps", "opIdx"], how="left"
+    )
+
+def drawOperatorBreakdown(dfOps):
+    """
+    Draws the runtime of each query in each compression strategy of the
+    operator report as a stacked bar, whose segments are the operators.
+    """
+
+    opNames = sorted(dfOps["opName"].unique())
+    cmap = plt.get_cmap("tab20")
+    colors = [cmap(i % cmap.N) for i in range(len(opNames))]
+    colorByOpName = dict(zip(opNames, colors))
+
+    filename = "operators_breakdown"
+
+    fig = plt.figure(figsize=(2 * len(queries), 4))
+    for diaIdx, q in enumerate(queries):
+        ax = fig.add_subplot(1, len(queries), diaIdx + 1)
+        for x, cs in enumerate(csOperatorReport):
+            bottom = 0
+            df = dfOps[(dfOps["query"] == q) & (dfOps["cs"] == cs)]
+            for _, row in df.sort_values("opIdx").iterrows():
+                ax.bar(
+                        x, row["runtime [s]"], bottom=bottom,
+                        color=colorByOpName[row["opName"]],
+                        edgecolor="black", lw=0.5
+                )
+                bottom += row["runtime [s]"]
+        ax.set_xticks(range(len(csOperatorReport)))
+        ax.set_xticklabels(csOperatorReport, rotation=90)
+        ax.set_title("q{}".format(q))
+        if diaIdx == 0:
+            ax.set_ylabel("runtime [s]")
+    sns.despine()
+    fig.tight_layout()
+    utils.saveFig(filename)
+
+    utils.drawLegendRect(opNames, colors)
+    utils.saveFig(filename + "_legend")
+
+# -----------------------------------------------------------------------------
+# Regarding the roofline analysis
+# -----------------------------------------------------------------------------
+
+def loadOperatorTrafficMorphStore():
+    """
+    Determines the total size (in bytes) and number of data elements of all
+    columns each operator reads and writes, as well as their formats, for each
+    query and each compression strategy of the operator report.
+    
+    The sizes of the columns depend on the formats chosen by the respective
+    compression strategy, which columns an operator reads and writes is given
+    by the data characteristics.
+    """
+    
+    dfSizes = _getSizes([
+        (q, cs) for q in queries for cs in csOperatorReport
+    ])[["query", "cs", "colName", "formatWithBw", "sizeUsedByte"]]
+    
+    dfsCols = []
+    for q in queries:
+        dfCols = datachars.load(
+                os.path.join(pathDataCh, "q{}.csv".format(q))
+        ).attrs[["opIdx", "colRole", "colName", "valueCount"]]
+        dfCols["query"] = q
+        dfsCols.append(dfCols)
+    dfCols = pd.concat(dfsCols).merge(dfSizes, on=["query", "colName"])
+    
+    dfTraffic = dfCols.groupby(
+            ["query", "cs", "opIdx"], as_index=False, sort=False
+    ).agg({
+        "sizeUsedByte": "sum",
+        "valueCount": "sum",
+        "formatWithBw": lambda fmts: ", ".join(fmts),
+    }).rename(columns={
+        "sizeUsedByte": "bytes",
+        "valueCount": "values",
+        "formatWithBw": "formats",
+    })
+    
+    return dfTraffic
+
+def drawRooflineMorphStore(dfRoofline, bandwidthCeiling):
+    """
+    Draws the roofline diagram of the operators of all queries, colored by the
+    compression strategy.
+    """
+    
+    colors = [colorGray, colorGreen, colorYellow][:len(csOperatorReport)]
+    
+    filename = "roofline_operators"
+    
+    fig = plt.figure(figsize=(7, 5))
+    ax = fig.add_subplot(111)
+    roofline.drawRoofline(
+            ax, dfRoofline, bandwidthCeiling, "cs", csOperatorReport, colors,
+            "SSB operators @sf {} (ceiling {:.1f} GB/s)".format(
+                    scaleFactor, bandwidthCeiling
+            )
+    )
+    sns.despine()
+    fig.tight_layout()
+    utils.saveFig(filename)
+    
+    utils.drawLegendRect(csOperatorReport, colors)
+    utils.saveFig(filename + "_legend")
+
+# -----------------------------------------------------------------------------
+# Regarding the projection to other scale factors
+# -----------------------------------------------------------------------------
+
+def _setScaleFactor(sf):
+    """
+    Sets the scale factor and the paths to the artifacts of this scale factor,
+    which all loaders read.
+    """
+    
+    global scaleFactor, pathTimesMorphStore, pathTimesMonetDB, pathDataCh
+    global pathSizes, pathDias, pathBest, pathWorst, pathExport
+    global pathOperators, pathRoofline
+    
+    scaleFactor = sf
+    pathTimesMorphStore = os.path.join(pathArtifacts, "times_MorphStore_sf{}".format(sf))
+    pathTimesMonetDB = os.path.join(pathArtifacts, "times_MonetDB_sf{}".format(sf))
+    pathDataCh = os.path.join(pathArtifacts, "dc_sf{}".format(sf))
+    pathSizes = os.path.join(pathArtifacts, "size_sf{}".format(sf))
+    pathDias = os.path.join(pathArtifacts, "dias_sf{}".format(sf))
+    pathBest = os.path.join(pathArtifacts, "ssb_formats_bestperf_sf{}".format(sf))
+    pathWorst = os.path.join(pathArtifacts, "ssb_formats_worstperf_sf{}".format(sf))
+    pathExport = os.path.join(pathArtifacts, "export_sf{}".format(sf))
+    pathOperators = os.path.join(pathArtifacts, "operators_sf{}".format(sf))
+    pathRoofline = os.path.join(pathArtifacts, "roofline_sf{}".format(sf))
+
+def _hasRuntimesMorphStore():
+    """
+    Returns whether there are MorphStore runtimes of the current scale factor,
+    i.e., runs in the warehouse, if it is used, or the directory of the
+    timing files.
+    """
+    
+    if pathWarehouse is not None:
+        return len(warehouse.query(
+                pathWarehouse,
+                "SELECT runId FROM runs "
+                "WHERE kind = ? AND source = ? AND sf = ? LIMIT 1",
+                ("times_MorphStore", warehouseSource, scaleFactor)
+        )) > 0
+    return os.path.isdir(pathTimesMorphStore)
+
+def loadScaleFactorsMorphStore(sfs):
+    """
+    Loads the memory footprints of the individual columns, the runtimes of
+    the queries, and the runtimes of the individual operators in MorphStore
+    for each of the given scale factors, as far as their artifacts exist.
+    Returns three data frames, which have the scale factor in the column "sf".
+    
+    Temporarily switches the global scale factor, see _setScaleFactor.
+    """
+    
+    sfOrig = scaleFactor
+    dfsMem, dfsPerf, dfsOps = [], [], []
+    for sf in sfs:
+        _setScaleFactor(sf)
+        cacheParams = dict(
+                sf=sf, ps=processingStyle, queries=queries, reps=countReps,
+                source=warehouseSource
+        )
+        if os.path.isdir(pathDataCh) and (
+                pathWarehouse is not None or os.path.isdir(pathSizes)
+        ):
+            dfMem = cache.load(
+                    "columnFootprintsMorphStore_sf{}".format(sf),
+                    cacheParams,
+                    _filesFootprintsMorphStore(),
+                    loadColumnFootprintsMorphStore
+            )
+            dfMem["footprint [GiB]"] = dfMem["sizeUsedByte"] / 1024 / 1024 / 1024
+            dfsMem.append(dfMem.assign(sf=sf))
+        if _hasRuntimesMorphStore():
+            dfPerf = cache.load(
+                    "runtimesMorphStore_sf{}".format(sf),
+                    cacheParams,
+                    _filesRuntimes(
+                            functools.partial(_tasksRuntimesMorphStore, False)
+                    ),
+                    loadRuntimesMorphStore
+            )
+            dfsPerf.append(dfPerf[dfPerf["query"] != "avg"].assign(sf=sf))
+            dfsOps.append(_loadOperatorRuntimesMorphStoreCached().assign(sf=sf))
+    _setScaleFactor(sfOrig)
+    
+    def concat(dfs):
+        return pd.concat(dfs, ignore_index=True) if dfs else None
+    return concat(dfsMem), concat(dfsPerf), concat(dfsOps)
+
+# The attributes identifying the measurements each kind of scaling model is
+# fitted for.
+keyColsProjection = {
+    "footprints": ["query", "ps", "cs", "colName"],
+    "runtimes": ["query", "ps", "cs"],
+    "operators": ["query", "ps", "cs", "opIdx", "opName"],
+}
+
+def projectMorphStore(dfsSource, dfsTarget, targetSfs, confidence):
+    """
+    Fits the scaling models of each kind (see keyColsProjection) to the given
+    measurements at the source scale factors and projects them to the target
+    scale factors (see the projection module). The footprints of the
+    individual columns are added up per query.
+    
+    Returns two dictionaries from the kind to a data frame of the fitted
+    models and to a data frame of the projections, the latter with the
+    measured values at the target scale factors (if any) in the column
+    "measured".
+    """
+    
+    valueCols = {
+        "footprints": "footprint [GiB]",
+        "runtimes": "runtime [s]",
+        "operators": "runtime [s]",
+    }
+    
+    dfsModels = dict()
+    dfsPred = dict()
+    for kind, keyCols in keyColsProjection.items():
+        if dfsSource[kind] is None:
+            continue
+        valueCol = valueCols[kind]
+        dfModels = projection.fitScaling(dfsSource[kind], keyCols, valueCol)
+        dfPred = projection.predict(
+                dfModels, keyCols, targetSfs, valueCol, confidence
+        )
+        dfTarget = dfsTarget[kind]
+        if kind == "footprints":
+            keyCols = keyCols[:-1]
+            dfPred = projection.sumProjections(dfPred, keyCols, valueCol)
+            if dfTarget is not None:
+                dfTarget = dfTarget.groupby(
+                        keyCols + ["sf"], as_index=False, sort=False
+                )[[valueCol]].sum()
+        if dfTarget is not None:
+            dfPred = dfPred.merge(
+                    dfTarget.groupby(
+                            keyCols + ["sf"], as_index=False, sort=False
+                    )[[valueCol]].mean().rename(columns={valueCol: "measured"}),
+                    on=keyCols + ["sf"], how="left"
+            )
+            dfPred["error [%]"] = \
+                    (dfPred[valueCol] / dfPred["measured"] - 1) * 100
+        dfsModels[kind] = dfModels
+        dfsPred[kind] = dfPred
+    
+    return dfsModels, dfsPred
+
+def drawProjectionMorphStore(dfPred, valueCol, title, filename):
+    """
+    Draws the projected values of the given data frame (see projectMorphStore)
+    per query, with one row of diagrams per target scale factor and one column
+    per compression strategy, next to the measured values (if any).
+    """
+    
+    targetSfs = list(dfPred["sf"].unique())
+    css = list(dfPred["cs"].unique())
+    fig = plt.figure(figsize=(4 * len(css), 4 * len(targetSfs)))
+    diaIdx = 0
+    for sf in targetSfs:
+        for cs in css:
+            diaIdx += 1
+            ax = fig.add_subplot(len(targetSfs), len(css), diaIdx)
+            df = dfPred[(dfPred["sf"] == sf) & (dfPred["cs"] == cs)]
+            dfMeasured = None
+            if "measured" in df.columns and df["measured"].notna().any():
+                dfMeasured = df[["query", "measured"]].rename(
+                        columns={"measured": valueCol}
+                )
+            projection.drawProjection(
+                    ax, df, dfMeasured, valueCol, "query", queries, colorBlue
+            )
+            ax.set_title("{} @sf {}".format(cs, sf))
+            if cs == css[0]:
+                ax.set_ylabel(title)
+    sns.despine()
+    fig.tight_layout()
+    utils.saveFig(filename)
+
 # -----------------------------------------------------------------------------
 # Regarding diagrams
 # -----------------------------------------------------------------------------
@@ -300,6 +872,17 @@ def _drawDia(hueCol, hueOrder, palette, dfMem, dfPerf, rowH=3):
     sns.despine()
     fig.tight_layout()
 
+def _drawInContext(drawFn, contextScale):
+    """
+    Sets up seaborn's plotting context and matplotlib's rcParams, calls the
+    given function for drawing a diagram, and closes all figures afterwards.
+    """
+    
+    sns.set_context("talk", contextScale)
+    utils.setMatplotlibRcParamsLikeInJupyterNotebook()
+    drawFn()
+    plt.close("all")
+
 # -----------------------------------------------------------------------------
 # Generation of the individual diagrams in the paper.
 # -----------------------------------------------------------------------------
@@ -479,6 +1062,101 @@ if __name__ == "__main__":
             help="",
             default=queries, choices=queries,
     )
+    parser.add_argument(
+            "-j", "--jobs", metavar="N", type=int,
+            help="The number of worker processes to use for loading the "
+                 "measurements and for drawing the diagrams. Defaults to 1 "
+                 "(no parallelism).",
+            default=1,
+    )
+    parser.add_argument(
+            "--noCache", dest="useCache", action="store_false",
+            help="Do not use the cache of loaded measurements, but always "
+                 "load them from the artifacts.",
+            default=True,
+    )
+    parser.add_argument(
+            "-f", "--force", action="store_true",
+            help="Regenerate all diagrams, even those which are newer than "
+                 "all artifacts they depend on.",
+            default=False,
+    )
+    parser.add_argument(
+            "--export", metavar="FORMAT",
+            help="Do not draw the diagrams, but export the data behind them "
+                 "(memory footprints and runtimes per query, compression "
+                 "strategy, and processing style) to files of the given "
+                 "format.",
+            default=None, choices=artifacts.EXPORT_FORMATS,
+    )
+    parser.add_argument(
+            "--operatorReport", action="store_true",
+            help="Do not draw the diagrams in the paper, but report the "
+                 "runtimes of the individual MorphStore operators per query "
+                 "for the compression strategies {}, i.e., a stacked "
+                 "breakdown diagram, the hottest operators, and the "
+                 "operators' speedups between these strategies.".format(
+                         ", ".join(csOperatorReport)
+                 ),
+            default=False,
+    )
+    parser.add_argument(
+            "--topN", metavar="N", type=int,
+            help="The number of hottest operators per compression strategy "
+                 "to report with --operatorReport. Defaults to 10.",
+            default=10,
+    )
+    parser.add_argument(
+            "--roofline", action="store_true",
+            help="Do not draw the diagrams in the paper, but analyze which "
+                 "MorphStore operators are bandwidth-bound or compute-bound "
+                 "for the compression strategies {}, by comparing the memory "
+                 "bandwidth they achieve to the bandwidth of this "
+                 "machine.".format(", ".join(csOperatorReport)),
+            default=False,
+    )
+    parser.add_argument(
+            "--bandwidth", metavar="GB/S", type=float,
+            help="The memory bandwidth ceiling to use with --roofline. "
+                 "Defaults to the bandwidth measured on this machine.",
+            default=None,
+    )
+    parser.add_argument(
+            "--project", metavar="N", type=int, nargs="+",
+            help="Do not draw the diagrams in the paper, but project the "
+                 "MorphStore memory footprints (per column) and runtimes (per "
+                 "query and per operator) measured at the given scale factors "
+                 "to those given with --projectTo, using scaling models "
+                 "fitted per column, query, and operator. Measurements at "
+                 "three or more scale factors are required for error bounds.",
+            default=None,
+    )
+    parser.add_argument(
+            "--projectTo", metavar="N", type=int, nargs="+",
+            help="The scale factors to project to with --project. If the "
+                 "artifacts of one of them exist, the projections are "
+                 "compared to its measurements. Defaults to 100 and 1000.",
+            default=[100, 1000],
+    )
+    parser.add_argument(
+            "--confidence", metavar="FRACTION", type=float,
+            help="The confidence of the error bounds of the projections with "
+                 "--project. Defaults to 0.95.",
+            default=0.95, choices=repetitions.CONFIDENCES,
+    )
+    parser.add_argument(
+            "--warehouse", metavar="FILE",
+            help="Read the measured runtimes and sizes from this warehouse "
+                 "(see warehouse.py) instead of the artifact files. The data "
+                 "characteristics are still read from the artifact files.",
+            default=None,
+    )
+    parser.add_argument(
+            "--warehouseSource", metavar="NAME",
+            help="The artifact tree in the warehouse to read from with "
+                 "--warehouse. Defaults to 'artifacts'.",
+            default="artifacts",
+    )
     parser.add_argument(
             "--withoutMorphStore", dest="useMorphStore", action="store_false",
             help="",
@@ -498,6 +1176,10 @@ if __name__ == "__main__":
     countReps = args.repetitions
     useMorphStore = args.useMorphStore
     useMonetDB = args.useMonetDB
+    jobs.countJobs = args.jobs
+    cache.useCache = args.useCache
+    pathWarehouse = args.warehouse
+    warehouseSource = args.warehouseSource
     
     # Validate arguments.
     # TODO
@@ -508,13 +1190,10 @@ if __name__ == "__main__":
 
     pathArtifacts = os.path.join("artifacts", "ssb")
     pathProfiles = os.path.join(pathArtifacts, "compr_profiles")
-    pathTimesMorphStore = os.path.join(pathArtifacts, "times_MorphStore_sf{}".format(scaleFactor))
-    pathTimesMonetDB = os.path.join(pathArtifacts, "times_MonetDB_sf{}".format(scaleFactor))
-    pathDataCh = os.path.join(pathArtifacts, "dc_sf{}".format(scaleFactor))
-    pathSizes = os.path.join(pathArtifacts, "size_sf{}".format(scaleFactor))
-    pathDias = os.path.join(pathArtifacts, "dias_sf{}".format(scaleFactor))
-    pathBest = os.path.join(pathArtifacts, "ssb_formats_bestperf_sf{}".format(scaleFactor))
-    pathWorst = os.path.join(pathArtifacts, "ssb_formats_worstperf_sf{}".format(scaleFactor))
+    pathCache = os.path.join(pathArtifacts, "cache")
+    pathProjection = os.path.join(pathArtifacts, "projection")
+    # The paths to the artifacts of the scale factor.
+    _setScaleFactor(scaleFactor)
     
     # -------------------------------------------------------------------------
     # Configuration
@@ -565,6 +1244,287 @@ if __name__ == "__main__":
     # Integer types we used for the base data in MonetDB.
     intTypesMonetDB = ["BIGINT", "tight"]
     
+    # -------------------------------------------------------------------------
+    # Operator report
+    # -------------------------------------------------------------------------
+    
+    if args.operatorReport:
+        print("Loading measurements of the individual operators... ", end="")
+        sys.stdout.flush()
+        
+        cache.pathCache = pathCache
+        dfOps = _loadOperatorRuntimesMorphStoreCached()
+        dfSpeedups = calcOperatorSpeedups(dfOps)
+        dfHot = findHotOperators(dfOps, dfSpeedups, args.topN)
+        
+        print("done.")
+        
+        # The tables are written as CSV files, unless another format is
+        # requested.
+        fmt = args.export or "csv"
+        artifacts.writeTable(dfOps, pathOperators, "operators_breakdown", fmt)
+        artifacts.writeTable(dfSpeedups, pathOperators, "operators_speedups", fmt)
+        artifacts.writeTable(dfHot, pathOperators, "operators_hot", fmt)
+        
+        for cs in csOperatorReport:
+            print()
+            print("Top {} operators in {}:".format(args.topN, cs))
+            print(dfHot[dfHot["cs"] == cs].drop(columns=["ps", "cs"]).to_string(
+                    index=False, float_format="{:.3f}".format
+            ))
+        
+        if not args.export:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+            
+            sns.set_context("talk", 1.0)
+            utils.setMatplotlibRcParamsLikeInJupyterNotebook()
+            utils.pathDias = pathOperators
+            drawOperatorBreakdown(dfOps)
+        
+        print()
+        print("The operator report is in '{}'.".format(pathOperators))
+        sys.exit(0)
+    
+    # -------------------------------------------------------------------------
+    # Roofline analysis
+    # -------------------------------------------------------------------------
+    
+    if args.roofline:
+        if args.bandwidth is None:
+            print("Measuring the memory bandwidth... ", end="")
+            sys.stdout.flush()
+            bandwidths = roofline.measureBandwidth()
+            bandwidthCeiling = max(bandwidths.values())
+            print("done ({}).".format(", ".join(
+                    "{}: {:.1f} GB/s".format(name, bw)
+                    for name, bw in sorted(bandwidths.items())
+            )))
+        else:
+            bandwidthCeiling = args.bandwidth
+        
+        print("Loading measurements and sizes of the individual operators... ", end="")
+        sys.stdout.flush()
+        
+        cache.pathCache = pathCache
+        dfRoofline = roofline.analyze(
+                _loadOperatorRuntimesMorphStoreCached().merge(
+                        loadOperatorTrafficMorphStore(),
+                        on=["query", "cs", "opIdx"]
+                ),
+                bandwidthCeiling
+        )
+        
+        # The share of the runtime of each query spent in bandwidth-bound
+        # operators.
+        dfBound = dfRoofline.groupby(
+                ["query", "ps", "cs", "bound"], as_index=False, sort=False
+        )[["share [%]"]].sum().pivot_table(
+                index=["query", "ps", "cs"], columns="bound", values="share [%]",
+                fill_value=0
+        ).reset_index()
+        dfBound.columns.name = None
+        
+        print("done.")
+        
+        # The tables are written as CSV files, unless another format is
+        # requested.
+        fmt = args.export or "csv"
+        artifacts.writeTable(dfRoofline, pathRoofline, "roofline_operators", fmt)
+        artifacts.writeTable(dfBound, pathRoofline, "roofline_queries", fmt)
+        
+        print()
+        print("Share of the query runtime [%] in bandwidth-bound and compute-bound operators:")
+        print(dfBound.drop(columns="ps").to_string(
+                index=False, float_format="{:.1f}".format
+        ))
+        
+        if not args.export:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+            
+            colorGray = "#bfbfbf"
+            colorGreen = "#84cbc5"
+            colorYellow = "#f8d35e"
+            
+            sns.set_context("talk", 1.0)
+            utils.setMatplotlibRcParamsLikeInJupyterNotebook()
+            utils.pathDias = pathRoofline
+            drawRooflineMorphStore(dfRoofline, bandwidthCeiling)
+        
+        print()
+        print("The roofline analysis is in '{}'.".format(pathRoofline))
+        sys.exit(0)
+    
+    # -------------------------------------------------------------------------
+    # Projection to other scale factors
+    # -------------------------------------------------------------------------
+    
+    if args.project:
+        print("Loading measurements at scale factor(s) {}... ".format(
+                ", ".join(str(sf) for sf in args.project)
+        ), end="")
+        sys.stdout.flush()
+        
+        cache.pathCache = pathCache
+        kinds = list(keyColsProjection.keys())
+        dfsSource = dict(zip(kinds, loadScaleFactorsMorphStore(args.project)))
+        dfsTarget = dict(zip(kinds, loadScaleFactorsMorphStore(args.projectTo)))
+        if all(df is None for df in dfsSource.values()):
+            print("failed.")
+            print("There are no artifacts of these scale factors.")
+            sys.exit(1)
+        
+        print("done.")
+        
+        dfsModels, dfsPred = projectMorphStore(
+                dfsSource, dfsTarget, args.projectTo, args.confidence
+        )
+        
+        # The tables are written as CSV files, unless another format is
+        # requested.
+        fmt = args.export or "csv"
+        for kind in dfsPred.keys():
+            artifacts.writeTable(
+                    dfsModels[kind], pathProjection,
+                    "projection_models_{}".format(kind), fmt
+            )
+            artifacts.writeTable(
+                    dfsPred[kind], pathProjection,
+                    "projection_{}".format(kind), fmt
+            )
+        
+        for kind in ["footprints", "runtimes"]:
+            if kind not in dfsPred:
+                continue
+            df = dfsPred[kind]
+            print()
+            print("Projected {} per query (averaged over all queries):".format(kind))
+            print(df.groupby(["sf", "cs"], sort=False)[[
+                col for col in df.columns
+                if col.startswith(("footprint", "runtime", "measured", "error"))
+            ]].mean().reset_index().to_string(
+                    index=False, float_format="{:.3f}".format
+            ))
+        
+        if not args.export:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+            
+            colorBlue = "#868ad1"
+            
+            sns.set_context("talk", 1.0)
+            utils.setMatplotlibRcParamsLikeInJupyterNotebook()
+            utils.pathDias = pathProjection
+            if "footprints" in dfsPred:
+                drawProjectionMorphStore(
+                        dfsPred["footprints"], "footprint [GiB]",
+                        "memory footprint [GiB]", "projection_footprints"
+                )
+            if "runtimes" in dfsPred:
+                drawProjectionMorphStore(
+                        dfsPred["runtimes"], "runtime [s]", "runtime [s]",
+                        "projection_runtimes"
+                )
+        
+        print()
+        print("The projection is in '{}'.".format(pathProjection))
+        sys.exit(0)
+    
+    # -------------------------------------------------------------------------
+    # Selection of the diagrams to (re-)generate
+    # -------------------------------------------------------------------------
+    
+    # Utility function.
+    def timesMorphStore(*css):
+        if pathWarehouse is not None:
+            return [pathWarehouse]
+        return [
+            os.path.join(pathTimesMorphStore, "{}_{}".format(cs, repIdx))
+            for cs in css
+            for repIdx in range(1, countReps + 1)
+        ]
+    
+    # The artifacts the memory footprints depend on.
+    depsMem = [pathDataCh, pathWarehouse or pathSizes]
+    # The scripts all diagrams depend on.
+    depsScripts = [__file__, utils.__file__]
+    
+    # The diagrams to draw, the scales of their plotting contexts, the files
+    # they are saved to, and the artifacts they depend on.
+    figures = []
+    if useMorphStore:
+        figures.append((
+                drawFigure1, 1.0,
+                ["figure01_teaser"],
+                depsMem + timesMorphStore(
+                        "Uncompr", "ActualBestBasePerf", "ActualBestPerf"
+                )
+        ))
+        figures.append((
+                drawFigure7, 1.1,
+                ["figure07_ssb_formats", "figure07_ssb_formats_legend"],
+                depsMem + timesMorphStore(
+                        "ActualWorstPerf", "Uncompr", "StaticBP32",
+                        "ActualBestPerf"
+                )
+        ))
+        figures.append((
+                drawFigure8, 1.1,
+                ["figure08_ssb_base_vs_interm", "figure08_ssb_base_vs_interm_legend"],
+                depsMem + timesMorphStore(
+                        "Uncompr", "ActualBestBasePerf", "ActualBestPerf"
+                )
+        ))
+        figures.append((
+                drawFigure10, 1.1,
+                ["figure10_opt", "figure10_opt_legend"],
+                depsMem + [pathProfiles] + timesMorphStore(
+                        "ActualWorstPerf", "Uncompr", "CostBasedBestPerf",
+                        "ActualBestPerf"
+                )
+        ))
+    if useMorphStore or useMonetDB:
+        figures.append((
+                drawFigure9, 1.1,
+                ["figure09_morphstore_vs_monetdb", "figure09_morphstore_vs_monetdb_legend"],
+                (
+                    timesMorphStore("UncomprScalar", "Uncompr", "ActualBestPerf")
+                    if useMorphStore else []
+                ) + (
+                    [pathWarehouse or pathTimesMonetDB] if useMonetDB else []
+                )
+        ))
+    
+    # Like make, we regenerate only those diagrams which are older than any of
+    # the artifacts they depend on, unless we are forced to regenerate all.
+    # When exporting the data, we do not draw any diagrams, but need all data.
+    if args.export:
+        figures = []
+    elif not args.force:
+        figures = [
+            figure for figure in figures
+            if artifacts.isOutdated(
+                    [
+                        os.path.join(pathDias, "{}.pdf".format(filename))
+                        for filename in figure[2]
+                    ],
+                    figure[3] + depsScripts
+            )
+        ]
+    if not figures and not args.export:
+        print("All diagrams are up to date.")
+        sys.exit(0)
+    
+    # Load only the measurements required for the selected diagrams.
+    drawFns = [figure[0] for figure in figures]
+    needMemMorphStore = useMorphStore and (args.export or any(
+            drawFn in drawFns
+            for drawFn in [drawFigure1, drawFigure7, drawFigure8, drawFigure10]
+    ))
+    needPerfMorphStore = useMorphStore
+    needPerfMonetDB = useMonetDB and (args.export or drawFigure9 in drawFns)
+    
     # -------------------------------------------------------------------------
     # Load the measurements
     # -------------------------------------------------------------------------
@@ -572,17 +1532,68 @@ if __name__ == "__main__":
     print("Loading measurements... ", end="")
     sys.stdout.flush()
     
-    if useMorphStore:
-        dfMemMorphStore = loadFootprintsMorphStore()
-        dfPerfMorphStore = loadRuntimesMorphStore()
-    if useMonetDB:
-        dfPerfMonetDB = {
-            intType: loadRuntimesMonetDB(intType)
-            for intType in intTypesMonetDB
-        }
+    cache.pathCache = pathCache
+    # The parameters all cache entries depend on.
+    cacheParams = dict(
+            sf=scaleFactor, ps=processingStyle, queries=queries, reps=countReps,
+            source=warehouseSource
+    )
+    
+    if needMemMorphStore:
+        dfMemMorphStore = cache.load(
+                "footprintsMorphStore_sf{}".format(scaleFactor),
+                cacheParams,
+                _filesFootprintsMorphStore(),
+                loadFootprintsMorphStore
+        )
+    if needPerfMorphStore:
+        dfPerfMorphStore = cache.load(
+                "runtimesMorphStore_sf{}".format(scaleFactor),
+                cacheParams,
+                _filesRuntimes(
+                        functools.partial(_tasksRuntimesMorphStore, False)
+                ),
+                loadRuntimesMorphStore
+        )
+    if needPerfMonetDB:
+        dfPerfMonetDB = dict(zip(
+            intTypesMonetDB,
+            jobs.starmap(
+                    _loadRuntimesMonetDBCached,
+                    [(intType, cacheParams) for intType in intTypesMonetDB]
+            )
+        ))
         
     print("done.")
     
+    # -------------------------------------------------------------------------
+    # Data export
+    # -------------------------------------------------------------------------
+    
+    if args.export:
+        print("Exporting data... ", end="")
+        sys.stdout.flush()
+        
+        # The average runtimes per query, processing style, and compression
+        # strategy (MorphStore) or integer type (MonetDB).
+        tables = dict()
+        if useMorphStore:
+            tables["footprints_MorphStore"] = dfMemMorphStore
+            tables["runtimes_MorphStore"] = dfPerfMorphStore.groupby(
+                    ["query", "ps", "cs"], as_index=False, sort=False
+            )[["runtime [s]"]].mean()
+        if useMonetDB:
+            tables["runtimes_MonetDB"] = pd.concat(
+                    dfPerfMonetDB[intType] for intType in intTypesMonetDB
+            ).groupby(
+                    ["query", "ps", "cs"], as_index=False, sort=False
+            )[["runtime [s]"]].mean()
+        for name, df in tables.items():
+            artifacts.writeTable(df, pathExport, name, args.export)
+        
+        print("done.")
+        sys.exit(0)
+    
     # -------------------------------------------------------------------------
     # Diagram generation
     # -------------------------------------------------------------------------
@@ -590,6 +1601,9 @@ if __name__ == "__main__":
     print("Generating diagrams... ", end="")
     sys.stdout.flush()
     
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     os.makedirs(pathDias, exist_ok=True)
     
     colorRed = "#f47264"
@@ -602,20 +1616,11 @@ if __name__ == "__main__":
     
     utils.pathDias = pathDias
     
-    if useMorphStore:
-        sns.set_context("talk", 1.0)
-        utils.setMatplotlibRcParamsLikeInJupyterNotebook()
-        drawFigure1()
-        
-        sns.set_context("talk", 1.1)
-        utils.setMatplotlibRcParamsLikeInJupyterNotebook()
-        drawFigure7()
-        drawFigure8()
-        drawFigure10()
-        
-    if useMorphStore or useMonetDB:
-        sns.set_context("talk", 1.1)
-        utils.setMatplotlibRcParamsLikeInJupyterNotebook()
-        drawFigure9()
+    # Each diagram sets up its own plotting context, such that they can be
+    # drawn in isolated worker processes.
+    jobs.runIsolated(
+            functools.partial(_drawInContext, drawFn, contextScale)
+            for drawFn, contextScale, filenames, deps in figures
+    )
     
     print("done.")
\ No newline at end of file
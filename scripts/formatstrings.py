@@ -0,0 +1,214 @@
+"""
+Some utilities for parsing the names of MorphStore's formats, required by the
+diagram generation of both the micro benchmarks and the Star Schema Benchmark
+as well as by the size estimation.
+
+Formats appear in the artifacts as the C++ types of MorphStore, e.g.,
+"static_vbp_f<vbp_l<bw, 8> >", "dynamic_vbp_f<512, 64, 8>", or
+"delta_f<1024, 8, dynamic_vbp_f<512, 64, 8> >", and in the configurations of
+the format selection as short names, e.g., "static_vbp_11" or
+"for+dynamic_vbp". Both are parsed into the same structured records, which
+are cached, such that each distinct name is parsed only once and all
+occurrences of a name share one record.
+
+The columns of formats in the loaded measurements are stored as pandas
+categoricals, such that each distinct name is stored (and parsed) only once,
+no matter how many rows refer to it.
+"""
+
+import collections
+import functools
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# Parsing the names of formats.
+# -----------------------------------------------------------------------------
+
+class Format(collections.namedtuple(
+        "Format", ["name", "family", "bw", "blockSize", "step", "inner"]
+)):
+    """
+    A format parsed from its name (see parse).
+
+    - name: the name of the format as found in the artifacts
+    - family: the family of the format without any parameters, i.e.,
+      "uncompr", "static_vbp", "dynamic_vbp", "delta", "for", etc.
+    - bw: the bit width of each data element, i.e., 64 for uncompr, the bit
+      width of static_vbp (None if it is a placeholder), and None otherwise
+    - blockSize: the number of data elements of a block (None if unknown)
+    - step: the number of data elements processed at once, which depends on
+      the processing style (None if unknown)
+    - inner: the format of the second level of a cascade, or None
+    """
+
+    __slots__ = ()
+
+    @property
+    def components(self):
+        """The families of all levels of the format, outermost first."""
+
+        if self.inner is None:
+            return (self.family,)
+        return (self.family,) + self.inner.components
+
+    @property
+    def abbrev(self):
+        """
+        The abbreviation of the format's family, as used in the legends of the
+        diagrams, e.g., "st" for static_vbp or "de" for delta.
+        """
+
+        return self.family[:2]
+
+_reToken = re.compile(r"\s*(?:([A-Za-z_][A-Za-z0-9_]*|\d+)|([<>,]))")
+
+def _tokenize(name):
+    tokens = []
+    pos = 0
+    name = name.rstrip()
+    while pos < len(name):
+        match = _reToken.match(name, pos)
+        if not match:
+            raise ValueError("invalid format: '{}'".format(name))
+        tokens.append(match.group(1) or match.group(2))
+        pos = match.end()
+    return tokens
+
+def _parseTemplate(tokens, pos):
+    """
+    Parses the C++ type or template argument starting at the given position of
+    the tokens. Returns an int, a string (e.g., the placeholder "bw"), or a
+    pair of the template's name and its list of arguments, along with the
+    position after it.
+    """
+
+    token = tokens[pos]
+    pos += 1
+    if token.isdigit():
+        return int(token), pos
+    if pos == len(tokens) or tokens[pos] != "<":
+        return token, pos
+    args = []
+    pos += 1
+    while tokens[pos] != ">":
+        arg, pos = _parseTemplate(tokens, pos)
+        args.append(arg)
+        if tokens[pos] == ",":
+            pos += 1
+    return (token, args), pos + 1
+
+def _fromTemplate(name, tree):
+    """Interprets the parsed C++ type of a format, see _parseTemplate."""
+
+    if isinstance(tree, str):
+        tree = (tree, [])
+    typeName, args = tree
+    family = typeName[:-len("_f")] if typeName.endswith("_f") else typeName
+    ints = [arg for arg in args if isinstance(arg, int)]
+    if family == "uncompr":
+        return Format(name, family, 64, 1, None, None)
+    if family == "static_vbp":
+        # The bit width and the step are the arguments of the layout vbp_l.
+        bw, step = args[0][1]
+        bw = bw if isinstance(bw, int) else None
+        return Format(name, family, bw, 64 * step, step, None)
+    if family == "dynamic_vbp":
+        blockSize, _, step = args
+        return Format(name, family, None, blockSize, step, None)
+    if args and isinstance(args[-1], tuple):
+        # A cascade, e.g., delta_f<blockSize, step, inner>.
+        inner = args[-1]
+        inner = parse(_formatTemplate(inner))
+        blockSize, step = (ints + [None, None])[:2]
+        return Format(name, family, None, blockSize, step, inner)
+    # E.g., delta_f<step> without a second level.
+    return Format(name, family, None, None, ints[-1] if ints else None, None)
+
+def _formatTemplate(tree):
+    """The inverse of _parseTemplate, in MorphStore's spelling."""
+
+    if isinstance(tree, tuple):
+        typeName, args = tree
+        s = "{}<{}".format(typeName, ", ".join(_formatTemplate(arg) for arg in args))
+        return s + (" >" if s.endswith(">") else ">")
+    return str(tree)
+
+def _fromShortName(name):
+    """Interprets the short name of a format, e.g., "static_vbp_11"."""
+
+    outer, sep, inner = name.partition("+")
+    if sep:
+        return Format(name, outer, None, None, None, parse(inner))
+    if name == "uncompr":
+        return Format(name, name, 64, 1, None, None)
+    match = re.match(r"static_vbp_(\d+|bit|pot)$", name)
+    if match:
+        bw = match.group(1)
+        return Format(
+                name, "static_vbp", int(bw) if bw.isdigit() else None, None,
+                None, None
+        )
+    return Format(name, name, None, None, None, None)
+
+@functools.lru_cache(maxsize=None)
+def parse(name):
+    """
+    Parses the given name of a format (a C++ type or a short name) into a
+    Format. The result is cached, so that parsing the same name again returns
+    the same record.
+    """
+
+    name = sys.intern(name)
+    if "<" in name or name.endswith("_f"):
+        tokens = _tokenize(name)
+        tree, pos = _parseTemplate(tokens, 0)
+        if pos != len(tokens):
+            raise ValueError("invalid format: '{}'".format(name))
+        return _fromTemplate(name, tree)
+    return _fromShortName(name)
+
+# -----------------------------------------------------------------------------
+# Storing formats in data frames.
+# -----------------------------------------------------------------------------
+
+# The names of columns holding formats, besides those ending with "_f".
+_FORMAT_COLS = {"format", "formatWithBw", "formatWithoutBw"}
+
+def isFormatCol(colName):
+    """Returns whether the column with the given name holds formats."""
+
+    return colName.endswith("_f") or colName in _FORMAT_COLS
+
+def categorize(df):
+    """
+    Converts all columns of the given data frame holding formats (see
+    isFormatCol) to categoricals, in place. Returns the data frame.
+    """
+
+    for colName in df.columns:
+        dtype = df[colName].dtype
+        if isFormatCol(colName) and not isinstance(dtype, pd.CategoricalDtype) and (
+                pd.api.types.is_string_dtype(df[colName]) or dtype == object
+        ):
+            df[colName] = df[colName].astype("category")
+    return df
+
+def mapFormats(values, attr):
+    """
+    Returns the given attribute of the parsed format of each of the given
+    values (a series of names of formats), as a series of the same length.
+    Each distinct value is parsed only once, whether the series is a
+    categorical or not. Missing values yield None.
+    """
+
+    codes, uniques = pd.factorize(values)
+    # The code -1 of missing values selects the trailing None.
+    mapped = np.array(
+            [getattr(parse(name), attr) for name in uniques] + [None],
+            dtype=object
+    )
+    return pd.Series(mapped[codes], index=values.index)
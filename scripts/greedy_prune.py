@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+
+"""
+This script evaluates a pruned variant of the greedy search for the best and
+worst format combinations of the Star Schema Benchmark queries (see greedy.sh).
+
+Instead of executing the query with every candidate format of a column, the
+pruned search ranks the candidates by the cost predicted from the compression
+profiles and the data characteristics, and executes only the top-k candidates
+as well as those whose predicted cost is within a margin of the best (or, for
+the worst combination, the worst) predicted cost. The script replays the
+pruned search on the measurements of an exhaustive search and reports how many
+executions it saves, how often it changes the chosen formats, and how much
+this changes the runtime of each query. It also writes the candidates kept for
+each column to an output directory of its own.
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+import datachars
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Regarding the cost model
+# -----------------------------------------------------------------------------
+
+# The internal names of the formats in the compression profiles.
+_FMT_STATIC_VBP = "static_vbp_f<vbp_l<bw, 8> >"
+_FMT_DYNAMIC_VBP = "dynamic_vbp_f<512, 64, 8>"
+_FMT_UNCOMPR = "uncompr_f"
+
+def _readProfile(fileName):
+    """Loads one compression profile."""
+
+    return pd.read_csv(
+            os.path.join(pathProfiles, fileName), sep="\t", skiprows=2
+    )
+
+def loadProfiles():
+    """
+    Loads the compression profiles and derives the costs (in µs) per data
+    element for compressing and decompressing in each format and bit width,
+    as well as the cost per byte for accessing uncompressed data in memory.
+    """
+
+    # Formats on their own, by bit width.
+    dfAlone = _readProfile("bw_prof_alone.csv")
+    dfMemory = dfAlone[dfAlone["format"] == _FMT_UNCOMPR]
+    dfAlone = dfAlone[dfAlone["vector_extension"] == processingStyle]
+    dfAlone = dfAlone.groupby(["format", "bitwidth"]).mean(numeric_only=True)
+    costsAlone = pd.DataFrame({
+        "compr": dfAlone["runtime compr [µs]"] / dfAlone["countValues"],
+        "decompr": dfAlone["runtime decompr [µs]"] / dfAlone["countValues"],
+    })
+
+    # The dynamic_vbp format as the last step of a cascade, by bit width.
+    dfCasc = _readProfile("bw_prof_casc.csv")
+    dfCasc = dfCasc[
+            (dfCasc["vector_extension"] == processingStyle) &
+            (dfCasc["format"] == _FMT_DYNAMIC_VBP)
+    ].groupby("bitwidth").mean(numeric_only=True)
+    costsCasc = pd.DataFrame({
+        "compr": dfCasc["runtime compr [µs]"] / dfCasc["countValuesLarge"],
+        "decompr": dfCasc["runtime decompr [µs]"] / dfCasc["countValuesLarge"],
+    })
+
+    # The logical first steps of a cascade (delta, for).
+    dfConst = _readProfile("const_prof_casc.csv")
+    dfConst = dfConst[
+            dfConst["vector_extension"] == processingStyle
+    ].groupby("format").mean(numeric_only=True)
+    costsConst = pd.DataFrame({
+        "compr": dfConst["runtime compr [µs]"] / dfConst["countValues"],
+        "decompr": dfConst["runtime decompr [µs]"] / dfConst["countValues"],
+    })
+
+    # Accessing uncompressed data in memory.
+    costPerByte = (
+            dfMemory["runtime agg [µs]"] / dfMemory["size used [byte]"]
+    ).mean()
+
+    return dict(
+            alone=costsAlone, casc=costsCasc, const=costsConst,
+            costPerByte=costPerByte
+    )
+
+def _bitwidth(value):
+    """Returns the number of bits required to represent the given value."""
+
+    return min(max(int(value).bit_length(), 1), 64)
+
+def getColInfos(q):
+    """
+    Returns the information on each column of the given query the cost model
+    needs: its characteristics, its bit width histogram (as probabilities),
+    how often it is read, and whether it is written by the query.
+    """
+
+    dc = datachars.load(os.path.join(pathDataCh, "q{}.csv".format(q)))
+    bwProbs = dc.bwProbs()
+
+    colInfos = dict()
+    for colName, dfCol in dc.attrs.groupby("colName", sort=False, observed=True):
+        first = dfCol.iloc[0]
+        colInfos[colName] = dict(
+                countValues=first["valueCount"],
+                sorted=bool(first["Sorted"]),
+                min=first["Min"],
+                max=first["Max"],
+                bwProbs=bwProbs[dfCol.index[0]],
+                countReads=dfCol["colRole"].str.startswith("in").sum(),
+                isWritten=dfCol["colRole"].str.startswith("out").any(),
+        )
+    return colInfos
+
+def predictCost(profiles, colInfo, fmt):
+    """
+    Predicts the cost (in µs) of representing the column described by colInfo
+    in the given format (a short name as in the results of the greedy search,
+    e.g., "static_vbp_8" or "delta+dynamic_vbp"). The cost comprises
+    decompressing and reading the column each time it is read, as well as
+    compressing and writing it if the query produces it.
+    """
+
+    bws = range(1, 64 + 1)
+    if fmt == "uncompr":
+        costCompr, costDecompr, bytesPerValue = 0, 0, 8
+    elif fmt.startswith("static_vbp_"):
+        bw = int(fmt[len("static_vbp_"):])
+        costs = profiles["alone"].loc[(_FMT_STATIC_VBP, bw)]
+        costCompr, costDecompr = costs["compr"], costs["decompr"]
+        bytesPerValue = bw / 8
+    elif fmt == "dynamic_vbp":
+        # The cost depends on the bit width of each data element.
+        costs = profiles["alone"].loc[_FMT_DYNAMIC_VBP].reindex(bws)
+        costCompr = (costs["compr"].values * colInfo["bwProbs"]).sum()
+        costDecompr = (costs["decompr"].values * colInfo["bwProbs"]).sum()
+        bytesPerValue = (colInfo["bwProbs"] * bws).sum() / 8
+    elif fmt in ["delta+dynamic_vbp", "for+dynamic_vbp"]:
+        # We approximate the bit width of the data elements after the logical
+        # step: For delta, the differences of sorted data are about the range
+        # over the number of data elements, while those of unsorted data can
+        # be arbitrary. For for, the offsets span the range.
+        rangeValues = colInfo["max"] - colInfo["min"]
+        if fmt.startswith("delta"):
+            bw = (
+                _bitwidth(rangeValues // max(colInfo["countValues"], 1))
+                if colInfo["sorted"] else 64
+            )
+            costsFirst = profiles["const"].loc["delta_f<8>"]
+        else:
+            bw = _bitwidth(rangeValues)
+            costsFirst = profiles["const"].loc["for_f<8>"]
+        costsSecond = profiles["casc"].loc[bw]
+        costCompr = costsFirst["compr"] + costsSecond["compr"]
+        costDecompr = costsFirst["decompr"] + costsSecond["decompr"]
+        bytesPerValue = bw / 8
+    else:
+        raise RuntimeError("unsupported format: '{}'".format(fmt))
+
+    costAccess = bytesPerValue * profiles["costPerByte"]
+    return colInfo["countValues"] * (
+            colInfo["countReads"] * (costDecompr + costAccess) +
+            colInfo["isWritten"] * (costCompr + costAccess)
+    )
+
+# -----------------------------------------------------------------------------
+# Regarding the greedy search
+# -----------------------------------------------------------------------------
+
+def pruneCandidates(dfCands, findBest, topK, margin):
+    """
+    Marks which candidates of a column to execute in the pruned search: the
+    topK candidates with the best (findBest) or worst predicted cost, all
+    candidates whose predicted cost is within the given relative margin of
+    that cost, and the uncompressed format, which is the reference of the
+    greedy search.
+    """
+
+    dfCands = dfCands.sort_values(
+            "predicted cost [µs]", ascending=findBest
+    ).copy()
+    dfCands["rank"] = range(1, len(dfCands) + 1)
+    costRef = dfCands["predicted cost [µs]"].iloc[0]
+    if findBest:
+        isWithinMargin = dfCands["predicted cost [µs]"] <= costRef * (1 + margin)
+    else:
+        isWithinMargin = dfCands["predicted cost [µs]"] >= costRef * (1 - margin)
+    dfCands["kept"] = (
+            (dfCands["rank"] <= topK) | isWithinMargin |
+            (dfCands["format"] == "uncompr")
+    )
+    return dfCands
+
+def replayGreedy(dfRuntimes, findBest):
+    """
+    Replays the greedy search on the given mean runtimes per column and
+    candidate format, in the order the columns were searched. For each column,
+    the fastest (findBest) or slowest candidate is chosen if it beats the
+    runtime achieved so far, otherwise the column stays uncompressed. Returns
+    the chosen format of each column and the final runtime.
+    """
+
+    runtimeCur = None
+    chosen = dict()
+    for colName, dfCol in dfRuntimes.groupby("colName", sort=False):
+        idx = dfCol["runtime"].idxmin() if findBest else dfCol["runtime"].idxmax()
+        runtime = dfCol.loc[idx, "runtime"]
+        if runtimeCur is None or (
+                runtime < runtimeCur if findBest else runtime > runtimeCur
+        ):
+            chosen[colName] = dfCol.loc[idx, "format"]
+            runtimeCur = runtime
+        else:
+            chosen[colName] = "uncompr"
+    return chosen, runtimeCur
+
+def evaluatePruning(profiles, q, search, topK, margin):
+    """
+    Replays the exhaustive and the pruned greedy search for the given query
+    and search ("best" or "worst") on the measurements of the exhaustive
+    search. Returns the candidates of all columns (with their predicted costs
+    and whether they are kept) and a summary of the comparison.
+
+    Note that the runtimes of the candidates depend on the formats chosen for
+    the columns searched before. Thus, once the pruned search deviates from
+    the exhaustive one, the replay only approximates the pruned search.
+    """
+
+    findBest = search == "best"
+    pathOut = pathsOut[search]
+
+    dfRuntimes = pd.read_csv(
+            os.path.join(pathOut, "q{}_runtimes.csv".format(q)), sep="\t"
+    )
+    dfMean = dfRuntimes.groupby(
+            ["colName", "format"], as_index=False, sort=False
+    )["runtime"].mean()
+
+    colInfos = getColInfos(q)
+    dfMean["predicted cost [µs]"] = [
+        predictCost(profiles, colInfos[colName], fmt)
+        for colName, fmt in zip(dfMean["colName"], dfMean["format"])
+    ]
+    dfCands = pd.concat([
+        pruneCandidates(dfCol, findBest, topK, margin)
+        for _, dfCol in dfMean.groupby("colName", sort=False)
+    ])
+
+    chosenExh, runtimeExh = replayGreedy(dfMean, findBest)
+    chosenPruned, runtimePruned = replayGreedy(
+            dfMean[dfMean.index.isin(dfCands[dfCands["kept"]].index)],
+            findBest
+    )
+    countChanged = sum(
+            chosenExh[colName] != chosenPruned[colName] for colName in chosenExh
+    )
+
+    # Each kept candidate is executed as often as in the exhaustive search.
+    countReps = dfRuntimes.groupby(["colName", "format"]).size()
+    countExecPruned = countReps[
+            pd.MultiIndex.from_frame(dfCands[dfCands["kept"]][["colName", "format"]])
+    ].sum()
+
+    summary = {
+        "query": q,
+        "search": search,
+        "columns": len(chosenExh),
+        "executions exhaustive": len(dfRuntimes),
+        "executions pruned": countExecPruned,
+        "executions saved [%]": 100 * (1 - countExecPruned / len(dfRuntimes)),
+        "choices changed": countChanged,
+        "runtime exhaustive [s]": runtimeExh / 1000 / 1000,
+        "runtime pruned [s]": runtimePruned / 1000 / 1000,
+        "runtime delta [%]": 100 * (runtimePruned / runtimeExh - 1),
+    }
+    return dfCands, summary
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Defaults.
+    scaleFactor = 100
+    processingStyle = "avx512<v512<uint64_t>>"
+    queries = list(sorted(["{}.{}".format(mj, mn) for mj in range(1, 4+1) for mn in range(1, 3+1)] + ["3.4"]))
+    topK = 2
+    margin = 0.05
+    pathArtifacts = os.path.join("artifacts", "ssb")
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "-sf", "--scaleFactor", metavar="N", type=int,
+            help="The SSB scale factor. Defaults to {}.".format(scaleFactor),
+            default=scaleFactor
+    )
+    parser.add_argument(
+            "-ps", "--processingStyle", metavar="PROCESSING_STYLE",
+            help="The processing style whose compression profiles to use. "
+                 "Defaults to '{}'.".format(processingStyle),
+            default=processingStyle
+    )
+    parser.add_argument(
+            "-q", "--query", "--queries", metavar="N.N", nargs="+",
+            help="The queries to evaluate. Defaults to all queries.",
+            default=queries, choices=queries,
+    )
+    parser.add_argument(
+            "-k", "--topK", metavar="N", type=int,
+            help="The number of candidates per column to keep in any case. "
+                 "Defaults to {}.".format(topK),
+            default=topK
+    )
+    parser.add_argument(
+            "-m", "--margin", metavar="FRACTION", type=float,
+            help="Additionally keep the candidates whose predicted cost is "
+                 "within this relative margin of the best (worst) predicted "
+                 "cost. Defaults to {}.".format(margin),
+            default=margin
+    )
+    parser.add_argument(
+            "--pathArtifacts", metavar="PATH",
+            help="The directory of the SSB artifacts. Defaults to "
+                 "'{}'.".format(pathArtifacts),
+            default=pathArtifacts
+    )
+    parser.add_argument(
+            "-o", "--pathOut", metavar="PATH",
+            help="The directory to write the kept candidates and the summary "
+                 "to. Defaults to 'greedy_pruning_sf<N>' in the current "
+                 "directory, such that the SSB artifacts stay untouched.",
+            default=None
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+    scaleFactor = args.scaleFactor
+    processingStyle = args.processingStyle
+    queries = args.query
+    topK = args.topK
+    margin = args.margin
+    pathArtifacts = args.pathArtifacts
+
+    # -------------------------------------------------------------------------
+    # Setting the paths to certain artifacts
+    # -------------------------------------------------------------------------
+
+    pathProfiles = os.path.join(pathArtifacts, "compr_profiles")
+    pathDataCh = os.path.join(pathArtifacts, "dc_sf{}".format(scaleFactor))
+    pathsOut = {
+        "best": os.path.join(pathArtifacts, "ssb_formats_bestperf_sf{}".format(scaleFactor)),
+        "worst": os.path.join(pathArtifacts, "ssb_formats_worstperf_sf{}".format(scaleFactor)),
+    }
+    pathPruning = args.pathOut
+    if pathPruning is None:
+        pathPruning = "greedy_pruning_sf{}".format(scaleFactor)
+
+    # -------------------------------------------------------------------------
+    # Evaluation of the pruned search
+    # -------------------------------------------------------------------------
+
+    profiles = loadProfiles()
+
+    os.makedirs(pathPruning, exist_ok=True)
+    summaries = []
+    for search in ["best", "worst"]:
+        for q in queries:
+            dfCands, summary = evaluatePruning(profiles, q, search, topK, margin)
+            dfCands.to_csv(
+                    os.path.join(pathPruning, "q{}_{}_candidates.csv".format(q, search)),
+                    sep="\t", index=False
+            )
+            summaries.append(summary)
+    dfSummary = pd.DataFrame(summaries)
+    dfSummary.to_csv(
+            os.path.join(pathPruning, "summary.csv"), sep="\t", index=False
+    )
+
+    print(dfSummary.to_string(index=False, float_format="{:.2f}".format))
+    print()
+    for search in ["best", "worst"]:
+        dfSearch = dfSummary[dfSummary["search"] == search]
+        print(
+                "{}: {} of {} executions saved ({:.1f}%), {} of {} choices "
+                "changed (top-{}, margin {}), runtime deltas {:+.2f}% to "
+                "{:+.2f}%.".format(
+                        search,
+                        dfSearch["executions exhaustive"].sum() - dfSearch["executions pruned"].sum(),
+                        dfSearch["executions exhaustive"].sum(),
+                        100 * (1 - dfSearch["executions pruned"].sum() / dfSearch["executions exhaustive"].sum()),
+                        dfSearch["choices changed"].sum(),
+                        dfSearch["columns"].sum(),
+                        topK, margin,
+                        dfSearch["runtime delta [%]"].min(),
+                        dfSearch["runtime delta [%]"].max(),
+                )
+        )
+    print()
+    print("The candidates kept for each column are in '{}'.".format(pathPruning))
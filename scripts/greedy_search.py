@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+"""
+This script searches the best or worst format combination of a Star Schema
+Benchmark query w.r.t. performance in MorphStore (see greedy.sh).
+
+The search is greedy: Starting with all columns uncompressed, it tries the
+candidate formats of one column after the other, executing the query with
+each candidate combination several times, and keeps the format of the fastest
+(or slowest) combination for the column. The candidates of a column are
+static_vbp with its maximum bit width and a few larger ones, and, if the
+column is only accessed sequentially, also dynamic_vbp as well as its cascades
+with delta and for. Columns forced to be uncompressed and query results stay
+uncompressed.
+
+Each measured runtime is appended to q<N.N>_runtimes.csv in the output
+directory immediately. The search resumes from this file, i.e., it executes
+only the combinations and repetitions not measured yet, and writes the chosen
+formats to q<N.N>.csv in the end.
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+
+import pandas as pd
+
+import artifacts
+import datachars
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Regarding the candidates
+# -----------------------------------------------------------------------------
+
+FMT_UNCOMPR = "uncompr"
+
+def candidateFormats(bwMax, hasRndAccess):
+    """
+    Returns the candidate formats (short names as in the results of the search)
+    for a column with the given maximum bit width, in the order they are tried.
+    Larger bit widths of static_vbp can be faster due to the alignment of the
+    packed data elements to bytes and words.
+    """
+
+    bws = {bwMax, bwMax + bwMax % 2, (bwMax // 8 + 1) * 8}
+    if 16 < bwMax < 32:
+        bws.add(32)
+    fmts = ["static_vbp_{}".format(bw) for bw in sorted(bws) if bw <= 64]
+    if not hasRndAccess:
+        fmts += ["dynamic_vbp", "delta+dynamic_vbp", "for+dynamic_vbp"]
+    return fmts
+
+def getColumns(dc):
+    """
+    Returns the names of all columns in the given data characteristics of a
+    query (see datachars), base columns first, along with their candidate
+    formats in the search order. The candidates of the columns which are not
+    searched are None.
+    """
+
+    dfDc = dc.attrs.assign(bwMax=dc.bwMax())
+    columns = []
+    for colName, dfCol in dfDc.groupby("colName", sort=False, observed=True):
+        if dfCol["isForcedUncompr"].any() or dfCol["isResult"].any():
+            fmts = None
+        else:
+            fmts = candidateFormats(
+                    int(dfCol["bwMax"].max()),
+                    dfCol[["hasRndAccessUnsorted", "hasRndAccessSorted"]].any().any()
+            )
+        columns.append((colName, fmts, dfCol["minDistanceToBase"].min() == 0))
+    return [
+        (colName, fmts)
+        for colName, fmts, isBase in sorted(
+                columns, key=lambda col: not col[2]
+        )
+    ]
+
+def getEvaluations(columns, countReps):
+    """
+    Returns the (column, format, repetition) triples the search for the given
+    columns (see getColumns) measures, in order. The combination with all
+    columns uncompressed is measured as a candidate of the first column.
+    """
+
+    evaluations = []
+    for colName, fmts in columns:
+        if fmts is None:
+            continue
+        if not evaluations:
+            fmts = [FMT_UNCOMPR] + fmts
+        for fmt in fmts:
+            for repIdx in range(1, countReps + 1):
+                evaluations.append((colName, fmt, repIdx))
+    return evaluations
+
+# -----------------------------------------------------------------------------
+# Regarding the runtimes
+# -----------------------------------------------------------------------------
+
+_RUNTIMES_HEADER = ["colName", "format", "repetition", "runtime"]
+
+def readRuntimes(filePath):
+    """
+    Reads the runtimes measured so far from the given file. Returns a
+    dictionary mapping each (column, format, repetition) triple to its
+    runtime, which is empty if the file does not exist.
+    """
+
+    if not os.path.exists(filePath):
+        return dict()
+    dfRuntimes = pd.read_csv(filePath, sep="\t")
+    return {
+        (colName, fmt, int(repIdx)): runtime
+        for colName, fmt, repIdx, runtime in dfRuntimes[
+                _RUNTIMES_HEADER
+        ].itertuples(index=False)
+    }
+
+def appendRuntime(filePath, colName, fmt, repIdx, runtime):
+    """
+    Appends one measured runtime to the given file, writing the header if the
+    file does not exist yet.
+    """
+
+    writeHeader = not os.path.exists(filePath)
+    with open(filePath, "a") as f:
+        if writeHeader:
+            f.write("\t".join(_RUNTIMES_HEADER) + "\n")
+        f.write("{}\t{}\t{}\t{}\n".format(colName, fmt, repIdx, runtime))
+
+# -----------------------------------------------------------------------------
+# Regarding the search
+# -----------------------------------------------------------------------------
+
+def search(columns, countReps, measure, runtimes, findBest=True, record=None):
+    """
+    Executes the greedy search for the given columns (see getColumns). The
+    function measure(formats, repIdxs) executes the query with the given
+    formats of all columns once per given repetition and yields the runtimes.
+    Only the repetitions not in the given dictionary of runtimes measured so
+    far (see readRuntimes) are measured. Each new runtime is added to this
+    dictionary and passed to record(colName, fmt, repIdx, runtime), if given.
+    Returns the chosen format of each column.
+
+    The mean runtime of a candidate decides. A column stays uncompressed if no
+    candidate beats the runtime achieved so far.
+    """
+
+    formats = {colName: FMT_UNCOMPR for colName, _ in columns}
+    runtimeCur = None
+    for colName, fmts in columns:
+        if fmts is None:
+            continue
+        if runtimeCur is None:
+            fmts = [FMT_UNCOMPR] + fmts
+        for fmt in fmts:
+            repIdxs = [
+                repIdx
+                for repIdx in range(1, countReps + 1)
+                if (colName, fmt, repIdx) not in runtimes
+            ]
+            if not repIdxs:
+                continue
+            for repIdx, runtime in zip(
+                    repIdxs, measure(dict(formats, **{colName: fmt}), repIdxs)
+            ):
+                runtimes[colName, fmt, repIdx] = runtime
+                if record is not None:
+                    record(colName, fmt, repIdx, runtime)
+        runtimeMean = {
+            fmt: sum(
+                runtimes[colName, fmt, repIdx]
+                for repIdx in range(1, countReps + 1)
+            ) / countReps
+            for fmt in fmts
+        }
+        fmtChosen = (min if findBest else max)(fmts, key=runtimeMean.get)
+        runtime = runtimeMean[fmtChosen]
+        if runtimeCur is None or (
+                runtime < runtimeCur if findBest else runtime > runtimeCur
+        ):
+            formats[colName] = fmtChosen
+            runtimeCur = runtime
+    return formats
+
+def measureMorphStore(q, ssbFlags, formats, repIdxs):
+    """
+    Builds the given query with the given formats of all columns using
+    MorphStore's SSB script in the current directory and executes it once per
+    given repetition. Yields the runtime of each repetition as soon as it has
+    been measured.
+    """
+
+    with tempfile.TemporaryDirectory() as pathTmp:
+        pd.DataFrame(
+                list(formats.items()), columns=["colName", "format"]
+        ).to_csv(
+                os.path.join(pathTmp, "q{}.csv".format(q)), sep="\t",
+                index=False
+        )
+        flags = ["./ssb.sh"] + ssbFlags + [
+            "-c", "manual", "-cconfig", pathTmp, "-q", q,
+        ]
+        subprocess.run(
+                flags + ["-s", "t", "-e", "b"], check=True,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        for repIdx in repIdxs:
+            pathTime = os.path.join(pathTmp, "time_{}".format(repIdx))
+            subprocess.run(
+                    flags + ["-s", "r", "--pathTime", pathTime], check=True,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            yield artifacts.readMorphStoreQueryRow(
+                    os.path.join(pathTime, "q{}.csv".format(q))
+            )["runtime"]
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Defaults.
+    scaleFactor = 100
+    processingStyle = "avx512<v512<uint64_t>>"
+    countReps = 3
+    pathArtifacts = os.path.join("artifacts", "ssb")
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "-sf", "--scaleFactor", metavar="N", type=int,
+            help="The SSB scale factor. Defaults to {}.".format(scaleFactor),
+            default=scaleFactor
+    )
+    parser.add_argument(
+            "-ps", "--processingStyle", metavar="PROCESSING_STYLE",
+            help="The processing style to use. Defaults to "
+                 "'{}'.".format(processingStyle),
+            default=processingStyle
+    )
+    parser.add_argument(
+            "-r", "--repetitions", metavar="N", type=int,
+            help="The number of times to execute each candidate combination. "
+                 "Defaults to {}.".format(countReps),
+            default=countReps
+    )
+    parser.add_argument(
+            "-q", "--query", metavar="N.N", required=True,
+            help="The query to search the format combination for.",
+    )
+    parser.add_argument(
+            "-o", "--pathOut", metavar="PATH", required=True,
+            help="The directory of the runtimes and the chosen formats.",
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+            "--findBest", dest="findBest", action="store_true",
+            help="Search the best format combination.",
+    )
+    group.add_argument(
+            "--findWorst", dest="findBest", action="store_false",
+            help="Search the worst format combination.",
+    )
+    parser.add_argument(
+            "--pathArtifacts", metavar="PATH",
+            help="The directory of the SSB artifacts. Defaults to "
+                 "'{}'.".format(pathArtifacts),
+            default=pathArtifacts
+    )
+    parser.add_argument(
+            "--pathMal", metavar="PATH", required=True,
+            help="The directory of the MAL programs of the queries.",
+    )
+    parser.add_argument(
+            "--pathRefRes", metavar="PATH", required=True,
+            help="The directory of the reference results of the queries.",
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+    q = args.query
+    countReps = args.repetitions
+    pathOut = args.pathOut
+
+    # -------------------------------------------------------------------------
+    # Setting the paths to certain artifacts
+    # -------------------------------------------------------------------------
+
+    pathDataCh = os.path.join(
+            args.pathArtifacts, "dc_sf{}".format(args.scaleFactor)
+    )
+    runtimesFilePath = os.path.join(pathOut, "q{}_runtimes.csv".format(q))
+    outFilePath = os.path.join(pathOut, "q{}.csv".format(q))
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    # TODO The reference results should not be necessary here.
+    ssbFlags = [
+        "-mem", "n", "-um", "s", "-p", "t", "-sf", str(args.scaleFactor),
+        "-ps", args.processingStyle, "--pathArtifacts", args.pathArtifacts,
+        "--pathMal", args.pathMal, "--pathRefRes", args.pathRefRes,
+    ]
+
+    columns = getColumns(datachars.load(
+            os.path.join(pathDataCh, "q{}.csv".format(q))
+    ))
+    runtimes = readRuntimes(runtimesFilePath)
+    evaluations = getEvaluations(columns, countReps)
+    print("query {}: {} of {} evaluations measured so far".format(
+            q, sum(evaluation in runtimes for evaluation in evaluations),
+            len(evaluations)
+    ))
+
+    os.makedirs(pathOut, exist_ok=True)
+    formats = search(
+            columns, countReps,
+            lambda formats, repIdxs: measureMorphStore(
+                    q, ssbFlags, formats, repIdxs
+            ),
+            runtimes, args.findBest,
+            lambda *row: appendRuntime(runtimesFilePath, *row)
+    )
+    pd.DataFrame(
+            list(formats.items()), columns=["colName", "format"]
+    ).to_csv(outFilePath, sep="\t", index=False)
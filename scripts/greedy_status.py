@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+"""
+This script reports the progress of the greedy search for the best and worst
+format combinations of the Star Schema Benchmark queries (see greedy.sh).
+
+For each query and search, it tells whether the search is done, in progress, or
+pending, how many candidate evaluations (i.e., query executions with one
+column in one candidate format) have been measured so far, and how many
+remain. The remaining ones are those of the search (see greedy_search.py)
+missing in the runtimes measured so far. Alternatively, it checks whether the
+search for a single query is done.
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+import datachars
+import greedy_search
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Regarding the candidates of the greedy search
+# -----------------------------------------------------------------------------
+
+def getColumns(q):
+    """
+    Returns the columns of the given query along with the candidate formats
+    the greedy search tries for them (see greedy_search.getColumns). Returns
+    None if the data characteristics are not available.
+    """
+
+    dcFilePath = os.path.join(pathDataCh, "q{}.csv".format(q))
+    if not os.path.exists(dcFilePath):
+        return None
+    return greedy_search.getColumns(datachars.load(dcFilePath))
+
+# -----------------------------------------------------------------------------
+# Regarding the progress of the greedy search
+# -----------------------------------------------------------------------------
+
+def isDone(pathOut, q):
+    """
+    Returns whether the greedy search for the given query has been completed,
+    i.e., whether its output file lists the format of each column of the
+    query.
+    """
+
+    outFilePath = os.path.join(pathOut, "q{}.csv".format(q))
+    if not os.path.exists(outFilePath):
+        return False
+    try:
+        dfOut = pd.read_csv(outFilePath, sep="\t")
+    except (pd.errors.EmptyDataError, pd.errors.ParserError):
+        return False
+    if not {"colName", "format"}.issubset(dfOut.columns):
+        return False
+
+    columns = getColumns(q)
+    if columns is None:
+        # We cannot check the output file in detail.
+        return len(dfOut) > 0
+    return {
+        colName for colName, fmts in columns if fmts is not None
+    }.issubset(dfOut["colName"])
+
+def getStatus(pathOut, q):
+    """
+    Returns the progress of the greedy search for the given query as a
+    dictionary, see the module's docstring.
+    """
+
+    runtimes = greedy_search.readRuntimes(
+            os.path.join(pathOut, "q{}_runtimes.csv".format(q))
+    )
+    countMeasured = len(runtimes)
+    countColsMeasured = len({colName for colName, _, _ in runtimes})
+
+    columns = getColumns(q)
+    if columns is None:
+        countCols = None
+        evaluations = None
+    else:
+        countCols = sum(fmts is not None for _, fmts in columns)
+        evaluations = greedy_search.getEvaluations(columns, countReps)
+
+    if isDone(pathOut, q):
+        state = "done"
+        countRemaining = 0
+    else:
+        state = "in progress" if countMeasured else "pending"
+        countRemaining = (
+            None
+            if evaluations is None
+            else sum(
+                evaluation not in runtimes for evaluation in evaluations
+            )
+        )
+
+    return dict(
+            state=state,
+            countColsMeasured=countColsMeasured,
+            countCols=countCols,
+            countMeasured=countMeasured,
+            countRemaining=countRemaining,
+    )
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Defaults.
+    scaleFactor = 100
+    queries = list(sorted(["{}.{}".format(mj, mn) for mj in range(1, 4+1) for mn in range(1, 3+1)] + ["3.4"]))
+    countReps = 3
+    pathArtifacts = os.path.join("artifacts", "ssb")
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "-sf", "--scaleFactor", metavar="N", type=int,
+            help="The SSB scale factor. Defaults to {}.".format(scaleFactor),
+            default=scaleFactor
+    )
+    parser.add_argument(
+            "-r", "--repetitions", metavar="N", type=int,
+            help="The number of times the greedy search executes each "
+                 "candidate. Defaults to {}.".format(countReps),
+            default=countReps
+    )
+    parser.add_argument(
+            "-q", "--query", "--queries", metavar="N.N", nargs="+",
+            help="The queries to report. Defaults to all queries.",
+            default=queries, choices=queries,
+    )
+    parser.add_argument(
+            "--pathArtifacts", metavar="PATH",
+            help="The directory of the SSB artifacts. Defaults to "
+                 "'{}'.".format(pathArtifacts),
+            default=pathArtifacts
+    )
+    parser.add_argument(
+            "--isDone", metavar="SEARCH", choices=["best", "worst"],
+            help="Do not report anything, but exit with status 0 if the "
+                 "given search is done for the (single) given query, and "
+                 "with status 1 otherwise.",
+            default=None
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+    scaleFactor = args.scaleFactor
+    countReps = args.repetitions
+    queries = args.query
+    pathArtifacts = args.pathArtifacts
+
+    # -------------------------------------------------------------------------
+    # Setting the paths to certain artifacts
+    # -------------------------------------------------------------------------
+
+    pathDataCh = os.path.join(pathArtifacts, "dc_sf{}".format(scaleFactor))
+    pathsOut = {
+        "best": os.path.join(pathArtifacts, "ssb_formats_bestperf_sf{}".format(scaleFactor)),
+        "worst": os.path.join(pathArtifacts, "ssb_formats_worstperf_sf{}".format(scaleFactor)),
+    }
+
+    # -------------------------------------------------------------------------
+    # Checking a single query
+    # -------------------------------------------------------------------------
+
+    if args.isDone:
+        if len(queries) != 1:
+            parser.error("--isDone requires exactly one query")
+        sys.exit(0 if isDone(pathsOut[args.isDone], queries[0]) else 1)
+
+    # -------------------------------------------------------------------------
+    # Reporting the progress
+    # -------------------------------------------------------------------------
+
+    def fmt(val):
+        return "?" if val is None else str(val)
+
+    rows = []
+    for search in ["best", "worst"]:
+        for q in queries:
+            status = getStatus(pathsOut[search], q)
+            rows.append(dict(
+                query=q,
+                search=search,
+                state=status["state"],
+                columns="{}/{}".format(
+                        status["countColsMeasured"], fmt(status["countCols"])
+                ),
+                measured=status["countMeasured"],
+                remaining=fmt(status["countRemaining"]),
+            ))
+    dfStatus = pd.DataFrame(rows)
+
+    print(dfStatus.to_string(index=False))
+    print()
+    print(
+            "The remaining evaluations are the candidates of the search "
+            "(@{} repetitions) missing in q*_runtimes.csv.".format(countReps)
+    )
@@ -0,0 +1,75 @@
+"""
+Some utilities for distributing independent tasks to several processes,
+required by the diagram generation of both the micro benchmarks and the Star
+Schema Benchmark.
+"""
+
+import multiprocessing
+
+# -----------------------------------------------------------------------------
+# Utility for executing independent tasks in parallel.
+# -----------------------------------------------------------------------------
+
+# The number of worker processes to use. With 1, everything is executed in the
+# calling process.
+countJobs = 1
+
+def starmap(fn, argsList):
+    """
+    Calls fn with each tuple of arguments in argsList and returns the results
+    in the order of argsList, no matter in which order they were computed.
+
+    If countJobs is greater than one, the calls are distributed to that many
+    worker processes. The workers are forked from the calling process, such
+    that fn can rely on the global variables set by the main program. Note
+    that fn must be a module-level function and that its arguments and
+    results must be picklable.
+    """
+
+    argsList = list(argsList)
+    if countJobs <= 1 or len(argsList) <= 1:
+        return [fn(*args) for args in argsList]
+
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(min(countJobs, len(argsList))) as pool:
+        return pool.starmap(fn, argsList)
+
+# -----------------------------------------------------------------------------
+# Utility for executing independent tasks in isolated processes.
+# -----------------------------------------------------------------------------
+
+# The functions passed to the current call of runIsolated. The workers inherit
+# them when they are forked.
+_isolatedFns = None
+
+def _runIsolatedFn(fnIdx):
+    _isolatedFns[fnIdx]()
+
+def runIsolated(fns):
+    """
+    Calls each of the given functions without arguments.
+
+    If countJobs is greater than one, each function is called in its own
+    worker process, which is forked from the calling process and exits
+    afterwards. That way, global state modified by one function, e.g., the
+    rcParams of matplotlib, cannot affect another one. At most countJobs
+    workers run at the same time. Since the workers inherit the functions and
+    all data they reference, nothing is pickled, and the functions need not be
+    module-level functions.
+    """
+
+    global _isolatedFns
+
+    fns = list(fns)
+    if countJobs <= 1 or len(fns) <= 1:
+        for fn in fns:
+            fn()
+        return
+
+    _isolatedFns = fns
+    try:
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(min(countJobs, len(fns)), maxtasksperchild=1) as pool:
+            pool.map(_runIsolatedFn, range(len(fns)), chunksize=1)
+    finally:
+        _isolatedFns = None
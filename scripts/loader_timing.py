@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+
+"""
+This script measures how long the diagram generation of the micro benchmarks
+(see dias_microbenchmarks.py) takes to derive the attributes of Figures 4, 5,
+and 6 from the loaded measurements, on synthetic inputs much larger than the
+measurements of the paper.
+
+The synthetic inputs are the measurements of all repetitions (see
+vldb2020_microbenchmarks.sh), replicated a given number of times. For Figure 5,
+each replica gets its own datasets, such that the number of groups grows with
+the number of rows, like in a sweep over more selectivities and datasets.
+Each derivation is timed in its current, column-wise form and in the original
+row-wise form (using DataFrame.apply), which is kept here as a reference. The
+script also checks that both forms yield the same results.
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+import dias_microbenchmarks as dias
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Generating synthetic inputs
+# -----------------------------------------------------------------------------
+
+def readReps(pathArtifacts, prefix):
+    """
+    Reads the measurements of all repetitions of the experiment with the given
+    prefix, e.g., "example", and combines them.
+    """
+
+    dfs = []
+    repIdx = 1
+    while True:
+        filePath = os.path.join(pathArtifacts, "{}_{}.csv".format(prefix, repIdx))
+        if not os.path.exists(filePath):
+            break
+        dfs.append(pd.read_csv(filePath, sep="\t", skiprows=2))
+        repIdx += 1
+    if not dfs:
+        raise RuntimeError(
+                "no measurements '{}_*.csv' in '{}'".format(prefix, pathArtifacts)
+        )
+    return pd.concat(dfs, ignore_index=True)
+
+def replicate(df, factor, datasetCol=None):
+    """
+    Replicates the rows of the given data frame factor times. If datasetCol is
+    given, the values in this column are shifted by a multiple of 12 in each
+    replica, such that each replica has its own datasets.
+    """
+
+    dfs = []
+    for i in range(factor):
+        dfReplica = df.copy()
+        if datasetCol is not None:
+            dfReplica[datasetCol] += 12 * i
+        dfs.append(dfReplica)
+    return pd.concat(dfs, ignore_index=True)
+
+# -----------------------------------------------------------------------------
+# Row-wise derivations (reference)
+# -----------------------------------------------------------------------------
+
+def prepareMeaFigure4RowWise(dfMea, variantMap):
+    """The row-wise form of dias_microbenchmarks.prepareMeaFigure4."""
+
+    def getInputSize(inDataFmt):
+        countValues = 512 * 1024 * 1024
+        if inDataFmt == "uncompr_f":
+            bytes = countValues * 8
+        elif inDataFmt.startswith("static_vbp_f<vbp_l<4, "):
+            bytes =  countValues * 4 / 8
+        elif inDataFmt.startswith("static_vbp_f<vbp_l<3, "):
+            bytes =  countValues * 3 / 8
+        else:
+            raise RuntimeError()
+        return bytes / 1024 ** 3
+
+    dfMea = dfMea.copy()
+    dfMea["operator_class_long"] = \
+        dfMea.apply(lambda row: variantMap[row["operator_class"]], axis=1)
+    dfMea["runtime [ms]"] = dfMea["runtime:µs"] / 1000
+    dfMea["input size [MiB]"] = dfMea["in_data_f"].apply(getInputSize) * 1024
+    return dfMea
+
+def prepareMeaFigure5RowWise(dfMea):
+    """The row-wise form of dias_microbenchmarks.prepareMeaFigure5."""
+
+    dfMea = dfMea.copy()
+    dfMea["sel"] = dfMea["datasetIdx"].apply(
+            lambda datasetIdx: 0.01 if datasetIdx <= 6 else 0.9
+    )
+    dfMea["col"] = (dfMea["datasetIdx"] - 1).mod(6).map({
+        0: "C1",
+        1: "C2",
+        2: "C3",
+        3: "(not used)",
+        4: "C4",
+        5: "C5",
+    })
+    dfMea = dfMea.query("col != '(not used)'").groupby(
+            ["vector_extension", "out_pos_f", "in_data_f", "datasetIdx", "sel", "col"],
+            as_index=False
+    ).mean()
+
+    dfMea["runtime [ms]"] = dfMea["runtime select:µs"] / 1000
+    def classify(row):
+        outPosF = row["out_pos_f"]
+        inDataF = row["in_data_f"]
+        if outPosF == "uncompr_f" and inDataF == "uncompr_f":
+            return "alluncompr"
+        elif outPosF == "uncompr_f" and inDataF != "uncompr_f":
+            return "outuncompr"
+        else:
+            return "outcompr"
+    dfMea["class"] = dfMea.apply(classify, axis=1)
+    return dfMea
+
+def prepareMeaFigure6RowWise(dfMea):
+    """The row-wise form of dias_microbenchmarks.prepareMeaFigure6."""
+
+    dfMea = dfMea.copy()
+    dfMea["case"] = dfMea["settingIdx"].map({
+        2: "case 1\nX=C1\nY=C1",
+        3: "case 2\nX=C1\nY=C4",
+        4: "case 3\nX=C2\nY=C3",
+    })
+    dfMea["fmts"] = dfMea.apply(
+        lambda row: "{} {} {} {}".format(
+                row["in_data_x_f"][0:2],
+                row["in_data_y_f"][0:2],
+                row["mid_pos_xc_f"][0:2],
+                row["mid_data_yc_f"][0:2]
+        ),
+        axis=1
+    )
+    dfMea = dfMea.groupby(
+            [
+                "vector_extension",
+                "in_data_x_f", "in_data_y_f", "mid_pos_xc_f", "mid_data_yc_f",
+                "settingIdx", "case", "fmts"
+            ],
+            as_index=False
+    ).mean()
+
+    for colName in ["inDataX", "inDataY", "midPosXC", "midDataYC"]:
+        dfMea["{} [GiB]".format(colName)] = \
+                dfMea["{}_sizeUsedByte".format(colName)] / 1024 / 1024 / 1024
+    for opName in ["select", "project", "agg_sum"]:
+        dfMea["{} [s]".format(opName)] = \
+                dfMea["runtime {}:µs".format(opName)] / 1000 / 1000
+    return dfMea
+
+# -----------------------------------------------------------------------------
+# Timing
+# -----------------------------------------------------------------------------
+
+def timeFn(fn, countReps):
+    """
+    Calls the given function countReps times. Returns the shortest runtime in
+    seconds and the result of the last call.
+    """
+
+    best = float("inf")
+    for _ in range(countReps):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def _plain(df):
+    """Converts categoricals to plain values, such that results can be compared."""
+
+    return df.astype({
+        colName: object for colName in df.columns
+        if isinstance(df[colName].dtype, pd.CategoricalDtype)
+    }).reset_index(drop=True)
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Defaults.
+    pathArtifacts = os.path.join("artifacts", "microbenchmarks")
+    factor = 1000
+    countReps = 3
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "--pathArtifacts", metavar="PATH",
+            help="The directory of the micro benchmark artifacts. Defaults "
+                 "to '{}'.".format(pathArtifacts),
+            default=pathArtifacts
+    )
+    parser.add_argument(
+            "-f", "--factor", metavar="N", type=int,
+            help="How many times to replicate the measurements. Defaults to "
+                 "{}.".format(factor),
+            default=factor
+    )
+    parser.add_argument(
+            "-n", "--countReps", metavar="N", type=int,
+            help="How many times to time each derivation (the shortest time "
+                 "is reported). Defaults to {}.".format(countReps),
+            default=countReps
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+
+    # -------------------------------------------------------------------------
+    # Synthetic inputs
+    # -------------------------------------------------------------------------
+
+    print("Generating synthetic inputs... ", end="", flush=True)
+    dfExample = readReps(args.pathArtifacts, "example").query(
+            "vector_extension != 'ps_scalar'"
+    )
+    # The identity suffices, the long names do not matter here.
+    variantMap = {name: name for name in dfExample["operator_class"].unique()}
+    inputs = {
+        "figure4": replicate(dfExample, args.factor),
+        "figure5": replicate(
+                readReps(args.pathArtifacts, "singleop"), args.factor,
+                "datasetIdx"
+        ),
+        "figure6": replicate(
+                readReps(args.pathArtifacts, "simplequery").query("settingIdx > 1"),
+                args.factor
+        ),
+    }
+    print("done.")
+
+    # -------------------------------------------------------------------------
+    # Timing
+    # -------------------------------------------------------------------------
+
+    fns = {
+        "figure4": (
+            lambda df: prepareMeaFigure4RowWise(df, variantMap),
+            lambda df: dias.prepareMeaFigure4(df, variantMap),
+        ),
+        "figure5": (prepareMeaFigure5RowWise, dias.prepareMeaFigure5),
+        "figure6": (prepareMeaFigure6RowWise, dias.prepareMeaFigure6),
+    }
+
+    rows = []
+    for name, (fnRowWise, fnColWise) in fns.items():
+        print("Timing {}... ".format(name), end="", flush=True)
+        dfIn = inputs[name]
+        tRowWise, dfRowWise = timeFn(lambda: fnRowWise(dfIn), args.countReps)
+        tColWise, dfColWise = timeFn(lambda: fnColWise(dfIn), args.countReps)
+        pd.testing.assert_frame_equal(
+                _plain(dfRowWise), _plain(dfColWise[dfRowWise.columns]),
+                check_dtype=False
+        )
+        rows.append({
+            "derivation": name,
+            "rows": len(dfIn),
+            "row-wise [s]": tRowWise,
+            "column-wise [s]": tColWise,
+            "speedup": tRowWise / tColWise,
+        })
+        print("done.")
+
+    print()
+    with pd.option_context("display.float_format", "{:.3f}".format):
+        print(pd.DataFrame(rows).to_string(index=False))
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+"""
+This script maintains the manifests of the steps of vldb2020_ssb.sh, which
+allow to skip a step (or a part of it) if it has already been executed.
+
+A manifest records the parameters a step was executed with as well as
+fingerprints of its inputs and outputs. A step is up to date if its manifest
+exists, its parameters are the same, and the fingerprints of its inputs and
+outputs are unchanged. Since the outputs of one step are the inputs of
+subsequent steps, changing a step's outputs invalidates exactly the steps
+depending on them.
+
+Small files are fingerprinted by their contents. Large files, such as the base
+data, are fingerprinted by their size and modification time, since reading
+them would take too long.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import cache
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Regarding fingerprints
+# -----------------------------------------------------------------------------
+
+# Files larger than this number of bytes are not fingerprinted by their
+# contents.
+maxHashedSize = 16 * 1024 * 1024
+
+def _fingerprintFile(filePath):
+    st = os.stat(filePath)
+    if st.st_size > maxHashedSize:
+        return "{}:{}".format(st.st_size, st.st_mtime_ns)
+    h = hashlib.sha1()
+    with open(filePath, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def fingerprint(path):
+    """
+    Returns the fingerprint of the given file or directory (including all
+    files in it), or None if it does not exist.
+    """
+
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha1()
+    for filePath in cache.listFiles([path]):
+        h.update(os.path.relpath(filePath, path).encode())
+        h.update(_fingerprintFile(filePath).encode())
+    return h.hexdigest()
+
+# -----------------------------------------------------------------------------
+# Regarding manifests
+# -----------------------------------------------------------------------------
+
+# The states of a step according to its manifest. They are also the exit
+# statuses of this script's check action.
+STATUS_CURRENT = 0
+STATUS_STALE = 1
+STATUS_MISSING = 2
+
+def makeManifest(params, inputs, outputs, existing):
+    """
+    Returns the manifest of a step with the given parameters (a dictionary),
+    inputs and outputs (lists of paths), and further outputs, which only need
+    to exist (a list of paths).
+    """
+
+    return dict(
+            params=params,
+            inputs={path: fingerprint(path) for path in inputs},
+            outputs={path: fingerprint(path) for path in outputs},
+            existing=sorted(existing),
+    )
+
+def check(manifestFilePath, params, inputs, outputs, existing):
+    """
+    Checks whether the step with the given manifest file is up to date, see
+    the module's docstring. Returns one of the STATUS_* and a list of the
+    reasons why the step is not up to date.
+    """
+
+    if not os.path.exists(manifestFilePath):
+        return STATUS_MISSING, ["not executed yet"]
+    with open(manifestFilePath) as f:
+        recorded = json.load(f)
+    current = makeManifest(params, inputs, outputs, existing)
+
+    reasons = []
+    for key in sorted(set(recorded["params"]) | set(current["params"])):
+        if recorded["params"].get(key) != current["params"].get(key):
+            reasons.append("parameter {} changed".format(key))
+    # Inputs may be optional, so they only need to be unchanged, while outputs
+    # must also exist.
+    for kind in ["inputs", "outputs"]:
+        for path in sorted(set(recorded[kind]) | set(current[kind])):
+            if kind == "outputs" and current[kind].get(path) is None:
+                reasons.append("output {} missing".format(path))
+            elif recorded[kind].get(path, False) != current[kind].get(path, False):
+                reasons.append("{} {} changed".format(kind[:-1], path))
+    for path in current["existing"]:
+        if not os.path.exists(path):
+            reasons.append("output {} missing".format(path))
+
+    return (STATUS_STALE if reasons else STATUS_CURRENT), reasons
+
+def write(manifestFilePath, params, inputs, outputs, existing):
+    """Writes the manifest of a step which has just been executed."""
+
+    os.makedirs(os.path.dirname(manifestFilePath), exist_ok=True)
+    tmpFilePath = "{}.{}.tmp".format(manifestFilePath, os.getpid())
+    with open(tmpFilePath, "w") as f:
+        json.dump(
+                makeManifest(params, inputs, outputs, existing), f,
+                indent=4, sort_keys=True
+        )
+    os.replace(tmpFilePath, manifestFilePath)
+
+def _parseParams(parser, params):
+    result = dict()
+    for param in params:
+        key, sep, val = param.partition("=")
+        if not sep:
+            parser.error("parameters must be given as KEY=VALUE: {}".format(param))
+        result[key] = val
+    return result
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "action", choices=["check", "write", "invalidate"],
+            help="Check whether the step is up to date (exit status 0 if it "
+                 "is, {} if its manifest is stale, and {} if it has none), "
+                 "write its manifest after executing it, or remove its "
+                 "manifest before executing it, such that an interrupted "
+                 "step is not up to date.".format(STATUS_STALE, STATUS_MISSING),
+    )
+    parser.add_argument(
+            "name", metavar="NAME",
+            help="The name of the step.",
+    )
+    parser.add_argument(
+            "--pathManifests", metavar="PATH", required=True,
+            help="The directory of the manifests.",
+    )
+    parser.add_argument(
+            "--params", metavar="KEY=VALUE", nargs="*",
+            help="The parameters of the step.",
+            default=[],
+    )
+    parser.add_argument(
+            "--inputs", metavar="PATH", nargs="*",
+            help="The files and directories the step reads.",
+            default=[],
+    )
+    parser.add_argument(
+            "--outputs", metavar="PATH", nargs="*",
+            help="The files and directories the step writes.",
+            default=[],
+    )
+    parser.add_argument(
+            "--existing", metavar="PATH", nargs="*",
+            help="Further files and directories the step writes, which "
+                 "subsequent steps modify, such that they only need to exist.",
+            default=[],
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+    params = _parseParams(parser, args.params)
+
+    manifestFilePath = os.path.join(
+            args.pathManifests, "{}.json".format(args.name)
+    )
+
+    # -------------------------------------------------------------------------
+    # Execution of the action
+    # -------------------------------------------------------------------------
+
+    if args.action == "check":
+        status, reasons = check(
+                manifestFilePath, params, args.inputs, args.outputs,
+                args.existing
+        )
+        for reason in reasons:
+            print("{}: {}".format(args.name, reason))
+        sys.exit(status)
+    elif args.action == "write":
+        write(
+                manifestFilePath, params, args.inputs, args.outputs,
+                args.existing
+        )
+    elif args.action == "invalidate":
+        if os.path.exists(manifestFilePath):
+            os.remove(manifestFilePath)
@@ -0,0 +1,161 @@
+"""
+Some utilities for projecting the memory footprints and runtimes measured at
+small scale factors of the Star Schema Benchmark to larger ones, required by
+the diagram generation of the Star Schema Benchmark.
+
+Each measured quantity (e.g., the footprint of one column or the runtime of
+one operator) is modeled as a power law of the scale factor, i.e., as
+value = coefficient * scaleFactor ** exponent, which is a straight line in
+log-log space. The coefficient and the exponent are fitted by least squares
+on the logarithms. An exponent of one means linear scaling, which is what we
+expect for most columns and operators, while sorting or hash tables exceeding
+the caches lead to larger exponents.
+
+The error bounds of a projection are the bounds of the prediction interval of
+the regression, which requires measurements at three or more scale factors.
+With measurements at two scale factors, the power law fits them exactly and
+no bounds can be given. With measurements at a single scale factor, linear
+scaling is assumed.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+import repetitions
+
+# -----------------------------------------------------------------------------
+# Fitting and applying the scaling models.
+# -----------------------------------------------------------------------------
+
+def fitScaling(df, keyCols, valueCol):
+    """
+    Fits a scaling model for each group of rows of the given data frame with
+    the same values in keyCols. The scale factor of each row is in the column
+    "sf", the measured value in valueCol. Repeated measurements at the same
+    scale factor are averaged before fitting. Values which are not positive
+    are ignored, since they have no logarithm.
+
+    Returns a data frame with the key columns and the parameters of each
+    model, in particular its coefficient and exponent.
+    """
+
+    dfMean = df.groupby(keyCols + ["sf"], as_index=False, sort=False)[[valueCol]].mean()
+    dfMean = dfMean[dfMean[valueCol] > 0]
+
+    rows = []
+    for key, dfGroup in dfMean.groupby(keyCols, sort=False):
+        x = np.log(dfGroup["sf"].to_numpy(dtype="float64"))
+        y = np.log(dfGroup[valueCol].to_numpy(dtype="float64"))
+        count = len(x)
+        if count == 1:
+            exponent = 1.0
+            logCoef = y[0] - x[0]
+        else:
+            exponent, logCoef = np.polyfit(x, y, 1)
+        if count > 2:
+            residuals = y - (logCoef + exponent * x)
+            stdErr = math.sqrt((residuals ** 2).sum() / (count - 2))
+        else:
+            stdErr = float("nan")
+        row = dict(zip(keyCols, key if isinstance(key, tuple) else (key,)))
+        row.update(
+                coefficient=math.exp(logCoef), exponent=exponent,
+                countSf=count, sfMin=dfGroup["sf"].min(),
+                sfMax=dfGroup["sf"].max(), stdErr=stdErr,
+                logSfMean=x.mean(), logSfSqDev=((x - x.mean()) ** 2).sum(),
+        )
+        rows.append(row)
+    return pd.DataFrame(rows, columns=keyCols + [
+        "coefficient", "exponent", "countSf", "sfMin", "sfMax", "stdErr",
+        "logSfMean", "logSfSqDev",
+    ])
+
+def predict(dfModels, keyCols, scaleFactors, valueCol, confidence=0.95):
+    """
+    Applies the given scaling models (see fitScaling) to each of the given
+    scale factors. Returns a data frame with the key columns, the scale factor
+    "sf", the projected value in valueCol, and the bounds of its prediction
+    interval of the given confidence in "<valueCol> low" and
+    "<valueCol> high", which are NaN if the models do not allow any.
+    """
+
+    dfsPred = []
+    for sf in scaleFactors:
+        dfPred = dfModels[keyCols].copy()
+        dfPred["sf"] = sf
+        logSf = math.log(sf)
+        logPred = np.log(dfModels["coefficient"]) + dfModels["exponent"] * logSf
+        halfWidth = np.array([
+            (
+                repetitions.tQuantile(int(model.countSf) - 2, confidence)
+                * model.stdErr * math.sqrt(
+                        1 + 1 / model.countSf +
+                        (logSf - model.logSfMean) ** 2 / model.logSfSqDev
+                )
+            ) if model.countSf > 2 and model.logSfSqDev > 0 else float("nan")
+            for model in dfModels.itertuples()
+        ])
+        dfPred[valueCol] = np.exp(logPred)
+        dfPred["{} low".format(valueCol)] = np.exp(logPred - halfWidth)
+        dfPred["{} high".format(valueCol)] = np.exp(logPred + halfWidth)
+        dfsPred.append(dfPred)
+    return pd.concat(dfsPred, ignore_index=True)
+
+def sumProjections(dfPred, keyCols, valueCol):
+    """
+    Adds up the projected values of the given data frame (see predict) and
+    their bounds per scale factor and group of rows with the same values in
+    keyCols, e.g., the footprints of all columns of a query.
+
+    Adding up the bounds is conservative, since it assumes that the errors of
+    all summands are correlated. Summands without bounds contribute their
+    projected value to the bounds, and their share of the sum is given in the
+    column "unbounded [%]". If no summand has bounds, the sum has none either.
+    """
+
+    colLow = "{} low".format(valueCol)
+    colHigh = "{} high".format(valueCol)
+    isUnbounded = dfPred[colLow].isna() | dfPred[colHigh].isna()
+    dfPred = dfPred.assign(**{
+        colLow: dfPred[colLow].where(~isUnbounded, dfPred[valueCol]),
+        colHigh: dfPred[colHigh].where(~isUnbounded, dfPred[valueCol]),
+        "unbounded [%]": dfPred[valueCol].where(isUnbounded, 0),
+    })
+    dfSum = dfPred.groupby(keyCols + ["sf"], as_index=False, sort=False)[
+            [valueCol, colLow, colHigh, "unbounded [%]"]
+    ].sum()
+    dfSum["unbounded [%]"] = dfSum["unbounded [%]"] / dfSum[valueCol] * 100
+    isBounded = dfSum["unbounded [%]"] < 100
+    dfSum[colLow] = dfSum[colLow].where(isBounded)
+    dfSum[colHigh] = dfSum[colHigh].where(isBounded)
+    return dfSum
+
+# -----------------------------------------------------------------------------
+# Drawing the projections.
+# -----------------------------------------------------------------------------
+
+def drawProjection(ax, dfPred, dfMeasured, valueCol, xCol, xOrder, color):
+    """
+    Draws the projected values of the given data frame (see predict) for one
+    scale factor as bars with error bars at the positions of xOrder in xCol.
+    The measured values (if any) are drawn as markers next to them.
+    """
+
+    dfPred = dfPred.set_index(xCol).reindex(xOrder)
+    xs = np.arange(len(xOrder))
+    lows = (dfPred[valueCol] - dfPred["{} low".format(valueCol)]).fillna(0)
+    highs = (dfPred["{} high".format(valueCol)] - dfPred[valueCol]).fillna(0)
+    ax.bar(
+            xs, dfPred[valueCol], yerr=[lows, highs], capsize=3,
+            color=color, edgecolor="black", lw=0.5, label="projected"
+    )
+    if dfMeasured is not None and len(dfMeasured):
+        dfMeasured = dfMeasured.set_index(xCol).reindex(xOrder)
+        ax.plot(
+                xs, dfMeasured[valueCol], "o", color="black",
+                label="measured"
+        )
+    ax.set_xticks(xs)
+    ax.set_xticklabels(xOrder, rotation=90)
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+
+"""
+This script checks the results of a fresh run of the Star Schema Benchmark
+experiments (see vldb2020_ssb.sh) for performance regressions compared to a
+reference run, by default the artifacts shipped with this repository.
+
+It aligns the measurements of both runs
+- per query, compression strategy, processing style, and operator for the
+  MorphStore runtimes,
+- per query and integer type for the MonetDB runtimes, and
+- per processing style, format, and bit width for the runtimes in the
+  calibration profiles of the cost model.
+For each aligned measurement, it tests whether the mean runtime over the
+repetitions of the new run exceeds that of the reference run by more than a
+threshold, such that the confidence interval of the difference (Welch's
+t-test) lies entirely above the threshold. Improvements are detected the same
+way. Runtimes which are too short to be compared reliably are skipped.
+
+The results are written to a JSON report. The exit status is 0 if there are no
+regressions, 1 if there are regressions, and 2 if there was nothing to compare.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+import pandas as pd
+
+import artifacts
+import calibration
+import repetitions
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Loading the measurements of one run
+# -----------------------------------------------------------------------------
+
+# The processing styles of the SSB runs in MorphStore. The strategy
+# UncomprScalar always uses the scalar processing style.
+_PS_SCALAR = "scalar<v64<uint64_t>>"
+_CS_UNCOMPR_SCALAR = "UncomprScalar"
+
+# The attributes identifying the measurements of each kind.
+KEY_COLS = {
+    "MorphStore": ["query", "ps", "cs", "opIdx", "opName"],
+    "MonetDB": ["query", "ps", "cs"],
+    "profiles": ["profile", "vector_extension", "format", "bitwidth", "metric"],
+}
+
+def loadRuntimesMorphStore(pathRun, scaleFactor, processingStyle):
+    """
+    Loads the runtimes of all operators (including the entire query, opIdx 0)
+    in all repetitions of all compression strategies in MorphStore.
+    """
+
+    pathTimes = os.path.join(pathRun, "times_MorphStore_sf{}".format(scaleFactor))
+    if not os.path.isdir(pathTimes):
+        return None
+    rows = []
+    for dirName in sorted(os.listdir(pathTimes)):
+        cs, _, repIdx = dirName.rpartition("_")
+        if not repIdx.isdigit():
+            continue
+        ps = _PS_SCALAR if cs == _CS_UNCOMPR_SCALAR else processingStyle
+        for fileName in sorted(os.listdir(os.path.join(pathTimes, dirName))):
+            if not (fileName.startswith("q") and fileName.endswith(".csv")):
+                continue
+            q = fileName[len("q"):-len(".csv")]
+            for row in artifacts.readMorphStoreRows(
+                    os.path.join(pathTimes, dirName, fileName)
+            ):
+                rows.append(dict(
+                        query=q, ps=ps, cs=cs, opIdx=row["opIdx"],
+                        opName=row["opName"], repetition=int(repIdx),
+                        runtime=row["runtime"] / 1000 / 1000,
+                ))
+    return pd.DataFrame(rows)
+
+def loadRuntimesMonetDB(pathRun, scaleFactor):
+    """
+    Loads the runtimes of all queries in all repetitions with all integer
+    types in MonetDB. As in the diagrams, the first two repetitions are
+    dropped, since they are usually slow.
+    """
+
+    pathTimes = os.path.join(pathRun, "times_MonetDB_sf{}".format(scaleFactor))
+    if not os.path.isdir(pathTimes):
+        return None
+    dfs = []
+    for fileName in sorted(os.listdir(pathTimes)):
+        if not fileName.endswith(".csv"):
+            continue
+        df = pd.read_csv(
+                os.path.join(pathTimes, fileName), sep="\t",
+                dtype={"query": str}
+        )
+        df = df[df["repetition"] > 2]
+        dfs.append(pd.DataFrame(dict(
+                query=df["query"], ps=_PS_SCALAR,
+                cs=fileName[:-len(".csv")], repetition=df["repetition"],
+                runtime=df["runtime [ms]"] / 1000,
+        )))
+    return pd.concat(dfs, ignore_index=True) if dfs else None
+
+def loadRuntimesProfiles(pathRun):
+    """
+    Loads all runtimes (total and of the individual parts) in all repetitions
+    of the calibration profiles of the cost model.
+    """
+
+    pathProfiles = os.path.join(pathRun, "compr_profiles")
+    if not os.path.isdir(pathProfiles):
+        return None
+    dfs = []
+    for fileName in sorted(os.listdir(pathProfiles)):
+        if not fileName.endswith(".csv"):
+            continue
+        _, df = calibration.readProfile(os.path.join(pathProfiles, fileName))
+        df = df.assign(profile=fileName)
+        # Not all profiles vary all attributes.
+        for col in KEY_COLS["profiles"]:
+            if col not in df.columns:
+                df[col] = "-" if col != "bitwidth" else 0
+        if "repetition" not in df.columns:
+            df["repetition"] = range(1, len(df) + 1)
+        cols = calibration._runtimeCols(df)
+        df = df.melt(
+                id_vars=KEY_COLS["profiles"][:-1] + ["repetition"],
+                value_vars=cols, var_name="metric", value_name="runtime"
+        )
+        df["runtime"] = df["runtime"] / 1000 / 1000
+        dfs.append(df)
+    return pd.concat(dfs, ignore_index=True) if dfs else None
+
+def loadRun(pathRun, scaleFactor, processingStyle):
+    """
+    Loads the runtimes of all kinds (see KEY_COLS) of one run, in seconds.
+    Returns a dictionary from the kind to a data frame with the key columns,
+    the repetition, and the runtime, or None if the run has no such artifacts.
+    """
+
+    return dict(
+            MorphStore=loadRuntimesMorphStore(pathRun, scaleFactor, processingStyle),
+            MonetDB=loadRuntimesMonetDB(pathRun, scaleFactor),
+            profiles=loadRuntimesProfiles(pathRun),
+    )
+
+# -----------------------------------------------------------------------------
+# Comparing two runs
+# -----------------------------------------------------------------------------
+
+STATUS_REGRESSION = "regression"
+STATUS_IMPROVEMENT = "improvement"
+STATUS_UNCHANGED = "unchanged"
+
+def _exceeds(samplesA, samplesB, factor, confidence):
+    """
+    Returns whether the mean of samplesA exceeds factor times the mean of
+    samplesB, such that the confidence interval of the difference lies
+    entirely above zero (Welch's t-test). With less than two samples on either
+    side, only the means are compared.
+    """
+
+    nA, nB = len(samplesA), len(samplesB)
+    meanA, meanB = samplesA.mean(), factor * samplesB.mean()
+    if nA < 2 or nB < 2:
+        return meanA > meanB
+    a = samplesA.var() / nA
+    b = factor ** 2 * samplesB.var() / nB
+    if a + b == 0:
+        return meanA > meanB
+    countDf = (a + b) ** 2 / (a ** 2 / (nA - 1) + b ** 2 / (nB - 1))
+    t = (meanA - meanB) / math.sqrt(a + b)
+    return t > repetitions.tQuantile(max(1, int(countDf)), confidence)
+
+def compareRuns(dfRef, dfNew, keyCols, threshold, confidence, minRuntime):
+    """
+    Compares the runtimes of the given kind of two runs (see loadRun). Returns
+    a data frame with the key columns, the number of repetitions and the mean
+    runtime in both runs, the ratio of the means, and the status, one of the
+    STATUS_*. Measurements present in only one run and runtimes shorter than
+    minRuntime (in seconds) in both runs are skipped.
+    """
+
+    groupsNew = dict(list(dfNew.groupby(keyCols, sort=False)["runtime"]))
+    rows = []
+    for key, samplesRef in dfRef.groupby(keyCols, sort=False)["runtime"]:
+        if key not in groupsNew:
+            continue
+        samplesNew = groupsNew[key]
+        meanRef, meanNew = samplesRef.mean(), samplesNew.mean()
+        if max(meanRef, meanNew) < minRuntime:
+            continue
+        if _exceeds(samplesNew, samplesRef, 1 + threshold, confidence):
+            status = STATUS_REGRESSION
+        elif _exceeds(samplesRef, samplesNew, 1 + threshold, confidence):
+            status = STATUS_IMPROVEMENT
+        else:
+            status = STATUS_UNCHANGED
+        row = dict(zip(keyCols, key))
+        row.update({
+            "reps ref": len(samplesRef), "reps new": len(samplesNew),
+            "runtime ref [s]": meanRef, "runtime new [s]": meanNew,
+            "ratio": meanNew / meanRef if meanRef else float("inf"),
+            "status": status,
+        })
+        rows.append(row)
+    return pd.DataFrame(rows, columns=keyCols + [
+        "reps ref", "reps new", "runtime ref [s]", "runtime new [s]", "ratio",
+        "status",
+    ])
+
+def _missing(dfRef, dfNew, keyCols):
+    """Returns the keys of the measurements of dfRef missing in dfNew."""
+
+    keysNew = set(dfNew.groupby(keyCols, sort=False).groups.keys())
+    return _records(pd.DataFrame(
+            [
+                key for key in dfRef.groupby(keyCols, sort=False).groups.keys()
+                if key not in keysNew
+            ],
+            columns=keyCols
+    ))
+
+def _records(df):
+    """Converts a data frame to JSON-compatible records."""
+
+    return json.loads(df.to_json(orient="records"))
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Defaults.
+    scaleFactor = 100
+    processingStyle = "avx512<v512<uint64_t>>"
+    pathNew = os.path.join("artifacts", "ssb")
+    pathRef = os.path.join("artifacts_original", "ssb")
+    threshold = 0.05
+    confidence = 0.95
+    minRuntime = 0.001
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "-sf", "--scaleFactor", metavar="N", type=int,
+            help="The scale factor of the runs to compare. Defaults to "
+                 "{}.".format(scaleFactor),
+            default=scaleFactor
+    )
+    parser.add_argument(
+            "-ps", "--processingStyle", metavar="PROCESSING_STYLE",
+            help="The processing style of the runs in MorphStore (except for "
+                 "the strategy {}). Defaults to '{}'.".format(
+                         _CS_UNCOMPR_SCALAR, processingStyle
+                 ),
+            default=processingStyle
+    )
+    parser.add_argument(
+            "--pathNew", metavar="PATH",
+            help="The SSB artifacts of the new run. Defaults to "
+                 "'{}'.".format(pathNew),
+            default=pathNew
+    )
+    parser.add_argument(
+            "--pathRef", metavar="PATH",
+            help="The SSB artifacts of the reference run. Defaults to "
+                 "'{}'.".format(pathRef),
+            default=pathRef
+    )
+    parser.add_argument(
+            "-t", "--threshold", metavar="FRACTION", type=float,
+            help="Flag a measurement if its runtime changed by more than "
+                 "this fraction. Defaults to {}.".format(threshold),
+            default=threshold
+    )
+    parser.add_argument(
+            "--confidence", metavar="FRACTION", type=float,
+            help="The confidence of the statistical test. Defaults to "
+                 "{}.".format(confidence),
+            default=confidence, choices=repetitions.CONFIDENCES
+    )
+    parser.add_argument(
+            "--minRuntime", metavar="SECONDS", type=float,
+            help="Skip measurements whose runtime is shorter than this in "
+                 "both runs. Defaults to {}.".format(minRuntime),
+            default=minRuntime
+    )
+    parser.add_argument(
+            "--report", metavar="FILE",
+            help="The JSON file to write the report to. Defaults to "
+                 "'regressions_sf<N>.json' in the artifacts of the new run.",
+            default=None
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+    scaleFactor = args.scaleFactor
+    processingStyle = args.processingStyle
+    pathNew = args.pathNew
+    pathRef = args.pathRef
+    threshold = args.threshold
+    confidence = args.confidence
+    minRuntime = args.minRuntime
+    reportFilePath = args.report or os.path.join(
+            pathNew, "regressions_sf{}.json".format(scaleFactor)
+    )
+
+    # -------------------------------------------------------------------------
+    # Comparison
+    # -------------------------------------------------------------------------
+
+    dfsRef = loadRun(pathRef, scaleFactor, processingStyle)
+    dfsNew = loadRun(pathNew, scaleFactor, processingStyle)
+
+    summary = dict()
+    regressions = []
+    improvements = []
+    missing = []
+    dfsRegr = dict()
+    for kind, keyCols in KEY_COLS.items():
+        dfRef, dfNew = dfsRef[kind], dfsNew[kind]
+        if dfRef is None or dfNew is None:
+            continue
+        dfCmp = compareRuns(dfRef, dfNew, keyCols, threshold, confidence, minRuntime)
+        missingKind = _missing(dfRef, dfNew, keyCols)
+        summary[kind] = {
+            "compared": len(dfCmp),
+            "regressions": int((dfCmp["status"] == STATUS_REGRESSION).sum()),
+            "improvements": int((dfCmp["status"] == STATUS_IMPROVEMENT).sum()),
+            "missing": len(missingKind),
+        }
+        for status, records in [
+                (STATUS_REGRESSION, regressions),
+                (STATUS_IMPROVEMENT, improvements),
+        ]:
+            dfStatus = dfCmp[dfCmp["status"] == status].drop(columns="status")
+            records.extend(
+                    dict(kind=kind, **record) for record in _records(dfStatus)
+            )
+        missing.extend(dict(kind=kind, **key) for key in missingKind)
+        dfsRegr[kind] = dfCmp[dfCmp["status"] == STATUS_REGRESSION]
+
+    os.makedirs(os.path.dirname(os.path.abspath(reportFilePath)), exist_ok=True)
+    with open(reportFilePath, "w") as f:
+        json.dump(dict(
+                reference=pathRef, new=pathNew, scaleFactor=scaleFactor,
+                threshold=threshold, confidence=confidence,
+                minRuntime=minRuntime, summary=summary,
+                regressions=regressions, improvements=improvements,
+                missing=missing,
+        ), f, indent=4)
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    if not summary:
+        print("There is nothing to compare between '{}' and '{}'.".format(
+                pathRef, pathNew
+        ))
+        sys.exit(2)
+
+    for kind, counts in summary.items():
+        print("{}: {} compared, {} regressions, {} improvements, {} missing".format(
+                kind, counts["compared"], counts["regressions"],
+                counts["improvements"], counts["missing"]
+        ))
+    for kind, dfRegr in dfsRegr.items():
+        if not len(dfRegr):
+            continue
+        print()
+        print("Regressions of {} by more than {:.0f}% (confidence {}):".format(
+                kind, threshold * 100, confidence
+        ))
+        print(dfRegr.drop(columns="status").sort_values(
+                "ratio", ascending=False
+        ).to_string(index=False, float_format="{:.4f}".format))
+    print()
+    print("The report is in '{}'.".format(reportFilePath))
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+
+"""
+This script decides whether to execute another repetition of the Star Schema
+Benchmark queries in MorphStore (see the run step in vldb2020_ssb.sh).
+
+After each repetition, it looks at the runtimes of all queries measured so far.
+It stops the repetitions as soon as the confidence interval of the mean
+runtime of each query is narrow enough, or when the maximum number of
+repetitions is reached, but never before the minimum number of repetitions.
+Optionally, it also stops if the runtimes are statistically dominated by those
+of an incumbent, i.e., clearly worse. The reason for stopping is appended to a
+log file next to the timings. The exit status is 0 (EXIT_STOP) if the
+repetitions shall stop, and 3 (EXIT_CONTINUE) if another repetition shall be
+executed. Any other exit status means that the decision failed, e.g., due to
+invalid arguments (2) or missing timings (1), such that the caller must abort.
+"""
+
+import argparse
+import math
+import os
+import sys
+
+import artifacts
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Regarding confidence intervals
+# -----------------------------------------------------------------------------
+
+# The quantiles of Student's t-distribution for two-sided confidence intervals
+# with 1, 2, ..., 30 degrees of freedom.
+_T_QUANTILES = {
+    0.95: [
+        12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+    ],
+    0.99: [
+        63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+        3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+        2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750,
+    ],
+}
+# The quantiles of the normal distribution, used for more degrees of freedom.
+_Z_QUANTILES = {0.95: 1.960, 0.99: 2.576}
+
+CONFIDENCES = sorted(_T_QUANTILES.keys())
+
+def tQuantile(countDf, confidence):
+    """
+    Returns the quantile of Student's t-distribution with countDf degrees of
+    freedom for a two-sided confidence interval of the given confidence.
+    """
+
+    if countDf <= len(_T_QUANTILES[confidence]):
+        return _T_QUANTILES[confidence][countDf - 1]
+    return _Z_QUANTILES[confidence]
+
+def confidenceInterval(samples, confidence):
+    """
+    Returns the mean of the given samples and the half width of the confidence
+    interval of the mean. The half width is infinite for less than two samples.
+    """
+
+    count = len(samples)
+    mean = sum(samples) / count
+    if count < 2:
+        return mean, float("inf")
+    var = sum((sample - mean) ** 2 for sample in samples) / (count - 1)
+    return mean, tQuantile(count - 1, confidence) * math.sqrt(var / count)
+
+def isDominated(samples, samplesIncumbent, confidence, findBest=True):
+    """
+    Returns whether the given samples of a candidate's runtime are
+    statistically dominated by those of the incumbent, i.e., whether the
+    confidence intervals of both means do not overlap and the candidate is
+    slower (findBest) or faster (otherwise) than the incumbent. In the greedy
+    search for the best (worst) format combination, such a candidate cannot
+    win, so its repetitions can stop.
+    """
+
+    mean, halfWidth = confidenceInterval(samples, confidence)
+    meanInc, halfWidthInc = confidenceInterval(samplesIncumbent, confidence)
+    if findBest:
+        return mean - halfWidth > meanInc + halfWidthInc
+    return mean + halfWidth < meanInc - halfWidthInc
+
+# -----------------------------------------------------------------------------
+# Regarding the decision
+# -----------------------------------------------------------------------------
+
+# The exit statuses of the decision. Note that argparse exits with 2 on invalid
+# arguments and Python with 1 on uncaught exceptions.
+EXIT_STOP = 0
+EXIT_CONTINUE = 3
+
+# The reasons for stopping the repetitions.
+REASON_MAX = "max repetitions"
+REASON_CI = "confidence interval"
+REASON_DOMINATED = "dominated"
+
+def decide(
+        samplesByQuery, countMin, countMax, ciWidth, confidence,
+        samplesByQueryIncumbent=None, findBest=True
+):
+    """
+    Decides whether to stop the repetitions, given the runtime samples of each
+    query measured so far. Returns the reason for stopping (see REASON_*), or
+    None if another repetition shall be executed.
+
+    The confidence interval of a query is narrow enough if its half width is
+    at most the fraction ciWidth of the mean runtime.
+    """
+
+    count = min(len(samples) for samples in samplesByQuery.values())
+    if count < countMin:
+        return None
+    if count >= countMax:
+        return REASON_MAX
+    if all(
+            halfWidth <= ciWidth * mean
+            for mean, halfWidth in (
+                confidenceInterval(samples, confidence)
+                for samples in samplesByQuery.values()
+            )
+    ):
+        return REASON_CI
+    if samplesByQueryIncumbent is not None and all(
+            isDominated(
+                    samples, samplesByQueryIncumbent[q], confidence, findBest
+            )
+            for q, samples in samplesByQuery.items()
+    ):
+        return REASON_DOMINATED
+    return None
+
+def loadSamples(pathTimePrefix, countReps, queries):
+    """
+    Loads the runtimes of the given queries measured in the repetitions 1 to
+    countReps, whose timings are in the directories <pathTimePrefix>_<i>.
+    """
+
+    return {
+        q: [
+            artifacts.readMorphStoreQueryRow(os.path.join(
+                    "{}_{}".format(pathTimePrefix, repIdx),
+                    "q{}.csv".format(q)
+            ))["runtime"]
+            for repIdx in range(1, countReps + 1)
+        ]
+        for q in queries
+    }
+
+def readLog(filePath):
+    """
+    Reads the log written with --log. Returns a dictionary mapping the name of
+    the timing directories (without the suffix _<i>) of each log entry, e.g.,
+    a compression strategy, to the number of repetitions executed. Returns an
+    empty dictionary if the log does not exist.
+    """
+
+    if not os.path.exists(filePath):
+        return dict()
+    countsByKey = dict()
+    with open(filePath) as f:
+        header = next(f, "").rstrip("\n").split("\t")
+        for line in f:
+            row = dict(zip(header, line.rstrip("\n").split("\t")))
+            if row.get("key") and row.get("repetitions"):
+                countsByKey[row["key"]] = int(row["repetitions"])
+    return countsByKey
+
+def maxRelHalfWidth(samplesByQuery, confidence):
+    """
+    Returns the largest half width of the confidence intervals of all queries
+    relative to the respective mean runtime.
+    """
+
+    return max(
+        halfWidth / mean
+        for mean, halfWidth in (
+            confidenceInterval(samples, confidence)
+            for samples in samplesByQuery.values()
+        )
+    )
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Defaults.
+    ciWidth = 0.02
+    confidence = 0.95
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "--pathTime", metavar="PREFIX", required=True,
+            help="The common prefix of the timing directories of the "
+                 "repetitions, which are <PREFIX>_1, <PREFIX>_2, ...",
+    )
+    parser.add_argument(
+            "-q", "--query", "--queries", metavar="N.N", nargs="+",
+            required=True,
+            help="The queries executed in each repetition.",
+    )
+    parser.add_argument(
+            "-n", "--repetition", metavar="N", type=int, required=True,
+            help="The number of repetitions executed so far.",
+    )
+    parser.add_argument(
+            "--min", metavar="N", type=int, required=True,
+            help="The minimum number of repetitions.",
+    )
+    parser.add_argument(
+            "--max", metavar="N", type=int, required=True,
+            help="The maximum number of repetitions.",
+    )
+    parser.add_argument(
+            "--ciWidth", metavar="FRACTION", type=float,
+            help="Stop if the half width of the confidence interval of the "
+                 "mean runtime of each query is at most this fraction of the "
+                 "mean. Defaults to {}.".format(ciWidth),
+            default=ciWidth,
+    )
+    parser.add_argument(
+            "--confidence", metavar="LEVEL", type=float,
+            help="The confidence level of the confidence intervals. Defaults "
+                 "to {}.".format(confidence),
+            default=confidence, choices=CONFIDENCES,
+    )
+    parser.add_argument(
+            "--incumbent", metavar="PREFIX",
+            help="Also stop if the runtimes are statistically dominated by "
+                 "those in the timing directories <PREFIX>_1, <PREFIX>_2, ... "
+                 "(as many as exist).",
+            default=None,
+    )
+    parser.add_argument(
+            "--findWorst", dest="findBest", action="store_false",
+            help="With --incumbent, the runtimes are dominated if they are "
+                 "faster (instead of slower) than those of the incumbent.",
+            default=True,
+    )
+    parser.add_argument(
+            "--log", metavar="FILE",
+            help="Append the number of repetitions and the reason for "
+                 "stopping to this file (tab-separated) when stopping.",
+            default=None,
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+
+    # -------------------------------------------------------------------------
+    # Decision
+    # -------------------------------------------------------------------------
+
+    samplesByQuery = loadSamples(args.pathTime, args.repetition, args.query)
+    if args.incumbent is None:
+        samplesByQueryIncumbent = None
+    else:
+        countRepsIncumbent = 0
+        while os.path.isdir("{}_{}".format(args.incumbent, countRepsIncumbent + 1)):
+            countRepsIncumbent += 1
+        samplesByQueryIncumbent = loadSamples(
+                args.incumbent, countRepsIncumbent, args.query
+        )
+
+    reason = decide(
+            samplesByQuery, args.min, args.max, args.ciWidth, args.confidence,
+            samplesByQueryIncumbent, args.findBest
+    )
+    if reason is None:
+        sys.exit(EXIT_CONTINUE)
+
+    # Record the reason for stopping alongside the timings.
+    if args.log is not None:
+        writeHeader = not os.path.exists(args.log)
+        with open(args.log, "a") as f:
+            if writeHeader:
+                f.write("key\trepetitions\treason\tmaxRelHalfWidth\n")
+            f.write("{}\t{}\t{}\t{}\n".format(
+                    os.path.basename(args.pathTime), args.repetition, reason,
+                    maxRelHalfWidth(samplesByQuery, args.confidence)
+            ))
+    sys.exit(EXIT_STOP)
@@ -0,0 +1,110 @@
+"""
+Some utilities for a roofline-style analysis of the measured operators,
+required by the diagram generation of both the micro benchmarks and the Star
+Schema Benchmark.
+
+For each operator, we know the number of bytes of all columns it reads and
+writes (in the formats they are represented in) and its runtime. From that, we
+calculate the memory bandwidth the operator effectively achieves and compare
+it to the bandwidth ceiling of the machine, which we measure with a STREAM-like
+kernel. An operator achieving a large share of the ceiling is bandwidth-bound,
+so compressing its columns should help. An operator achieving only a small
+share is compute-bound, so the effort for (de)compression is likely to hurt.
+"""
+
+import time
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Measuring the memory bandwidth.
+# -----------------------------------------------------------------------------
+
+def measureBandwidth(countValues=32 * 1024 * 1024, countReps=5):
+    """
+    Measures the memory bandwidth of this machine in GB/s with STREAM-like
+    kernels on arrays of countValues 64-bit integers, which should be much
+    larger than the last-level cache.
+
+    Returns a dictionary with the bandwidths of the kernels "copy" (reading
+    one array and writing another one) and "read" (summing up one array). As
+    in STREAM, the best of countReps repetitions is reported. Note that the
+    kernels are single-threaded, just like the operators of MorphStore.
+    """
+
+    a = np.arange(countValues, dtype=np.uint64)
+    b = np.empty_like(a)
+    countBytes = a.nbytes
+
+    kernels = [
+        ("copy", 2 * countBytes, lambda: np.copyto(b, a)),
+        ("read", countBytes, lambda: a.sum()),
+    ]
+    bandwidths = dict()
+    for name, kernelBytes, kernel in kernels:
+        best = float("inf")
+        for _ in range(countReps):
+            start = time.perf_counter()
+            kernel()
+            best = min(best, time.perf_counter() - start)
+        bandwidths[name] = kernelBytes / best / 1000 / 1000 / 1000
+    return bandwidths
+
+# -----------------------------------------------------------------------------
+# Analyzing the operators.
+# -----------------------------------------------------------------------------
+
+# The share of the bandwidth ceiling from which on we consider an operator to
+# be bandwidth-bound.
+boundThreshold = 0.5
+
+def analyze(df, bandwidthCeiling):
+    """
+    Adds the roofline metrics to the given data frame, which must contain one
+    row per operator with the columns "bytes" (the total size of the columns
+    the operator reads and writes), "values" (the total number of data
+    elements in these columns), and "runtime [s]". The bandwidth ceiling is
+    given in GB/s.
+    """
+
+    df = df.copy()
+    df["bandwidth [GB/s]"] = df["bytes"] / df["runtime [s]"] / 1000 / 1000 / 1000
+    df["intensity [values/B]"] = df["values"] / df["bytes"]
+    df["throughput [Gvalues/s]"] = \
+            df["values"] / df["runtime [s]"] / 1000 / 1000 / 1000
+    df["ceiling share [%]"] = df["bandwidth [GB/s]"] / bandwidthCeiling * 100
+    df["bound"] = np.where(
+            df["ceiling share [%]"] >= boundThreshold * 100,
+            "bandwidth", "compute"
+    )
+    return df
+
+# -----------------------------------------------------------------------------
+# Drawing a roofline diagram.
+# -----------------------------------------------------------------------------
+
+def drawRoofline(ax, df, bandwidthCeiling, hueCol, hueOrder, colors, title):
+    """
+    Draws the operators in the given data frame (see analyze) into a roofline
+    diagram, i.e., their throughput over their intensity (both logarithmic)
+    along with the line of the throughput attainable with the bandwidth
+    ceiling. The points are colored by the values in hueCol.
+    """
+
+    for hue, color in zip(hueOrder, colors):
+        dfHue = df[df[hueCol] == hue]
+        ax.scatter(
+                dfHue["intensity [values/B]"], dfHue["throughput [Gvalues/s]"],
+                color=color, edgecolor="black", lw=0.5, label=hue
+        )
+
+    xs = np.array([
+        df["intensity [values/B]"].min() / 2,
+        df["intensity [values/B]"].max() * 2
+    ])
+    ax.plot(xs, xs * bandwidthCeiling, color="black", ls="--")
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("intensity [values/B]")
+    ax.set_ylabel("throughput [Gvalues/s]")
+    ax.set_title(title)
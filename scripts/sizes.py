@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+
+"""
+This script estimates the physical sizes of the columns of the Star Schema
+Benchmark queries in all formats from their data characteristics, instead of
+measuring them by compressing the data (see the generate step in
+vldb2020_ssb.sh).
+
+The sizes of uncompressed data and static_vbp can be calculated exactly from
+the number of data elements and the bit width. For dynamic_vbp, we estimate
+the bit width of each block from the bit width histogram of the column: If the
+column is sorted, the blocks are homogeneous, so the mean bit width is a good
+estimate. Otherwise, we assume the data elements to be independent, such that
+a block's bit width is the maximum of that many draws from the histogram. For
+the cascades of delta and for with dynamic_vbp, we estimate the distribution
+of the deltas and of the differences to the reference value, respectively,
+from the histogram as well as the minimum, maximum, and number of distinct
+values of the column.
+
+The script can validate the estimates against measured sizes, or write them
+to files in the same format as the measured sizes, which can be used instead.
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+import zlib
+
+import numpy as np
+import pandas as pd
+
+_pathMorphStore = "MorphStore"
+sys.path.append(os.path.join(_pathMorphStore, "Benchmarks", "tools", "mal2x"))
+import mal2morphstore.processingstyles as pss
+
+import artifacts
+import datachars
+import formatstrings
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Regarding the formats
+# -----------------------------------------------------------------------------
+
+# The block size of the cascades (in data elements).
+_blockSizeCasc = 1024
+# The number of blocks of dynamic_vbp sharing one page of meta data.
+_pageSizeBlocks = 64
+# The constant overhead (in bytes) of a column in dynamic_vbp and its cascades,
+# which does not depend on the number of data elements. It cannot be derived
+# from the formats' definitions here, so it is fitted to the layout of measured
+# sizes (see fitOverheads). These defaults were fitted on SF100 and are used
+# when writing the estimates. The validation never uses overheads fitted on the
+# columns it validates.
+overheadByteByFamily = {"dynamic_vbp": 8320, "delta": 16640, "for": 16768}
+
+def formatNames(processingStyle):
+    """
+    Returns the internal names of the formats whose sizes are measured for
+    each column, given the column's maximum bit width, in the order of the
+    measured sizes.
+    """
+
+    # The number of 64-bit data elements per vector.
+    step = pss.PS_INFOS[processingStyle].vectorSizeBit // 64
+    dynamicVbp = "dynamic_vbp_f<{}, {}, {}>".format(
+            pss.PS_INFOS[processingStyle].vectorSizeBit, _pageSizeBlocks, step
+    )
+    return lambda bwMax: [
+        "uncompr_f",
+        "static_vbp_f<vbp_l<{}, {}> >".format(bwMax, step),
+        dynamicVbp,
+        "delta_f<{}, {}, {} >".format(_blockSizeCasc, step, dynamicVbp),
+        "for_f<{}, {}, {} >".format(_blockSizeCasc, step, dynamicVbp),
+    ]
+
+def withoutBw(formatWithBw):
+    """Returns the name of the given format without its bit width."""
+
+    return re.sub(r"vbp_l<\d+,", "vbp_l<bw,", formatWithBw)
+
+# -----------------------------------------------------------------------------
+# Regarding the bit widths
+# -----------------------------------------------------------------------------
+
+_bws = datachars.BWS
+
+def _bitsOf(val):
+    """Returns the effective bit width of the given non-negative integer."""
+
+    return max(int(val).bit_length(), 1)
+
+def _expectedMaxBw(probs, count):
+    """
+    Returns the expected maximum bit width of count independent data elements
+    with the given bit width distribution.
+    """
+
+    cdf = np.minimum(np.cumsum(probs), 1) ** count
+    return (_bws * np.diff(cdf, prepend=0)).sum()
+
+def _shiftedBwProbs(probs, valMin, valMax):
+    """
+    Returns the bit width distribution of the data elements with the given bit
+    width distribution minus valMin, assuming that the values within each bit
+    width are uniformly distributed (within valMin and valMax).
+    """
+
+    shifted = np.zeros(len(_bws))
+    # Bit width 1 comprises the values 0 and 1.
+    bucketLos = np.where(_bws == 1, 0, 2.0 ** (_bws - 1))
+    bucketHis = 2.0 ** _bws - 1
+    for bw, prob in zip(_bws, probs):
+        if prob == 0:
+            continue
+        lo = min(max(bucketLos[bw - 1], valMin), valMax) - valMin
+        hi = max(min(bucketHis[bw - 1], valMax), valMin) - valMin
+        overlaps = np.maximum(
+                np.minimum(hi, bucketHis) - np.maximum(lo, bucketLos) + 1, 0
+        )
+        shifted += prob * overlaps / overlaps.sum()
+    return shifted / shifted.sum()
+
+def _erlangCdf(x, k, scale):
+    """The cumulative distribution function of the Erlang distribution."""
+
+    if x < 0:
+        return 0.0
+    if scale <= 0:
+        return 1.0
+    y = x / scale
+    term = math.exp(-y)
+    acc = term
+    for i in range(1, k):
+        term *= y / i
+        acc += term
+    return 1 - acc
+
+def _bwDeltaSorted(colInfo, step, blockSize):
+    """
+    Returns the expected bit width of a block of the deltas of a sorted column
+    between data elements step positions apart. The gaps between neighboring
+    data elements are modeled as exponentially distributed (at least 1 if the
+    column is unique), such that each delta is the sum of step gaps.
+    """
+
+    countValues = colInfo["valueCount"]
+    if colInfo["DistinctCount"] <= 1:
+        return 1
+    gapMean = (colInfo["Max"] - colInfo["Min"]) / max(countValues - 1, 1)
+    if colInfo["DistinctCount"] == countValues:
+        deltaMin = step
+        scale = max(gapMean - 1, 0)
+    else:
+        deltaMin = 0
+        scale = gapMean
+
+    bwExp = 0
+    cdfPrev = 0
+    for bw in range(1, 64 + 1):
+        cdf = _erlangCdf(2 ** bw - 1 - deltaMin, step, scale) ** blockSize
+        bwExp += bw * (cdf - cdfPrev)
+        cdfPrev = cdf
+        if cdf >= 1 - 1e-12:
+            break
+    return bwExp
+
+def _bwDeltaUnsorted(colInfo, blockSize):
+    """
+    Returns the expected bit width of a block of the deltas of an unsorted
+    column. A negative delta wraps around and needs 64 bits, which is likely
+    unless the column has very few distinct values.
+    """
+
+    if colInfo["DistinctCount"] <= 1:
+        return 1
+    probNeg = (1 - 1 / colInfo["DistinctCount"]) / 2
+    probAnyNeg = 1 - (1 - probNeg) ** blockSize
+    return probAnyNeg * 64 + (1 - probAnyNeg) * _bitsOf(colInfo["Max"] - colInfo["Min"])
+
+def _bwForSorted(colInfo, step, blockSizeOuter, blockSizeInner):
+    """
+    Returns the expected bit width of a block of the differences of a sorted
+    column to the reference value, i.e., the first data element, of its lane
+    in the outer block. These differences grow over the outer block.
+    """
+
+    valRange = colInfo["Max"] - colInfo["Min"]
+    gapMean = valRange / max(colInfo["valueCount"] - 1, 1)
+    countInner = blockSizeOuter // blockSizeInner
+    return sum(
+        min(_bitsOf(math.ceil((blockSizeInner * i - step) * gapMean)), _bitsOf(valRange))
+        for i in range(1, countInner + 1)
+    ) / countInner
+
+# -----------------------------------------------------------------------------
+# Regarding the sizes
+# -----------------------------------------------------------------------------
+
+def _sizeDynamicVbp(countValues, bw, blockSize):
+    """
+    Returns the number of data elements represented in dynamic_vbp and their
+    size in bytes, given the (expected) bit width of the blocks. The remaining
+    data elements are left uncompressed.
+    """
+
+    countCompr = countValues // blockSize * blockSize
+    countBlocks = countCompr // blockSize
+    # One byte of meta data per block, allocated in pages.
+    sizeMeta = _pageSizeBlocks * math.ceil(countBlocks / _pageSizeBlocks)
+    return countCompr, countCompr * bw / 8 + sizeMeta
+
+def estimateSize(colInfo, probs, formatWithBw, overheads=None):
+    """
+    Estimates the size of the given column (a row of the data characteristics
+    and its relative bit width histogram, see datachars) in the given format,
+    with the given constant overheads per format family (defaults to
+    overheadByteByFamily). Returns the number of data elements represented in
+    the compressed part, the total size in bytes, and the size of the
+    compressed part in bytes.
+    """
+
+    if overheads is None:
+        overheads = overheadByteByFamily
+
+    countValues = int(colInfo["valueCount"])
+    isSorted = bool(colInfo["Sorted"])
+
+    fmt = formatstrings.parse(formatWithBw)
+
+    if fmt.family == "uncompr":
+        return 0, countValues * 8, 0
+
+    if fmt.family == "static_vbp" and fmt.bw is not None:
+        # Like in the diagram generation, see dias_ssb.py.
+        bw, blockSize = fmt.bw, fmt.blockSize
+        countCompr = countValues // blockSize * blockSize
+        sizeCompr = countCompr * bw // 8
+        return countCompr, sizeCompr + (countValues - countCompr) * 8, sizeCompr
+
+    if fmt.family == "dynamic_vbp":
+        blockSize = fmt.blockSize
+        if isSorted:
+            bw = (_bws * probs).sum()
+        else:
+            bw = _expectedMaxBw(probs, blockSize)
+        countCompr, sizeCompr = _sizeDynamicVbp(countValues, bw, blockSize)
+        sizeUsed = sizeCompr + (countValues - countCompr) * 8 + \
+                overheads["dynamic_vbp"]
+        return countCompr, int(round(sizeUsed)), int(round(sizeCompr))
+
+    if fmt.family in ("delta", "for") and fmt.inner is not None:
+        kind = fmt.family
+        blockSizeOuter, step = fmt.blockSize, fmt.step
+        if fmt.inner.family != "dynamic_vbp":
+            raise RuntimeError("unsupported format: {}".format(formatWithBw))
+        blockSizeInner = fmt.inner.blockSize
+
+        if kind == "delta" and isSorted:
+            bw = _bwDeltaSorted(colInfo, step, blockSizeInner)
+        elif kind == "delta":
+            bw = _bwDeltaUnsorted(colInfo, blockSizeInner)
+        elif isSorted:
+            bw = _bwForSorted(colInfo, step, blockSizeOuter, blockSizeInner)
+        else:
+            bw = _expectedMaxBw(
+                    _shiftedBwProbs(probs, colInfo["Min"], colInfo["Max"]),
+                    blockSizeInner
+            )
+
+        countCompr = countValues // blockSizeOuter * blockSizeOuter
+        _, sizeInner = _sizeDynamicVbp(countCompr, bw, blockSizeInner)
+        # One 64-bit reference value per lane and outer block.
+        sizeCompr = sizeInner + countCompr // blockSizeOuter * step * 8
+        sizeUsed = sizeCompr + (countValues - countCompr) * 8 + overheads[kind]
+        return countCompr, int(round(sizeUsed)), int(round(sizeCompr))
+
+    raise RuntimeError("unsupported format: {}".format(formatWithBw))
+
+def estimateSizes(dc, processingStyle, overheads=None):
+    """
+    Estimates the sizes of all columns in the given data characteristics of a
+    query (see datachars) in all formats, see estimateSize. Returns a data
+    frame with the same attributes as the measured sizes.
+    """
+
+    getFormatNames = formatNames(processingStyle)
+    dc = dc.firstPerColumn()
+    rows = []
+    for (_, colInfo), probs, bwMax in zip(
+            dc.attrs.iterrows(), dc.bwProbs(), dc.bwMax()
+    ):
+        for formatWithBw in getFormatNames(bwMax):
+            countCompr, sizeUsed, sizeCompr = \
+                    estimateSize(colInfo, probs, formatWithBw, overheads)
+            rows.append(dict(
+                colName=colInfo["colName"],
+                formatWithBw=formatWithBw,
+                formatWithoutBw=withoutBw(formatWithBw),
+                valueCount=int(colInfo["valueCount"]),
+                valueCountCompr=countCompr,
+                sizeUsedByte=sizeUsed,
+                sizeComprByte=sizeCompr,
+            ))
+    return pd.DataFrame(rows)
+
+def writeSizesFile(filePath, dfSizes):
+    """Writes the given sizes in the format of the measured sizes."""
+
+    with open(filePath, "w") as f:
+        f.write("LogFilename: estimated\n")
+        f.write("JSonLogFilename: estimated\n")
+        f.write("[MEA]\n")
+        dfSizes.to_csv(f, sep="\t", index=False)
+
+def _family(formatWithBw):
+    return formatstrings.parse(formatWithBw).family
+
+def fitOverheads(dfMea):
+    """
+    Fits the constant overheads per format family (see overheadByteByFamily)
+    to the given measured sizes. The overhead of a column is the part of its
+    size which is neither the compressed part nor the uncompressed rest. Its
+    median per family is returned, independently of any estimate.
+    """
+
+    sOverhead = (
+            dfMea["sizeUsedByte"] - dfMea["sizeComprByte"] -
+            (dfMea["valueCount"] - dfMea["valueCountCompr"]) * 8
+    )
+    sFamily = dfMea["formatWithBw"].map(
+            {fmt: _family(fmt) for fmt in dfMea["formatWithBw"].unique()}
+    )
+    sOverhead = sOverhead.groupby(sFamily).median()
+    return {
+        family: int(round(overhead))
+        for family, overhead in sOverhead.items()
+        if family in overheadByteByFamily
+    }
+
+def addOverheads(dfEst, overheads):
+    """
+    Returns the given sizes estimated without overheads with the given
+    constant overheads per format family added.
+    """
+
+    dfEst = dfEst.copy()
+    dfEst["sizeUsedByte"] += dfEst["formatWithBw"].map({
+        fmt: overheads[_family(fmt)]
+        if _family(fmt) in overheadByteByFamily else 0
+        for fmt in dfEst["formatWithBw"].unique()
+    })
+    return dfEst
+
+def estimateQueries(pathDataCh, queries, processingStyle, overheads=None):
+    """
+    Estimates the sizes of all columns of the given queries from their data
+    characteristics in the given directory, see estimateSizes. Returns one
+    data frame with the query in the column "query".
+    """
+
+    dfsEst = []
+    for q in queries:
+        dfEst = estimateSizes(
+                datachars.load(os.path.join(pathDataCh, "q{}.csv".format(q))),
+                processingStyle, overheads
+        )
+        dfEst["query"] = q
+        dfsEst.append(dfEst)
+    return pd.concat(dfsEst, ignore_index=True)
+
+def readSizes(pathSizes, queries):
+    """
+    Reads the measured sizes of all columns of the given queries from the
+    given directory. Returns one data frame with the query in the column
+    "query".
+    """
+
+    dfsMea = []
+    for q in queries:
+        dfMea = artifacts.readMorphStoreCsv(
+                os.path.join(pathSizes, "q{}.csv".format(q))
+        )
+        dfMea["query"] = q
+        dfsMea.append(dfMea)
+    return pd.concat(dfsMea, ignore_index=True)
+
+def crossValidate(dfEst, dfMea, countFolds=2):
+    """
+    Returns the given sizes estimated without overheads with the overheads
+    added which are fitted on the measured sizes of the other columns (see
+    fitOverheads). To this end, the columns are split into the given number of
+    folds by their names, such that a column used by several queries is in one
+    fold.
+    """
+
+    def folds(df):
+        return df["colName"].map(
+                lambda colName: zlib.crc32(colName.encode()) % countFolds
+        )
+
+    sFoldEst = folds(dfEst)
+    sFoldMea = folds(dfMea)
+    dfsEst = []
+    for fold in range(countFolds):
+        overheads = fitOverheads(dfMea[sFoldMea != fold])
+        dfsEst.append(addOverheads(dfEst[sFoldEst == fold], overheads))
+    return pd.concat(dfsEst).sort_index()
+
+def validate(dfEst, dfMea):
+    """
+    Compares the given estimated sizes to the given measured ones. Returns one
+    row per column and format with the relative error of the estimate.
+    """
+
+    df = dfMea[["query", "colName", "formatWithBw", "formatWithoutBw", "valueCount", "sizeUsedByte"]].merge(
+            dfEst[["query", "colName", "formatWithBw", "sizeUsedByte"]],
+            on=["query", "colName", "formatWithBw"],
+            suffixes=(" measured", " estimated")
+    )
+    df["error [%]"] = (
+            (df["sizeUsedByte estimated"] - df["sizeUsedByte measured"]) /
+            df["sizeUsedByte measured"] * 100
+    )
+    return df
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Defaults.
+    scaleFactor = 100
+    processingStyle = pss.PS_VEC512
+    queries = list(sorted(["{}.{}".format(mj, mn) for mj in range(1, 4+1) for mn in range(1, 3+1)] + ["3.4"]))
+    pathArtifacts = os.path.join("artifacts", "ssb")
+    # Columns with less data elements are not considered in the summary of
+    # the validation, since they hardly contribute to the memory footprint.
+    countValuesMinSummary = 100000
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "-sf", "--scaleFactor", metavar="N", type=int,
+            help="The SSB scale factor. Defaults to {}.".format(scaleFactor),
+            default=scaleFactor
+    )
+    parser.add_argument(
+            "-ps", "--processingStyle", metavar="PROCESSING_STYLE",
+            help="The processing style whose formats to consider. Defaults to "
+                 "'{}'.".format(processingStyle),
+            default=processingStyle
+    )
+    parser.add_argument(
+            "-q", "--query", "--queries", metavar="N.N", nargs="+",
+            help="The queries to consider. Defaults to all queries.",
+            default=queries, choices=queries,
+    )
+    parser.add_argument(
+            "--pathArtifacts", metavar="PATH",
+            help="The directory of the SSB artifacts. Defaults to "
+                 "'{}'.".format(pathArtifacts),
+            default=pathArtifacts
+    )
+    parser.add_argument(
+            "--fitSf", metavar="N", type=int,
+            help="Fit the constant overheads of the formats to the measured "
+                 "sizes of this scale factor in <PATH>/size_sf<N> instead of "
+                 "using the defaults. With --validate, this must not be the "
+                 "validated scale factor. Without it, the validation fits the "
+                 "overheads for each half of the columns on the other half.",
+            default=None
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+            "--validate", action="store_true",
+            help="Compare the estimated sizes to the measured ones in "
+                 "<PATH>/size_sf<N> and write the errors to "
+                 "<PATH>/size_estimation_sf<N>.",
+    )
+    group.add_argument(
+            "--write", action="store_true",
+            help="Write the estimated sizes to <PATH>/size_sf<N>, such that "
+                 "they can be used instead of the measured ones.",
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+    scaleFactor = args.scaleFactor
+    processingStyle = args.processingStyle
+    queries = args.query
+    pathArtifacts = args.pathArtifacts
+    fitSf = args.fitSf
+    if args.validate and fitSf == scaleFactor:
+        parser.error("the overheads must be fitted on another scale factor")
+
+    # -------------------------------------------------------------------------
+    # Setting the paths to certain artifacts
+    # -------------------------------------------------------------------------
+
+    pathDataCh = os.path.join(pathArtifacts, "dc_sf{}".format(scaleFactor))
+    pathSizes = os.path.join(pathArtifacts, "size_sf{}".format(scaleFactor))
+    pathEstimation = os.path.join(
+            pathArtifacts, "size_estimation_sf{}".format(scaleFactor)
+    )
+
+    # -------------------------------------------------------------------------
+    # Estimation
+    # -------------------------------------------------------------------------
+
+    overheads = None
+    if fitSf is not None:
+        overheads = fitOverheads(readSizes(
+                os.path.join(pathArtifacts, "size_sf{}".format(fitSf)), queries
+        ))
+        print("The overheads fitted on SF{} are {}.".format(fitSf, overheads))
+
+    if args.write:
+        dfEst = estimateQueries(pathDataCh, queries, processingStyle, overheads)
+        os.makedirs(pathSizes, exist_ok=True)
+        for q, dfQuery in dfEst.groupby("query", sort=False):
+            writeSizesFile(
+                    os.path.join(pathSizes, "q{}.csv".format(q)),
+                    dfQuery.drop(columns="query")
+            )
+        sys.exit(0)
+
+    # -------------------------------------------------------------------------
+    # Validation
+    # -------------------------------------------------------------------------
+
+    noOverheads = dict.fromkeys(overheadByteByFamily, 0)
+    dfEst = estimateQueries(pathDataCh, queries, processingStyle, noOverheads)
+    dfMea = readSizes(pathSizes, queries)
+    if overheads is None:
+        dfEst = crossValidate(dfEst, dfMea)
+    else:
+        dfEst = addOverheads(dfEst, overheads)
+    dfVal = validate(dfEst, dfMea)
+
+    os.makedirs(pathEstimation, exist_ok=True)
+    dfVal.to_csv(
+            os.path.join(pathEstimation, "validation.csv"), sep="\t",
+            index=False
+    )
+
+    # Summarize the errors per format.
+    dfLarge = dfVal[dfVal["valueCount"] >= countValuesMinSummary]
+    dfSummary = dfLarge.groupby("formatWithoutBw", sort=False).agg(
+            columns=("error [%]", "size"),
+            meanAbsError=("error [%]", lambda s: s.abs().mean()),
+            maxAbsError=("error [%]", lambda s: s.abs().max()),
+    ).rename(columns={
+        "meanAbsError": "mean abs. error [%]",
+        "maxAbsError": "max abs. error [%]",
+    })
+    dfTotal = dfVal.groupby("formatWithoutBw", sort=False)[
+        ["sizeUsedByte measured", "sizeUsedByte estimated"]
+    ].sum()
+    dfSummary["total error [%]"] = (
+            (dfTotal["sizeUsedByte estimated"] - dfTotal["sizeUsedByte measured"]) /
+            dfTotal["sizeUsedByte measured"] * 100
+    )
+    dfSummary.to_csv(
+            os.path.join(pathEstimation, "summary.csv"), sep="\t"
+    )
+
+    with pd.option_context("display.float_format", "{:.2f}".format):
+        print(dfSummary.to_string())
+    print()
+    rowWorst = dfLarge.loc[dfLarge["error [%]"].abs().idxmax()]
+    print(
+            "The errors per column consider only columns with at least {} "
+            "data elements, the total errors consider all columns. The worst "
+            "error of a column is {:.2f}% ({} in {}).".format(
+                    countValuesMinSummary, rowWorst["error [%]"],
+                    rowWorst["colName"], rowWorst["formatWithBw"]
+            )
+    )
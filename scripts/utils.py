@@ -1,13 +1,11 @@
 import os
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import matplotlib.lines as lines
-
 """
 Some utilities required by the diagram generation of both the micro benchmarks
 and the Star Schema Benchmark.
+
+Note that matplotlib is imported only by the functions which need it, such that
+importing this module does not pay the startup cost of the plotting stack.
 """
 
 # -----------------------------------------------------------------------------
@@ -19,6 +17,8 @@ pathDias = None
 def saveFig(filename):
     """Saves the current matplotlib figure to a file."""
     
+    import matplotlib.pyplot as plt
+    
     if pathDias is None:
         raise RuntimeError("you must set utils.pathDias first")
     
@@ -34,6 +34,9 @@ def saveFig(filename):
 def drawLegendRect(labels, colors):
     """Generates a legend in an individual matplotlib figure."""
 
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+
     fig = plt.figure()
     generalRectProps = dict(linewidth=1, edgecolor="black", clip_on=False)
     fig.legend(
@@ -49,6 +52,9 @@ def drawLegendRect(labels, colors):
 def drawLegendMarker(labels, colors):
     """Generates a legend in an individual matplotlib figure."""
 
+    import matplotlib.pyplot as plt
+    import matplotlib.lines as lines
+
     fig = plt.figure()
     fig.legend(
         [
@@ -71,6 +77,8 @@ def drawLegendMarker(labels, colors):
 # -----------------------------------------------------------------------------
     
 def setMatplotlibRcParamsLikeInJupyterNotebook():
+    import matplotlib as mpl
+    
     # We originally created the diagrams in a jupyter notebook. In that
     # environment, some rcParams of matplotlib are different. To obtain
     # exactly the same diagram sizes etc., we explicitly use these rcParams
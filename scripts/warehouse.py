@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+
+"""
+This script maintains a warehouse of the results of all benchmark runs, i.e.,
+a single SQLite database holding the measurements of the micro benchmarks and
+the Star Schema Benchmark (runtimes of MorphStore and MonetDB, sizes, data
+characteristics, and calibration profiles) from one or more artifact trees.
+
+Each artifact file is one run in the warehouse. The run's metadata, i.e., the
+artifact tree it stems from (its source), its timestamp (from the preamble of
+the file), the host it was ingested on, the scale factor, the processing
+style, the compression strategy, the repetition, and the query (as far as
+they apply), is stored in the table runs. The measurements of each kind of
+artifact are stored in a table of their own, which references the runs by
+their runId. Ingesting an artifact tree again only ingests the files which
+have been added or changed since, and drops the runs of removed files.
+
+Besides ingesting artifacts and running ad-hoc queries from the command line,
+this module offers a small API for querying the measurements, which the
+diagram scripts use instead of reading the artifact files if they are given a
+warehouse.
+"""
+
+import argparse
+import os
+import re
+import socket
+import sqlite3
+import sys
+
+import pandas as pd
+
+import artifacts
+
+# *****************************************************************************
+# Utility functions
+# *****************************************************************************
+
+# -----------------------------------------------------------------------------
+# Regarding the kinds of artifacts
+# -----------------------------------------------------------------------------
+
+# The processing styles of the SSB runs in MorphStore. The strategy
+# UncomprScalar always uses the scalar processing style.
+_PS_SCALAR = "scalar<v64<uint64_t>>"
+_CS_UNCOMPR_SCALAR = "UncomprScalar"
+
+# The number of lines preceding the header in the files of the micro
+# benchmarks and the calibration profiles.
+_countPreambleLines = 2
+
+def _readMorphStoreCsv(filePath):
+    return pd.DataFrame(artifacts.readMorphStoreRows(filePath))
+
+def _readPreambleCsv(filePath):
+    return pd.read_csv(filePath, sep="\t", skiprows=_countPreambleLines)
+
+def _readMonetDBCsv(filePath):
+    return pd.read_csv(filePath, sep="\t", dtype={"query": str})
+
+# The kinds of artifacts: the name of the table of their measurements (the
+# pattern "{name}" is replaced by the named group of the path), the pattern of
+# the paths of their files relative to the artifact tree (whose named groups
+# are the metadata of a run), and the function for reading a file.
+ARTIFACT_KINDS = [
+    (
+        "times_MorphStore",
+        r"ssb/times_MorphStore_sf(?P<sf>\d+)/(?P<cs>.+)_(?P<rep>\d+)/q(?P<query>[\d.]+)\.csv",
+        _readMorphStoreCsv,
+    ),
+    (
+        "times_MonetDB",
+        r"ssb/times_MonetDB_sf(?P<sf>\d+)/(?P<cs>[^/]+)\.csv",
+        _readMonetDBCsv,
+    ),
+    (
+        "sizes",
+        r"ssb/size_sf(?P<sf>\d+)/q(?P<query>[\d.]+)\.csv",
+        _readMorphStoreCsv,
+    ),
+    (
+        "dc",
+        r"ssb/dc_sf(?P<sf>\d+)/q(?P<query>[\d.]+)\.csv",
+        _readMorphStoreCsv,
+    ),
+    (
+        "profile_{name}",
+        r"ssb/compr_profiles/(?P<name>[^/]+)\.csv",
+        _readPreambleCsv,
+    ),
+    (
+        "{name}",
+        r"microbenchmarks/(?P<name>example|singleop|simplequery)_(?P<rep>\d+)\.csv",
+        _readPreambleCsv,
+    ),
+]
+
+def _classify(relPath):
+    """
+    Returns the table name, the metadata, and the reader of the artifact file
+    with the given path relative to its artifact tree, or None if it is no
+    artifact of interest.
+    """
+
+    relPath = relPath.replace(os.sep, "/")
+    for tableFs, pattern, readFn in ARTIFACT_KINDS:
+        match = re.fullmatch(pattern, relPath)
+        if match:
+            meta = match.groupdict()
+            table = tableFs.format(name=meta.pop("name", None))
+            return table, meta, readFn
+    return None
+
+def _readTimestamp(filePath):
+    """
+    Returns the timestamp in the preamble of a MorphStore CSV file (the line
+    "LogFilename: <timestamp>_monitoringLog"), or None if there is none.
+    """
+
+    with open(filePath) as f:
+        line = f.readline()
+    match = re.match(
+            r"LogFilename: (\d{4}-\d{2}-\d{2})-(\d{2}:\d{2}:\d{2})_monitoringLog",
+            line
+    )
+    return "{} {}".format(*match.groups()) if match else None
+
+# -----------------------------------------------------------------------------
+# Regarding the database
+# -----------------------------------------------------------------------------
+
+# The metadata of each run.
+RUN_COLS = ["source", "path", "timestamp", "host", "sf", "ps", "cs", "rep", "query"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    runId INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    path TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    timestamp TEXT,
+    host TEXT,
+    sf INTEGER,
+    ps TEXT,
+    cs TEXT,
+    rep INTEGER,
+    query TEXT,
+    UNIQUE (source, path)
+);
+CREATE INDEX IF NOT EXISTS runs_kind ON runs (kind, source, sf, cs, query);
+"""
+
+def connect(pathDb):
+    """Opens the warehouse at the given path, creating it if necessary."""
+
+    os.makedirs(os.path.dirname(os.path.abspath(pathDb)), exist_ok=True)
+    conn = sqlite3.connect(pathDb)
+    conn.executescript(_SCHEMA)
+    return conn
+
+def _quote(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+def _tableCols(conn, table):
+    return [
+        row[1] for row in conn.execute(
+                "PRAGMA table_info({})".format(_quote(table))
+        )
+    ]
+
+def _appendRows(conn, table, df):
+    """
+    Appends the rows of the given data frame to the given table, creating the
+    table and adding columns as necessary.
+    """
+
+    colsOld = _tableCols(conn, table)
+    if not colsOld:
+        df.head(0).to_sql(table, conn, index=False)
+        conn.execute("CREATE INDEX {} ON {} (runId)".format(
+                _quote("{}_runId".format(table)), _quote(table)
+        ))
+    else:
+        for col in df.columns:
+            if col not in colsOld:
+                conn.execute("ALTER TABLE {} ADD COLUMN {}".format(
+                        _quote(table), _quote(col)
+                ))
+    df.to_sql(table, conn, index=False, if_exists="append")
+
+def _dropRun(conn, runId, table):
+    if _tableCols(conn, table):
+        conn.execute(
+                "DELETE FROM {} WHERE runId = ?".format(_quote(table)), (runId,)
+        )
+    conn.execute("DELETE FROM runs WHERE runId = ?", (runId,))
+
+def ingest(conn, pathTree, source, host, processingStyle):
+    """
+    Ingests all artifact files in the given artifact tree, using the given
+    name of the source, the host, and the processing style of the SSB runs in
+    MorphStore. Returns the numbers of runs ingested (added or changed) and
+    dropped.
+    """
+
+    known = {
+        path: (runId, kind, fingerprint)
+        for runId, kind, path, fingerprint in conn.execute(
+                "SELECT runId, kind, path, fingerprint FROM runs WHERE source = ?",
+                (source,)
+        )
+    }
+
+    countIngested = 0
+    seen = set()
+    for dirPath, dirNames, fileNames in os.walk(pathTree):
+        dirNames.sort()
+        for fileName in sorted(fileNames):
+            filePath = os.path.join(dirPath, fileName)
+            relPath = os.path.relpath(filePath, pathTree).replace(os.sep, "/")
+            kind = _classify(relPath)
+            if kind is None:
+                continue
+            table, meta, readFn = kind
+            seen.add(relPath)
+
+            st = os.stat(filePath)
+            fingerprint = "{}:{}".format(st.st_size, st.st_mtime_ns)
+            if relPath in known:
+                runId, tableOld, fingerprintOld = known[relPath]
+                if fingerprintOld == fingerprint:
+                    continue
+                _dropRun(conn, runId, tableOld)
+
+            cs = meta.get("cs")
+            if table == "times_MorphStore":
+                ps = _PS_SCALAR if cs == _CS_UNCOMPR_SCALAR else processingStyle
+            elif table == "times_MonetDB":
+                ps = _PS_SCALAR
+            else:
+                ps = None
+            cursor = conn.execute(
+                    "INSERT INTO runs (kind, source, path, fingerprint, "
+                    "timestamp, host, sf, ps, cs, rep, query) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        table, source, relPath, fingerprint,
+                        _readTimestamp(filePath), host,
+                        int(meta["sf"]) if "sf" in meta else None, ps, cs,
+                        int(meta["rep"]) if "rep" in meta else None,
+                        meta.get("query"),
+                    )
+            )
+            df = readFn(filePath)
+            df.insert(0, "runId", cursor.lastrowid)
+            _appendRows(conn, table, df)
+            countIngested += 1
+        conn.commit()
+
+    countDropped = 0
+    for relPath, (runId, table, _) in known.items():
+        if relPath not in seen:
+            _dropRun(conn, runId, table)
+            countDropped += 1
+    conn.commit()
+
+    return countIngested, countDropped
+
+# -----------------------------------------------------------------------------
+# Query API
+# -----------------------------------------------------------------------------
+
+def query(pathDb, sql, params=()):
+    """Returns the result of the given SQL query as a data frame."""
+
+    conn = connect(pathDb)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+def loadMeasurements(pathDb, table, **filters):
+    """
+    Returns the measurements in the given table (see ARTIFACT_KINDS) along
+    with the metadata of their runs (see RUN_COLS), except for metadata which
+    the measurements have themselves (e.g., the query of MonetDB).
+
+    Each keyword argument filters by one column of the measurements or of the
+    metadata, e.g., source="artifacts", sf=100, or query=["1.1", "1.2"]. The
+    value may be a single value or a list of values.
+    """
+
+    conn = connect(pathDb)
+    try:
+        tableCols = _tableCols(conn, table)
+        if not tableCols:
+            return pd.DataFrame(columns=[
+                col for col in RUN_COLS if col not in filters
+            ])
+        metaCols = [col for col in RUN_COLS if col not in tableCols]
+        conds = []
+        params = []
+        for col, val in filters.items():
+            alias = "m" if col in tableCols else "r"
+            vals = list(val) if isinstance(val, (list, tuple, set)) else [val]
+            conds.append("{}.{} IN ({})".format(
+                    alias, _quote(col), ", ".join("?" * len(vals))
+            ))
+            params.extend(vals)
+        sql = "SELECT {} FROM runs r JOIN {} m ON r.runId = m.runId".format(
+                ", ".join(
+                        ["r.{}".format(_quote(col)) for col in metaCols] +
+                        ["m.{}".format(_quote(col)) for col in tableCols if col != "runId"]
+                ),
+                _quote(table)
+        )
+        if conds:
+            sql += " WHERE " + " AND ".join(conds)
+        sql += " ORDER BY r.runId, m.rowid"
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+# *****************************************************************************
+# Main program
+# *****************************************************************************
+
+if __name__ == "__main__":
+    # -------------------------------------------------------------------------
+    # Argument parsing
+    # -------------------------------------------------------------------------
+
+    # Defaults.
+    pathDb = os.path.join("artifacts", "warehouse.sqlite")
+    processingStyle = "avx512<v512<uint64_t>>"
+
+    # Set up the parser.
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+            "action", choices=["ingest", "query"],
+            help="Ingest the artifact trees given as the arguments, or run "
+                 "the SQL query given as the argument and print its result.",
+    )
+    parser.add_argument(
+            "args", metavar="ARG", nargs="+",
+            help="The paths of the artifact trees to ingest (e.g., "
+                 "'artifacts' and 'artifacts_original'), whose names are "
+                 "the sources of their runs, or the SQL query.",
+    )
+    parser.add_argument(
+            "--pathDb", metavar="FILE",
+            help="The warehouse. Defaults to '{}'.".format(pathDb),
+            default=pathDb
+    )
+    parser.add_argument(
+            "--host", metavar="NAME",
+            help="The host the ingested artifacts were produced on. Defaults "
+                 "to the name of this host.",
+            default=socket.gethostname()
+    )
+    parser.add_argument(
+            "-ps", "--processingStyle", metavar="PROCESSING_STYLE",
+            help="The processing style of the ingested SSB runs in MorphStore "
+                 "(except for the strategy {}). Defaults to '{}'.".format(
+                         _CS_UNCOMPR_SCALAR, processingStyle
+                 ),
+            default=processingStyle
+    )
+
+    # Parse arguments.
+    args = parser.parse_args()
+    pathDb = args.pathDb
+
+    # -------------------------------------------------------------------------
+    # Execution of the action
+    # -------------------------------------------------------------------------
+
+    if args.action == "ingest":
+        conn = connect(pathDb)
+        for pathTree in args.args:
+            if not os.path.isdir(pathTree):
+                print("The artifact tree '{}' does not exist.".format(pathTree))
+                sys.exit(1)
+            source = os.path.basename(os.path.normpath(pathTree))
+            print("Ingesting '{}'... ".format(pathTree), end="")
+            sys.stdout.flush()
+            countIngested, countDropped = ingest(
+                    conn, pathTree, source, args.host, args.processingStyle
+            )
+            print("done ({} runs ingested, {} dropped).".format(
+                    countIngested, countDropped
+            ))
+        conn.close()
+        print()
+        print(query(
+                pathDb,
+                "SELECT source, kind, COUNT(*) AS runs, MIN(timestamp) AS first, "
+                "MAX(timestamp) AS last FROM runs GROUP BY source, kind "
+                "ORDER BY source, kind"
+        ).to_string(index=False))
+    elif args.action == "query":
+        with pd.option_context("display.max_rows", None, "display.width", None):
+            print(query(pathDb, " ".join(args.args)).to_string(index=False))
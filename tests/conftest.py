@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The utility modules live next to the scripts using them.
+sys.path.insert(
+        0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "scripts")
+)
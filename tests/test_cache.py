@@ -0,0 +1,43 @@
+import sys
+import types
+
+import pandas as pd
+
+import cache
+
+
+def _useCache(tmp_path, monkeypatch, loaderSource):
+    filePath = tmp_path / "loader.py"
+    filePath.write_text(loaderSource)
+    module = types.ModuleType("loader")
+    module.__file__ = str(filePath)
+    monkeypatch.setitem(sys.modules, "loader", module)
+    monkeypatch.setattr(cache, "codeModules", ["loader"])
+    monkeypatch.setattr(cache, "_codeFingerprint", None)
+    monkeypatch.setattr(cache, "useCache", True)
+    monkeypatch.setattr(cache, "pathCache", str(tmp_path / "cache"))
+
+
+def test_load_servesFromCache(tmp_path, monkeypatch):
+    _useCache(tmp_path, monkeypatch, "x = 1\n")
+    calls = []
+    def loadFn():
+        calls.append(1)
+        return pd.DataFrame({"a": [1, 2]})
+
+    cache.load("df", dict(sf=1), [], loadFn)
+    df = cache.load("df", dict(sf=1), [], loadFn)
+
+    assert len(calls) == 1
+    assert df["a"].tolist() == [1, 2]
+
+
+def test_load_invalidatedByCode(tmp_path, monkeypatch):
+    _useCache(tmp_path, monkeypatch, "x = 1\n")
+    cache.load("df", dict(sf=1), [], lambda: pd.DataFrame({"a": [1]}))
+
+    # The loader changed.
+    _useCache(tmp_path, monkeypatch, "x = 2\n")
+    df = cache.load("df", dict(sf=1), [], lambda: pd.DataFrame({"a": [2]}))
+
+    assert df["a"].tolist() == [2]
@@ -0,0 +1,52 @@
+import pandas as pd
+
+import calibration
+
+
+def _profile(bws, runtime):
+    return pd.DataFrame({
+        "vector_extension": "scalar",
+        "format": "static_vbp_f",
+        "bitwidth": list(bws),
+        "repetition": 1,
+        "runtime:µs": [runtime(bw) for bw in bws],
+        "size used [byte]": [8 * bw for bw in bws],
+        "check": 1,
+    })
+
+
+def test_sampleBitwidths_linear():
+    measured = []
+    def measure(bws):
+        measured.append(list(bws))
+        return _profile(bws, lambda bw: 1000 + 10 * bw)
+
+    df = calibration.sampleBitwidths(measure, 0.02)
+
+    # Only the initial bit widths and the midpoints between them.
+    assert measured == [[1, 8, 16, 32, 64], [4, 12, 24, 48]]
+    assert sorted(df["bitwidth"]) == [1, 4, 8, 12, 16, 24, 32, 48, 64]
+
+
+def test_sampleBitwidths_bisectsAtStep():
+    def measure(bws):
+        return _profile(bws, lambda bw: 1000 + (1000 if bw > 20 else 0))
+
+    bws = set(calibration.sampleBitwidths(measure, 0.02)["bitwidth"])
+
+    # The step between 20 and 21 is enclosed by measured bit widths.
+    assert {20, 21} <= bws
+    assert 40 not in bws
+
+
+def test_interpolateProfile():
+    dfOut = calibration.interpolateProfile(
+            _profile([1, 2, 4, 64], lambda bw: 10 * bw)
+    )
+
+    assert dfOut["bitwidth"].tolist() == list(range(1, 65))
+    assert dfOut["runtime:µs"].tolist() == [10 * bw for bw in range(1, 65)]
+    assert (dfOut["check"] == 1).all()
+    # The sizes were not measured at the interpolated bit widths.
+    assert dfOut["size used [byte]"].isna().sum() == 60
+    assert dfOut.loc[dfOut["bitwidth"] == 4, "size used [byte]"].item() == 32
@@ -0,0 +1,63 @@
+import math
+
+import pandas as pd
+import pytest
+
+# The diagram generation requires MorphStore's benchmark tools.
+pytest.importorskip("mal2morphstore.processingstyles")
+
+import dias_microbenchmarks
+
+
+def test_interpolateCrossover():
+    # Halfway between the speedups 2 and 1/2 in log space.
+    assert math.isclose(
+            dias_microbenchmarks._interpolateCrossover(0.01, 2.0, 0.1, 0.5),
+            math.sqrt(0.01 * 0.1)
+    )
+    # Linear in the selectivity if it starts at zero.
+    assert math.isclose(
+            dias_microbenchmarks._interpolateCrossover(0.0, 2.0, 0.1, 0.5),
+            0.05
+    )
+    # The speedup reaches 1 exactly at a measured selectivity.
+    assert math.isclose(
+            dias_microbenchmarks._interpolateCrossover(0.01, 2.0, 0.1, 1.0),
+            0.1
+    )
+
+
+def test_findCrossovers():
+    sels = [0.001, 0.01, 0.1, 1.0]
+    speedupsByClass = {
+        "uncompressed": [1.0, 1.0, 1.0, 1.0],
+        "crossing": [3.0, 2.0, 0.5, 0.25],
+        "always": [3.0, 2.0, 1.5, 1.1],
+        "never": [0.9, 0.8, 0.7, 0.6],
+        "unreferenced": [float("nan")] * 4,
+    }
+    dfSweep = pd.DataFrame([
+        dict(
+                vector_extension="avx512", operator_class=operatorClass,
+                sel=sel, speedup=speedup
+        )
+        for operatorClass, speedups in speedupsByClass.items()
+        for sel, speedup in zip(sels, speedups)
+    ])
+
+    dfCrossovers = dias_microbenchmarks.findCrossovers(dfSweep).set_index(
+            "operator_class"
+    )
+
+    assert dfCrossovers.index.tolist() == [
+        "crossing", "always", "never", "unreferenced",
+    ]
+    assert dfCrossovers["status"].tolist() == [
+        "crossover", "always faster", "never faster", "no reference",
+    ]
+    assert math.isclose(
+            dfCrossovers.loc["crossing", "crossover sel"], math.sqrt(0.01 * 0.1)
+    )
+    assert dfCrossovers["crossover sel"].drop("crossing").isna().all()
+    assert dfCrossovers.loc["always", "speedup at sel max"] == 1.1
+    assert math.isnan(dfCrossovers.loc["unreferenced", "sel min"])
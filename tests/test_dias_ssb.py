@@ -0,0 +1,147 @@
+import pandas as pd
+import pytest
+
+# The diagram generation requires MorphStore's benchmark tools.
+pytest.importorskip("mal2morphstore.compr")
+pytest.importorskip("csvutils")
+
+import dias_ssb
+
+
+@pytest.fixture
+def timings(tmp_path, monkeypatch):
+    """A run of two strategies and two queries in at most three repetitions."""
+
+    monkeypatch.setattr(dias_ssb, "pathTimesMorphStore", str(tmp_path), raising=False)
+    monkeypatch.setattr(dias_ssb, "countReps", 3, raising=False)
+    monkeypatch.setattr(dias_ssb, "queries", ["1.1", "2.1"], raising=False)
+    monkeypatch.setattr(dias_ssb, "comprStrategiesFss", ["Uncompr"], raising=False)
+    monkeypatch.setattr(dias_ssb, "processingStyle", "avx512", raising=False)
+    monkeypatch.setattr(
+            dias_ssb, "psNames", {"avx512": "avx512", "scalar": "scalar"},
+            raising=False
+    )
+    monkeypatch.setattr(dias_ssb.pss, "PS_SCALAR", "scalar")
+
+    def makeFiles(countRepsByCs):
+        for cs, countReps in countRepsByCs.items():
+            for repIdx in range(1, countReps + 1):
+                pathDir = tmp_path / "{}_{}".format(cs, repIdx)
+                pathDir.mkdir()
+                for q in ["1.1", "2.1"]:
+                    (pathDir / "q{}.csv".format(q)).write_text("")
+    return tmp_path, makeFiles
+
+
+def _countRepsByCs(tasks):
+    countRepsByCs = dict()
+    for filePath, q, ps, cs, allOperators in tasks:
+        countRepsByCs[cs] = countRepsByCs.get(cs, 0) + 1
+    return {cs: count // 2 for cs, count in countRepsByCs.items()}
+
+
+def test_tasksRuntimesMorphStore_skipsRecordedEarlyStops(timings):
+    pathTimes, makeFiles = timings
+    makeFiles({"Uncompr": 2, "UncomprScalar": 3})
+    (pathTimes / "repetitions.csv").write_text(
+            "key\trepetitions\treason\tmaxRelHalfWidth\n"
+            "Uncompr\t2\tstable\t0.01\n"
+            "UncomprScalar\t3\tmax\t0.05\n"
+    )
+
+    tasks = dias_ssb._tasksRuntimesMorphStore(False)
+
+    assert _countRepsByCs(tasks) == {"Uncompr": 2, "UncomprScalar": 3}
+
+
+def test_tasksRuntimesMorphStore_raisesOnMissingRepetition(timings):
+    pathTimes, makeFiles = timings
+    # The log says three repetitions of Uncompr, but only two exist.
+    makeFiles({"Uncompr": 2, "UncomprScalar": 3})
+    (pathTimes / "repetitions.csv").write_text(
+            "key\trepetitions\treason\tmaxRelHalfWidth\n"
+            "Uncompr\t3\tmax\t0.01\n"
+            "UncomprScalar\t3\tmax\t0.05\n"
+    )
+
+    with pytest.raises(RuntimeError):
+        dias_ssb._tasksRuntimesMorphStore(False)
+
+
+def test_tasksRuntimesMorphStore_raisesWithoutLog(timings):
+    pathTimes, makeFiles = timings
+    makeFiles({"Uncompr": 3, "UncomprScalar": 2})
+
+    with pytest.raises(RuntimeError):
+        dias_ssb._tasksRuntimesMorphStore(False)
+
+
+def test_tasksRuntimesMorphStore_raisesOnMissingFirstRepetition(timings):
+    pathTimes, makeFiles = timings
+    makeFiles({"UncomprScalar": 3})
+    (pathTimes / "repetitions.csv").write_text(
+            "key\trepetitions\treason\tmaxRelHalfWidth\n"
+            "UncomprScalar\t3\tmax\t0.05\n"
+    )
+
+    with pytest.raises(RuntimeError):
+        dias_ssb._tasksRuntimesMorphStore(False)
+
+
+@pytest.fixture
+def twoScaleFactors(tmp_path, monkeypatch):
+    """Data characteristics of one query at two scale factors and a cache."""
+
+    monkeypatch.setattr(dias_ssb, "pathArtifacts", str(tmp_path), raising=False)
+    for name in [
+        "scaleFactor", "pathTimesMorphStore", "pathTimesMonetDB", "pathDataCh",
+        "pathSizes", "pathDias", "pathBest", "pathWorst", "pathExport",
+        "pathOperators", "pathRoofline",
+    ]:
+        monkeypatch.setattr(dias_ssb, name, None, raising=False)
+    monkeypatch.setattr(dias_ssb, "processingStyle", "avx512", raising=False)
+    monkeypatch.setattr(dias_ssb, "psNames", {"avx512": "AVX-512"}, raising=False)
+    monkeypatch.setattr(
+            dias_ssb, "chooseParams", {"Uncompr": dict(strategy="uncompr")},
+            raising=False
+    )
+    monkeypatch.setattr(dias_ssb.cache, "useCache", True)
+    monkeypatch.setattr(dias_ssb.cache, "pathCache", str(tmp_path / "cache"))
+
+    countValuesCol = dias_ssb.csvutils.ColInfoCols.countValues
+    for sf in [1, 10]:
+        pathDataCh = tmp_path / "dc_sf{}".format(sf)
+        pathDataCh.mkdir()
+        (pathDataCh / "q1.1.csv").write_text(str(sf))
+
+    def getColInfos(filePath):
+        # The number of data elements is the contents of the file.
+        with open(filePath) as f:
+            countValues = int(f.read())
+        return pd.DataFrame(
+                {countValuesCol: [countValues]},
+                index=pd.Index(["lo_quantity"], name="colName")
+        )
+    monkeypatch.setattr(dias_ssb.csvutils, "getColInfos", getColInfos)
+
+    calls = []
+    def choose(dfColInfos, processingStyle, **kwargs):
+        calls.append(int(dfColInfos[countValuesCol].iloc[0]))
+        return pd.Series(
+                ["fmt_sf{}".format(calls[-1])],
+                index=pd.Index(["lo_quantity"], name="colName")
+        )
+    monkeypatch.setattr(dias_ssb.compr, "choose", choose)
+    return calls
+
+
+def test_chooseFormats_memoizesEachScaleFactor(twoScaleFactors):
+    calls = twoScaleFactors
+
+    formats = []
+    for sf in [1, 10, 1, 10]:
+        dias_ssb._setScaleFactor(sf)
+        formats.append(dias_ssb._chooseFormats("1.1", "Uncompr")["format"][0])
+
+    assert formats == ["fmt_sf1", "fmt_sf10", "fmt_sf1", "fmt_sf10"]
+    assert calls == [1, 10]
@@ -0,0 +1,35 @@
+import pandas as pd
+
+import formatstrings
+
+
+def test_categorize_converts_format_columns():
+    df = pd.DataFrame({
+        "in_data_f": ["uncompr_f", "static_vbp_f<vbp_l<3, 8> >", "uncompr_f"],
+        "formatWithBw": ["uncompr_f", "dynamic_vbp_f<512, 64, 8>", "uncompr_f"],
+        "runtime:µs": [1, 2, 3],
+        "operator_class": ["a", "b", "a"],
+    })
+
+    formatstrings.categorize(df)
+
+    assert df["in_data_f"].dtype == "category"
+    assert df["formatWithBw"].dtype == "category"
+    assert df["runtime:µs"].dtype != "category"
+    assert df["operator_class"].dtype != "category"
+
+
+def test_categorize_keeps_categoricals():
+    df = pd.DataFrame({"in_data_f": pd.Categorical(["uncompr_f"])})
+
+    formatstrings.categorize(df)
+
+    assert df["in_data_f"].dtype == "category"
+
+
+def test_parse_cascade():
+    fmt = formatstrings.parse("delta_f<1024, 8, dynamic_vbp_f<512, 64, 8> >")
+
+    assert fmt.components == ("delta", "dynamic_vbp")
+    assert (fmt.blockSize, fmt.step) == (1024, 8)
+    assert fmt.inner.blockSize == 512
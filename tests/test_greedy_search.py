@@ -0,0 +1,100 @@
+import os
+
+import pandas as pd
+import pytest
+
+import datachars
+import greedy_search
+
+
+_pathSsb = os.path.join(
+        os.path.dirname(os.path.dirname(greedy_search.__file__)),
+        "artifacts_original", "ssb"
+)
+
+
+def test_candidateFormats():
+    assert greedy_search.candidateFormats(4, True) == [
+        "static_vbp_4", "static_vbp_8",
+    ]
+    assert greedy_search.candidateFormats(17, False) == [
+        "static_vbp_17", "static_vbp_18", "static_vbp_24", "static_vbp_32",
+        "dynamic_vbp", "delta+dynamic_vbp", "for+dynamic_vbp",
+    ]
+
+
+def test_search_replaysArchive():
+    pathBest = os.path.join(_pathSsb, "ssb_formats_bestperf_sf100")
+    runtimesFilePath = os.path.join(pathBest, "q1.1_runtimes.csv")
+    columns = greedy_search.getColumns(datachars.load(
+            os.path.join(_pathSsb, "dc_sf100", "q1.1.csv")
+    ))
+    # The archived search tried the base columns in another order.
+    order = list(pd.read_csv(runtimesFilePath, sep="\t")["colName"].unique())
+    columns.sort(
+            key=lambda col: order.index(col[0]) if col[0] in order else len(order)
+    )
+    runtimes = greedy_search.readRuntimes(runtimesFilePath)
+
+    assert set(runtimes) == set(greedy_search.getEvaluations(columns, 3))
+
+    def measure(formats, repIdxs):
+        raise AssertionError("all runtimes are in the archive")
+
+    formats = greedy_search.search(columns, 3, measure, runtimes)
+    dfOut = pd.read_csv(os.path.join(pathBest, "q1.1.csv"), sep="\t")
+    assert formats == dict(zip(dfOut["colName"], dfOut["format"]))
+
+
+def test_search_resumes(tmp_path):
+    filePath = str(tmp_path / "q1.1_runtimes.csv")
+    columns = [
+        ("a", ["static_vbp_8"]),
+        ("C_1", None),
+        ("b", ["static_vbp_8", "dynamic_vbp"]),
+    ]
+    runtimeByFormat = {"uncompr": 100, "static_vbp_8": 90, "dynamic_vbp": 80}
+
+    measured = []
+    countMax = [4]
+    def measure(formats, repIdxs):
+        for repIdx in repIdxs:
+            measured.append((formats["a"], formats["b"], repIdx))
+            if len(measured) == countMax[0]:
+                raise RuntimeError("interrupted")
+            yield runtimeByFormat[formats["b"]] - (formats["a"] != "uncompr")
+
+    def search():
+        return greedy_search.search(
+                columns, 2, measure, greedy_search.readRuntimes(filePath),
+                record=lambda *row: greedy_search.appendRuntime(filePath, *row)
+        )
+
+    # An interrupted search keeps the runtimes measured before.
+    with pytest.raises(RuntimeError):
+        search()
+    assert measured == [
+        ("uncompr", "uncompr", 1), ("uncompr", "uncompr", 2),
+        ("static_vbp_8", "uncompr", 1), ("static_vbp_8", "uncompr", 2),
+    ]
+    assert len(greedy_search.readRuntimes(filePath)) == 3
+
+    # The search resumes with the first repetition not measured yet.
+    del measured[:]
+    countMax[0] = None
+    assert search() == {
+        "a": "static_vbp_8", "C_1": "uncompr", "b": "dynamic_vbp",
+    }
+    assert measured == [
+        ("static_vbp_8", "uncompr", 2),
+        ("static_vbp_8", "static_vbp_8", 1),
+        ("static_vbp_8", "static_vbp_8", 2),
+        ("static_vbp_8", "dynamic_vbp", 1),
+        ("static_vbp_8", "dynamic_vbp", 2),
+    ]
+    assert len(greedy_search.readRuntimes(filePath)) == 8
+
+    # Nothing is measured again once the search is complete.
+    del measured[:]
+    search()
+    assert measured == []
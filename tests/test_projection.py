@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+import projection
+
+
+def test_fitScaling_recoversExponent():
+    df = pd.DataFrame([
+        dict(col=col, sf=sf, size=coefficient * sf ** exponent)
+        for col, coefficient, exponent in [("a", 3.0, 1.2), ("b", 8.0, 1.0)]
+        for sf in [1, 10, 30, 100]
+        for _ in range(2)
+    ])
+
+    dfModels = projection.fitScaling(df, ["col"], "size").set_index("col")
+
+    assert np.allclose(dfModels["exponent"], [1.2, 1.0])
+    assert np.allclose(dfModels["coefficient"], [3.0, 8.0])
+    assert (dfModels["countSf"] == 4).all()
+
+
+def test_fitScaling_fewScaleFactors():
+    df = pd.DataFrame([
+        dict(col="a", sf=10, size=50.0),
+        dict(col="b", sf=1, size=2.0),
+        dict(col="b", sf=10, size=40.0),
+    ])
+
+    dfModels = projection.fitScaling(df, ["col"], "size")
+    dfPred = projection.predict(dfModels, ["col"], [100], "size")
+
+    # A single scale factor means linear scaling, two allow no bounds.
+    assert np.allclose(dfPred["size"], [500.0, 2.0 * 100 ** np.log10(20)])
+    assert dfPred["size low"].isna().all()
+    assert dfPred["size high"].isna().all()
+
+
+def test_predict_intervalContainsTruth():
+    rng = np.random.default_rng(42)
+    scaleFactors = [1, 3, 10, 30]
+    exponents = rng.uniform(0.9, 1.3, 200)
+    def measure(sf, exponent):
+        return 100 * sf ** exponent * rng.lognormal(0, 0.05)
+
+    df = pd.DataFrame([
+        dict(col=col, sf=sf, runtime=measure(sf, exponent))
+        for col, exponent in enumerate(exponents)
+        for sf in scaleFactors
+    ])
+
+    dfModels = projection.fitScaling(df, ["col"], "runtime")
+    dfPred = projection.predict(dfModels, ["col"], [100], "runtime", 0.95)
+    truth = np.array([measure(100, exponent) for exponent in exponents])
+
+    isCovered = \
+            (dfPred["runtime low"] <= truth) & (truth <= dfPred["runtime high"])
+    # About 95% of the intervals contain a measurement at the new scale factor.
+    assert 0.9 <= isCovered.mean() <= 0.99
+    assert (dfPred["runtime low"] < dfPred["runtime"]).all()
+    assert (dfPred["runtime"] < dfPred["runtime high"]).all()
@@ -0,0 +1,65 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import repetitions
+
+
+def test_readLog(tmp_path):
+    filePath = tmp_path / "repetitions.csv"
+    filePath.write_text(
+            "key\trepetitions\treason\tmaxRelHalfWidth\n"
+            "ActualBestPerf\t3\tstable\t0.01\n"
+            "Uncompr\t10\tmax\t0.05\n"
+    )
+
+    assert repetitions.readLog(str(filePath)) == {
+        "ActualBestPerf": 3, "Uncompr": 10,
+    }
+
+
+def test_readLog_missing(tmp_path):
+    assert repetitions.readLog(str(tmp_path / "repetitions.csv")) == {}
+
+
+_pathScript = os.path.join(os.path.dirname(repetitions.__file__), "repetitions.py")
+_pathTimes = os.path.join(
+        os.path.dirname(os.path.dirname(repetitions.__file__)),
+        "artifacts_original", "ssb", "times_MorphStore_sf100"
+)
+
+
+def _run(tmp_path, *args):
+    for repIdx in [1, 2]:
+        shutil.copytree(
+                os.path.join(_pathTimes, "Uncompr_{}".format(repIdx)),
+                str(tmp_path / "Uncompr_{}".format(repIdx))
+        )
+    return subprocess.run(
+            [
+                sys.executable, _pathScript,
+                "--pathTime", str(tmp_path / "Uncompr"), "-q", "1.1", "2.1",
+                "--min", "2", "--max", "10", "--log", str(tmp_path / "log.csv"),
+            ] + list(args),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    ).returncode
+
+
+def test_exitStatus_stop(tmp_path):
+    assert _run(tmp_path, "-n", "2", "--ciWidth", "1") == repetitions.EXIT_STOP
+    assert repetitions.readLog(str(tmp_path / "log.csv")) == {"Uncompr": 2}
+
+
+def test_exitStatus_continue(tmp_path):
+    assert _run(tmp_path, "-n", "2", "--ciWidth", "0") == repetitions.EXIT_CONTINUE
+    assert not (tmp_path / "log.csv").exists()
+
+
+def test_exitStatus_failure(tmp_path):
+    # The third repetition does not exist.
+    status = _run(tmp_path, "-n", "3")
+    assert status not in [repetitions.EXIT_STOP, repetitions.EXIT_CONTINUE]
+    # An invalid argument.
+    status = _run(tmp_path / "other", "-n", "two")
+    assert status not in [repetitions.EXIT_STOP, repetitions.EXIT_CONTINUE]
@@ -0,0 +1,66 @@
+import zlib
+
+import pandas as pd
+import pytest
+
+# The size estimation requires MorphStore's benchmark tools.
+pytest.importorskip("mal2morphstore.processingstyles")
+
+import sizes
+
+
+def _sizes(colNames, formatWithBw, overhead):
+    rows = []
+    for idx, colName in enumerate(colNames):
+        valueCount = 100000 * (idx + 1)
+        valueCountCompr = valueCount - 100
+        sizeComprByte = valueCountCompr * (idx + 1) // 8
+        rows.append(dict(
+            colName=colName,
+            formatWithBw=formatWithBw,
+            valueCount=valueCount,
+            valueCountCompr=valueCountCompr,
+            sizeUsedByte=sizeComprByte + 100 * 8 + overhead,
+            sizeComprByte=sizeComprByte,
+        ))
+    return pd.DataFrame(rows)
+
+
+def test_fitOverheads_fromLayout():
+    dfMea = pd.concat([
+        _sizes(["X_1", "X_2"], "dynamic_vbp_f<512, 64, 8>", 8320),
+        _sizes(
+                ["X_1", "X_2", "X_3"],
+                "delta_f<1024, 8, dynamic_vbp_f<512, 64, 8> >", 16640
+        ),
+        _sizes(["X_1"], "for_f<1024, 8, dynamic_vbp_f<512, 64, 8> >", 16768),
+    ], ignore_index=True)
+
+    assert sizes.fitOverheads(dfMea) == {
+        "dynamic_vbp": 8320, "delta": 16640, "for": 16768,
+    }
+
+
+def test_crossValidate_outOfSample():
+    formatWithBw = "dynamic_vbp_f<512, 64, 8>"
+    colNames = ["X_{}".format(idx) for idx in range(20)]
+    dfMea = _sizes(colNames, formatWithBw, 8320)
+    # Each column has its own overhead, so a column's fitted overhead reveals
+    # whether the column itself was used for fitting.
+    dfMea["sizeUsedByte"] += range(len(colNames))
+    dfEst = dfMea.copy()
+    dfEst["sizeUsedByte"] -= dfMea["sizeUsedByte"] - dfMea["sizeComprByte"]
+
+    dfOut = sizes.crossValidate(dfEst, dfMea)
+    sFold = dfOut["colName"].map(
+            lambda colName: zlib.crc32(colName.encode()) % 2
+    )
+    sOverhead = dfOut["sizeUsedByte"] - dfEst["sizeUsedByte"]
+
+    assert dfOut.index.tolist() == dfEst.index.tolist()
+    for fold in range(2):
+        dfOther = dfMea[sFold != fold]
+        overheadOther = round((
+                dfOther["sizeUsedByte"] - dfOther["sizeComprByte"] - 100 * 8
+        ).median())
+        assert (sOverhead[sFold == fold] == overheadOther).all()
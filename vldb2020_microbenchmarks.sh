@@ -105,7 +105,12 @@ function visualize () {
         local argOnly="--onlySimpleQuery"
     fi
 
-    scripts/dias_microbenchmarks.py -ps $processingStyle -r $repetitions $argOnly
+    if [[ $force ]]
+    then
+        local argForce="--force"
+    fi
+
+    scripts/dias_microbenchmarks.py -ps $processingStyle -r $repetitions $argOnly $argForce
 
     set +e
 
@@ -162,6 +167,7 @@ repetitions=10
 useExample="1"
 useSingleOp="1"
 useSimpleQuery="1"
+force=""
 
 # -----------------------------------------------------------------------------
 # Parsing
@@ -216,6 +222,9 @@ do
             useExample=""
             useSingleOp=""
             ;;
+        -f|--force)
+            force="1"
+            ;;
         *)
             printf "unknown option: $key\n"
             exit -1
@@ -20,15 +20,54 @@ function print_headline2 () {
     printf "\n"
 }
 
+# Prints a hash of the sources of MorphStore (including uncommitted changes).
+function sources_hash () {
+    (cd $pathRoot && git submodule foreach --quiet --recursive "git rev-parse HEAD; git diff HEAD") \
+        | sha1sum | cut -d " " -f 1
+}
+
+# Executes the given function, which is (a part of) a step, unless the step
+# with the given name is up to date according to its manifest (see
+# scripts/manifest.py), or --force is given. The step's parameters (KEY=VALUE),
+# inputs, and outputs must be set in the arrays manifestParams,
+# manifestInputs, manifestOutputs, and manifestExisting before. Afterwards,
+# manifestStatus tells whether the step was up to date (0), had a stale
+# manifest (1), or had none (2).
+function cached () {
+    local name=$1
+    local fn=$2
+    local manifestArgs=(
+        $name
+        --pathManifests $pathManifests
+        --params "${manifestParams[@]}"
+        --inputs "${manifestInputs[@]}"
+        --outputs "${manifestOutputs[@]}"
+        --existing "${manifestExisting[@]}"
+    )
+
+    manifestStatus=1
+    if [[ ! $force ]]
+    then
+        manifestStatus=0
+        $manifest check "${manifestArgs[@]}" || manifestStatus=$?
+        if [[ $manifestStatus -eq 0 ]]
+        then
+            printf "\n$name is up to date, skipping it (use --force to execute it anyway)\n"
+            return 0
+        fi
+    fi
+
+    # An interrupted step shall not be up to date.
+    $manifest invalidate "${manifestArgs[@]}"
+    $fn
+    $manifest write "${manifestArgs[@]}"
+}
+
 #******************************************************************************
 # Functions for the individual steps
 #******************************************************************************
 
-function setup () {
-    print_headline1 "Setup Step"
-
-    set -e
-
+function setup_dbgen () {
     print_headline2 "Downloading and compiling the SSB data generator"
     
     # TODO Clone or submodule?
@@ -37,28 +76,49 @@ function setup () {
     cd $pathDBGen
     make -j8
     cd $pathRoot
+}
 
-    if [[ $useMonetDB ]]
-    then
-        print_headline2 "Downloading and compiling MonetDB"
+function setup_monetdb () {
+    print_headline2 "Downloading and compiling MonetDB"
 
-        mkdir $pathMonetDB
-        cd $pathMonetDB
+    mkdir $pathMonetDB
+    cd $pathMonetDB
 
-        wget https://www.monetdb.org/downloads/sources/archive/MonetDB-11.31.13.tar.bz2
-        tar -xvjf MonetDB-11.31.13.tar.bz2
+    wget https://www.monetdb.org/downloads/sources/archive/MonetDB-11.31.13.tar.bz2
+    tar -xvjf MonetDB-11.31.13.tar.bz2
 
-        mkdir --parents $pathMonetDBInstalled
-        cd MonetDB-11.31.13/
-        ./configure --prefix=$pathMonetDBInstalled --enable-optimize
-        make -j8
-        make install
+    mkdir --parents $pathMonetDBInstalled
+    cd MonetDB-11.31.13/
+    ./configure --prefix=$pathMonetDBInstalled --enable-optimize
+    make -j8
+    make install
 
-        cd $pathRoot
+    cd $pathRoot
+
+    printf "user=monetdb\npassword=monetdb" > $pathDotMonetDBFile
+
+    eval $monetdbd create $pathMonetDBFarm
+}
+
+function setup () {
+    print_headline1 "Setup Step"
+
+    set -e
 
-        printf "user=monetdb\npassword=monetdb" > $pathDotMonetDBFile
+    manifestParams=()
+    manifestInputs=()
+    manifestOutputs=($pathDBGen/dbgen)
+    manifestExisting=()
+    cached setup_dbgen setup_dbgen
 
-        eval $monetdbd create $pathMonetDBFarm
+    if [[ $useMonetDB ]]
+    then
+        # MonetDB modifies its installation and database farm when running.
+        manifestParams=(version=MonetDB-11.31.13)
+        manifestInputs=()
+        manifestOutputs=()
+        manifestExisting=($monetdbd $pathMonetDBFarm $pathDotMonetDBFile)
+        cached setup_monetdb setup_monetdb
     fi
 
     set +e
@@ -66,44 +126,106 @@ function setup () {
     print_headline1 "Done"
 }
 
-function calibrate () {
-    print_headline1 "Calibration Step"
-
-    set -e
-
+function calibrate_profiles () {
     mkdir --parents $pathProfiles
 
     cd $pathEngine
 
     ./build.sh -noSelfManaging -hi ${psFlagMap[$processingStyle]} -mon -bCa -j4
 
-    # TODO These should be limited to only the selected processing style.
-    build/src/calibration/bw_prof      $repetitions > $pathProfiles/bw_prof_alone.csv
-    build/src/calibration/bw_prof_casc $repetitions > $pathProfiles/bw_prof_casc.csv
-    build/src/calibration/const_prof   $repetitions > $pathProfiles/const_prof_casc.csv
+    # The bit width profiles are calibrated only for the sampled bit widths
+    # (see scripts/calibration.py), all profiles only for the selected
+    # processing style (and the uncompressed baseline).
+    local calibration="$pathRoot/scripts/calibration.py -r $repetitions -ps $processingStyle -t $calibrationTolerance"
+    $calibration --measure build/src/calibration/bw_prof      > $pathProfiles/bw_prof_alone.csv
+    $calibration --measure build/src/calibration/bw_prof_casc > $pathProfiles/bw_prof_casc.csv
+    build/src/calibration/const_prof   $repetitions "$processingStyle" > $pathProfiles/const_prof_casc.csv
     build/src/calibration/uncompr      $repetitions > $pathProfiles/uncompr.csv
 
     cd $pathRoot
+}
+
+function calibrate () {
+    print_headline1 "Calibration Step"
+
+    set -e
+
+    manifestParams=(processingStyle=$processingStyle repetitions=$repetitions calibrationTolerance=$calibrationTolerance sources=$(sources_hash))
+    manifestInputs=()
+    manifestOutputs=($pathProfiles)
+    manifestExisting=()
+    cached calibrate calibrate_profiles
 
     set +e
 
     print_headline1 "Done"
 }
 
-function generate () {
-    print_headline1 "Generation Step"
-
-    set -e
+# Generates the SSB base data and dictionary-codes it without landing the raw
+# .tbl-files on disk. Each table's .tbl-file is a named pipe, which a dbgen
+# process generating only this table writes to while dbdict reads from it.
+# Thus, the tables are generated in parallel and flow into the dictionary
+# coding as they are read, such that the peak disk usage stays close to the
+# size of the final data.
+function generate_streaming () {
+    declare -A pidByTable=()
+    local table
+    for table in "${!dbgenTableMap[@]}"
+    do
+        rm -f $pathDBGen/$table.tbl
+        mkfifo $pathDBGen/$table.tbl
+        # dbgen opens the named pipe for writing, which blocks until dbdict
+        # opens it for reading.
+        (cd $pathDBGen && exec ./dbgen -f -s $scaleFactor -T ${dbgenTableMap[$table]}) &
+        pidByTable[$table]=$!
+    done
 
-    print_headline2 "SSB data generation"
-    cd $pathDBGen
-    ./dbgen -f -s $scaleFactor -T a
-    cd $pathRoot
+    # TODO Only create data for MorphStore if requested.
+    local statusDict=0
+    eval $dbdict $schemaFullFile $schemaRequiredFile $pathDBGen $pathData || statusDict=$?
+
+    # dbgen processes still waiting for a reader belong to tables dbdict does
+    # not need, all others must have succeeded.
+    local statusGen=0
+    for table in "${!pidByTable[@]}"
+    do
+        local pid=${pidByTable[$table]}
+        if kill -0 $pid 2> /dev/null
+        then
+            kill $pid 2> /dev/null || true
+            wait $pid 2> /dev/null || true
+        elif ! wait $pid
+        then
+            printf "generating the table $table failed\n"
+            statusGen=1
+        fi
+    done
+
+    if [[ $statusDict -ne 0 ]] || [[ $statusGen -ne 0 ]]
+    then
+        printf "streaming the data generation failed, consider using --materializeTbls\n"
+        return 1
+    fi
+}
 
-    print_headline2 "SSB data dictionary coding"
+function generate_data () {
     mkdir --parents $pathData
-    # TODO Only create data for MorphStore if requested.
-    eval $dbdict $schemaFullFile $schemaRequiredFile $pathDBGen $pathData
+    if [[ $materializeTbls ]]
+    then
+        print_headline2 "SSB data generation"
+        cd $pathDBGen
+        # Remove named pipes left over by a failed streaming generation.
+        rm -f *.tbl
+        ./dbgen -f -s $scaleFactor -T a
+        cd $pathRoot
+
+        print_headline2 "SSB data dictionary coding"
+        # TODO Only create data for MorphStore if requested.
+        eval $dbdict $schemaFullFile $schemaRequiredFile $pathDBGen $pathData
+    else
+        print_headline2 "SSB data generation and dictionary coding (streaming)"
+        generate_streaming
+    fi
 
     print_headline2 "Deleting original .tbl-files"
     rm -f $pathDBGen/*.tbl
@@ -128,25 +250,82 @@ function generate () {
 
     print_headline2 "Deleting dictionary-encoded .tbl-files"
     rm -rf $pathDataTblsDict
+}
+
+function generate_dc () {
+    print_headline2 "Analyzing data characteristics in MorphStore"
+    cd $pathBenchmarks/ssb
+    ./ssb.sh $generalFlags -p d -q "$queries"
+    cd $pathRoot
+}
+
+function generate_sizes () {
+    if [[ $estimateSizes ]]
+    then
+        print_headline2 "Estimating compressed data sizes from the data characteristics"
+        # Note: $queries must not be in quotation marks here.
+        scripts/sizes.py --write -sf $scaleFactor -ps $processingStyle -q $queries --pathArtifacts $pathArtifacts
+    else
+        print_headline2 "Determining compressed data sizes in MorphStore"
+        cd $pathBenchmarks/ssb
+        ./ssb.sh $generalFlags -p s -q "$queries" -ps $processingStyle
+        cd $pathRoot
+    fi
+}
+
+function generate_greedy () {
+    print_headline2 "Determining best/worst format combinations in MorphStore"
+    # The search resumes where it was interrupted, unless its inputs changed.
+    if [[ $manifestStatus -eq 1 ]]
+    then
+        local argRestart="--restart"
+    fi
+    # TODO The reference results should not be necessary here.
+    ./greedy.sh -sf $scaleFactor -r $repetitionsGreedy -ps $processingStyle -q "$queries" --findBest --findWorst --pathArtifacts $pathArtifacts --pathMal $pathMal --pathRefRes $pathRefRes $argRestart
+}
+
+function generate () {
+    print_headline1 "Generation Step"
+
+    set -e
+
+    local sources=$(sources_hash)
+
+    manifestParams=(scaleFactor=$scaleFactor useMonetDB=$useMonetDB "intTypes=$intTypes")
+    manifestInputs=($pathDBGen/dbgen $dbdict $createload $schemaFullFile $schemaRequiredFile)
+    manifestOutputs=($pathData)
+    manifestExisting=()
+    if [[ $useMonetDB ]]
+    then
+        for intType in $intTypes
+        do
+            manifestExisting+=($pathMonetDBFarm/${benchmark}_sf${scaleFactor}_${intType})
+        done
+    fi
+    cached generate_data_sf$scaleFactor generate_data
 
     if [[ $useMorphStore ]]
     then
         # TODO The reference results should not be necessary.
         local generalFlags="-mem n -um s -sf $scaleFactor -s t --pathArtifacts $pathArtifacts --pathMal $pathMal --pathRefRes $pathRefRes"
 
-        cd $pathBenchmarks/ssb
-
-        print_headline2 "Analyzing data characteristics in MorphStore"
-        ./ssb.sh $generalFlags -p d -q "$queries"
-        
-        print_headline2 "Determining compressed data sizes in MorphStore"
-        ./ssb.sh $generalFlags -p s -q "$queries" -ps $processingStyle
-
-        cd $pathRoot
-        
-        print_headline2 "Determining best/worst format combinations in MorphStore"
-        # TODO The reference results should not be necessary here.
-        ./greedy.sh -sf $scaleFactor -r $repetitionsGreedy -ps $processingStyle -q "$queries" --findBest --findWorst --pathArtifacts $pathArtifacts --pathMal $pathMal --pathRefRes $pathRefRes
+        manifestParams=("queries=$queries" sources=$sources)
+        manifestInputs=($pathData $pathMal)
+        manifestOutputs=($pathDataCh)
+        manifestExisting=()
+        cached generate_dc_sf$scaleFactor generate_dc
+
+        manifestParams=("queries=$queries" processingStyle=$processingStyle estimateSizes=$estimateSizes sources=$sources)
+        manifestInputs=($pathData $pathMal $pathDataCh)
+        manifestOutputs=($pathSizes)
+        manifestExisting=()
+        cached generate_sizes_sf$scaleFactor generate_sizes
+
+        manifestParams=("queries=$queries" processingStyle=$processingStyle repetitionsGreedy=$repetitionsGreedy sources=$sources)
+        manifestInputs=($pathData $pathMal $pathDataCh)
+        manifestOutputs=($pathBest $pathWorst)
+        manifestExisting=()
+        cached generate_greedy_sf$scaleFactor generate_greedy
     fi
 
     set +e
@@ -154,6 +333,185 @@ function generate () {
     print_headline1 "Done"
 }
 
+# Prints a hash of everything the translation and compilation of the given SSB
+# query in MorphStore with the given flags depends on: the flags, the query,
+# the sources of MorphStore (including uncommitted changes), the MAL plan and
+# data characteristics of the query, and the files configuring the format
+# selection.
+function build_hash () {
+    local flags=$1
+    local q=$2
+    local sources=$3
+    {
+        printf "%s\n" "$flags" "$q" "$sources"
+        find $pathMal $pathDataCh -name "q$q.*" -type f -exec cat {} + 2> /dev/null
+        if [[ $flags =~ -cconfig\ ([^ ]+) ]]
+        then
+            cat ${BASH_REMATCH[1]}/q$q.csv 2> /dev/null
+        fi
+        if [[ $flags =~ costbased ]]
+        then
+            find $pathProfiles -type f -exec cat {} + 2> /dev/null
+        fi
+    } | sha1sum | cut -d " " -f 1
+}
+
+# Copies the files of MorphStore tracked by git (including its submodules and
+# uncommitted changes) to the given directory, unless this was done before.
+# The builds hard-link this copy instead of copying MorphStore each. Its files
+# are read-only, such that a build cannot modify the files it shares with the
+# other builds, but only replace them.
+function build_sources () {
+    local pathSources=$1
+
+    if [[ -f $pathSources/done ]]
+    then
+        return 0
+    fi
+
+    rm -rf $pathSources
+    mkdir --parents $pathSources/MorphStore
+    (cd $pathMorphStore && git ls-files -z --recurse-submodules | xargs -0 cp -a --parents --target-directory=$pathSources/MorphStore)
+    find $pathSources/MorphStore -type f -exec chmod a-w {} +
+    touch $pathSources/done
+}
+
+# Translates and compiles the given SSB query in MorphStore with the given
+# flags in a private hard-linked copy of the given MorphStore sources in the
+# given directory, such that several builds can run in parallel and their
+# binaries can be kept until they are timed. Nothing is done if this
+# directory already holds a successful build.
+function build_query () {
+    local flags=$1
+    local q=$2
+    local pathSources=$3
+    local pathBuild=$4
+
+    if [[ -f $pathBuild/done ]]
+    then
+        return 0
+    fi
+
+    rm -rf $pathBuild
+    mkdir --parents $pathBuild
+    cp -al $pathSources/MorphStore $pathBuild/MorphStore
+    cd $pathBuild/MorphStore/Benchmarks/ssb
+    # TODO The reference results should ne be necessary here.
+    ./ssb.sh $flags -s t -e b -q "$q" --pathArtifacts $pathArtifacts --pathMal $pathMal --pathRefRes $pathRefRes > $pathBuild/build.log 2>&1
+    touch $pathBuild/done
+}
+
+# Builds and times the SSB queries in MorphStore with all compression
+# strategies. Expects the keys of the strategies, their flags, the build
+# directory of each strategy and query, and the directory of the MorphStore
+# sources in the variables of run.
+function run_morphstore () {
+    print_headline2 "SSB in MorphStore"
+
+    mkdir --parents $pathTimesMorphStore
+    # The log of the numbers of repetitions and the reasons for stopping.
+    rm -f $pathTimesMorphStore/repetitions.csv
+
+    # -------------------------------------------------------------------------
+    # Building the SSB queries in MorphStore
+    # -------------------------------------------------------------------------
+
+    # All queries of all compression strategies are built before any of them
+    # is timed, such that compilation never overlaps measurement. The builds
+    # are kept across runs, such that an unchanged build is never repeated.
+    printf "building... "
+    build_sources $pathSources
+    for key in $keys
+    do
+        for q in $queries
+        do
+            # Wait until less than the given number of builds are running.
+            while [[ $(jobs -rp | wc -l) -ge $countJobs ]]
+            do
+                wait -n || true
+            done
+            (build_query "${flagsByKey[$key]}" $q $pathSources ${pathBuildByKeyQuery[$key,$q]}) &
+        done
+    done
+    wait || true
+    for key in $keys
+    do
+        for q in $queries
+        do
+            if [[ ! -f ${pathBuildByKeyQuery[$key,$q]}/done ]]
+            then
+                printf "\nbuilding q$q of $key failed, see ${pathBuildByKeyQuery[$key,$q]}/build.log\n"
+                exit -1
+            fi
+        done
+    done
+    printf "done.\n"
+
+    # -------------------------------------------------------------------------
+    # Execution of the SSB in MorphStore
+    # -------------------------------------------------------------------------
+
+    for key in $keys
+    do
+        local flags=${flagsByKey[$key]}
+
+        printf "$key\n"
+
+        printf "\trunning... "
+        for i in $(seq $repetitions)
+        do
+            # Each query is executed in its own build.
+            for q in $queries
+            do
+                cd ${pathBuildByKeyQuery[$key,$q]}/MorphStore/Benchmarks/ssb
+                # TODO The reference results should ne be necessary here.
+                ./ssb.sh $flags -s r -q "$q" --pathArtifacts $pathArtifacts --pathRefRes $pathRefRes --pathTime $pathTimesMorphStore/${key}_$i > /dev/null 2> /dev/null
+            done
+            printf "$i "
+            # Stop early if the runtimes are stable enough. The reason is
+            # recorded alongside the timings. The exit status is 0 for
+            # stopping, 3 for continuing, and anything else for a failure.
+            # Note: $queries must not be in quotation marks here.
+            local statusReps=0
+            $pathRoot/scripts/repetitions.py --pathTime $pathTimesMorphStore/$key -q $queries -n $i --min $minRepetitions --max $repetitions --ciWidth $ciWidth --log $pathTimesMorphStore/repetitions.csv || statusReps=$?
+            if [[ $statusReps -eq 0 ]]
+            then
+                break
+            elif [[ $statusReps -ne 3 ]]
+            then
+                printf "\ndeciding on further repetitions of $key failed (exit status $statusReps)\n"
+                exit -1
+            fi
+        done
+        # Remove the timings of further repetitions of a previous run, such
+        # that they are not mixed with the ones of this run.
+        for j in $(seq $((i + 1)) $repetitions)
+        do
+            rm -rf $pathTimesMorphStore/${key}_$j
+        done
+        printf "done.\n"
+    done
+
+    cd $pathRoot
+}
+
+function run_monetdb () {
+    print_headline2 "SSB in MonetDB"
+
+    mkdir --parents $pathTimesMonetDB
+
+    cd $pathBenchmarks/ssb
+
+    for intType in $intTypes
+    do
+        # We execute two extra repetitions, because we need to discard the
+        # first two repetitions for a warm start.
+        ./monetdb_ssb.sh -sf $scaleFactor -q "$queries" -r $((repetitions + 2)) -t $intType --pathMonetDB $pathMonetDBInstalled --pathMonetDBFarm $pathMonetDBFarm --pathMorphStore $pathMorphStore --pathData $pathData > $pathTimesMonetDB/${intType}.csv #2> /dev/null
+    done
+
+    cd $pathRoot
+}
+
 function run () {
     print_headline1 "Running Step"
 
@@ -161,12 +519,6 @@ function run () {
 
     if [[ $useMorphStore ]]
     then
-        print_headline2 "SSB in MorphStore"
-
-        mkdir --parents $pathTimesMorphStore
-
-        cd $pathBenchmarks/ssb
-
         # ---------------------------------------------------------------------
         # Flags for calling MorphStore's SSB-script
         # ---------------------------------------------------------------------
@@ -202,10 +554,12 @@ function run () {
         local keys="$keys $keyActualWorstPerf"
         local keys="$keys $keyCostBasedBestPerf"
 
-        # ---------------------------------------------------------------------
-        # Execution of the SSB in MorphStore
-        # ---------------------------------------------------------------------
-
+        # Each query of each strategy is built separately, keyed by a hash of
+        # its inputs, in a hard-linked copy of the same MorphStore sources.
+        local sources=$(sources_hash)
+        local pathSources=$pathBuilds/sources_$sources
+        declare -A flagsByKey
+        declare -A pathBuildByKeyQuery
         for key in $keys
         do
             if [[ $key = $keyUncomprScalar ]]
@@ -214,44 +568,31 @@ function run () {
             else
                 processingStyleUse=$processingStyle
             fi
-            local flags="$generalFlags ${comprFlags[$key]} -ps $processingStyleUse"
-
-            printf "$key\n"
-
-            printf "\tbuilding... "
-            # TODO The reference results should ne be necessary here.
-            ./ssb.sh $flags -s t -e b -q "$queries" --pathArtifacts $pathArtifacts --pathMal $pathMal --pathRefRes $pathRefRes > /dev/null 2> /dev/null
-            printf "done.\n"
-
-            printf "\trunning... "
-            for i in $(seq $repetitions)
+            flagsByKey[$key]="$generalFlags ${comprFlags[$key]} -ps $processingStyleUse"
+            for q in $queries
             do
-                # TODO The reference results should ne be necessary here.
-                ./ssb.sh $flags -s r -q "$queries" --pathArtifacts $pathArtifacts --pathRefRes $pathRefRes --pathTime $pathTimesMorphStore/${key}_$i > /dev/null 2> /dev/null
-                printf "$i "
+                pathBuildByKeyQuery[$key,$q]=$pathBuilds/$(build_hash "${flagsByKey[$key]}" $q $sources)
             done
-            printf "done.\n"
         done
 
-        cd $pathRoot
+        manifestParams=(scaleFactor=$scaleFactor "queries=$queries" repetitions=$repetitions minRepetitions=$minRepetitions ciWidth=$ciWidth)
+        for key in $keys
+        do
+            manifestParams+=("build$key=$(for q in $queries; do printf "%s\n" ${pathBuildByKeyQuery[$key,$q]##*/}; done | sha1sum | cut -d " " -f 1)")
+        done
+        manifestInputs=($pathData)
+        manifestOutputs=($pathTimesMorphStore)
+        manifestExisting=()
+        cached run_MorphStore_sf$scaleFactor run_morphstore
     fi
     
     if [[ $useMonetDB ]]
     then
-        print_headline2 "SSB in MonetDB"
-
-        mkdir --parents $pathTimesMonetDB
-
-        cd $pathBenchmarks/ssb
-
-        for intType in $intTypes
-        do
-            # We execute two extra repetitions, because we need to discard the
-            # first two repetitions for a warm start.
-            ./monetdb_ssb.sh -sf $scaleFactor -q "$queries" -r $((repetitions + 2)) -t $intType --pathMonetDB $pathMonetDBInstalled --pathMonetDBFarm $pathMonetDBFarm --pathMorphStore $pathMorphStore --pathData $pathData > $pathTimesMonetDB/${intType}.csv #2> /dev/null
-        done
-
-        cd $pathRoot
+        manifestParams=("queries=$queries" repetitions=$repetitions "intTypes=$intTypes" sources=$(sources_hash))
+        manifestInputs=($pathManifests/generate_data_sf$scaleFactor.json)
+        manifestOutputs=($pathTimesMonetDB)
+        manifestExisting=()
+        cached run_MonetDB_sf$scaleFactor run_monetdb
     fi
 
     set +e
@@ -273,8 +614,13 @@ function visualize () {
         local argWithoutMonetDB="--withoutMonetDB"
     fi
 
+    if [[ $force ]]
+    then
+        local argForce="--force"
+    fi
+
     # Note: $queries must not be in quotation marks here.
-    scripts/dias_ssb.py -sf $scaleFactor -ps $processingStyle -r $repetitions -q $queries $argWithoutMorphStore $argWithoutMonetDB
+    scripts/dias_ssb.py -sf $scaleFactor -ps $processingStyle -r $repetitions -q $queries $argWithoutMorphStore $argWithoutMonetDB $argForce
 
     set +e
 
@@ -339,8 +685,15 @@ useMorphStore="1"
 useMonetDB="1"
 processingStyle="avx512<v512<uint64_t>>"
 repetitions=10
+minRepetitions=""
+ciWidth=0.02
+calibrationTolerance=0.02
 repetitionsGreedy=3
+countJobs=1
+materializeTbls=""
+estimateSizes=""
 queries="1.1 1.2 1.3 2.1 2.2 2.3 3.1 3.2 3.3 3.4 4.1 4.2 4.3"
+force=""
 
 # -----------------------------------------------------------------------------
 # Parsing
@@ -387,6 +740,22 @@ do
             repetitions=$2
             shift
             ;;
+        --minRepetitions)
+            minRepetitions=$2
+            shift
+            ;;
+        --ciWidth)
+            ciWidth=$2
+            shift
+            ;;
+        --calibrationTolerance)
+            calibrationTolerance=$2
+            shift
+            ;;
+        -j|--jobs)
+            countJobs=$2
+            shift
+            ;;
         -g|--repetitionsGreedy)
             repetitionsGreedy=$2
             shift
@@ -401,6 +770,15 @@ do
         --withoutMonetDB)
             useMonetDB=""
             ;;
+        --materializeTbls)
+            materializeTbls="1"
+            ;;
+        --estimateSizes)
+            estimateSizes="1"
+            ;;
+        -f|--force)
+            force="1"
+            ;;
         *)
             printf "unknown option: $key\n"
             exit -1
@@ -419,12 +797,31 @@ then
     exit -1
 fi
 
+# By default, we always execute the maximum number of repetitions.
+if [[ ! $minRepetitions ]]
+then
+    minRepetitions=$repetitions
+fi
+if [[ $minRepetitions -gt $repetitions ]]
+then
+    printf "the minimum number of repetitions must not exceed the number of repetitions\n"
+    exit -1
+fi
+
 # -----------------------------------------------------------------------------
 # Setting some paths
 # -----------------------------------------------------------------------------
 
 pathRoot=$(pwd)
 pathDBGen=$pathRoot/ssb-dbgen
+# The .tbl-file of each SSB table and the argument of dbgen's -T option for it.
+declare -A dbgenTableMap=(
+    [customer]=c
+    [part]=p
+    [supplier]=s
+    [date]=d
+    [lineorder]=l
+)
 
 pathMorphStore=$pathRoot/MorphStore
 pathEngine=$pathMorphStore/Engine
@@ -442,11 +839,16 @@ pathData=$pathArtifacts/data_sf$scaleFactor
 pathDataTblsDict=$pathData/tbls_dict
 pathDataStatsDict=$pathData/stats_dict
 pathMal=$pathBenchmarks/ssb/mal_sf$scaleFactor
+pathDataCh=$pathArtifacts/dc_sf$scaleFactor
+pathSizes=$pathArtifacts/size_sf$scaleFactor
 pathRefRes=$pathBenchmarks/ssb/refres_sf$scaleFactor
 pathBest=$pathArtifacts/ssb_formats_bestperf_sf$scaleFactor
 pathWorst=$pathArtifacts/ssb_formats_worstperf_sf$scaleFactor
 pathTimesMorphStore=$pathArtifacts/times_MorphStore_sf${scaleFactor}
 pathTimesMonetDB=$pathArtifacts/times_MonetDB_sf${scaleFactor}
+pathBuilds=$pathRoot/builds_MorphStore
+pathManifests=$pathArtifacts/manifests
+manifest=$pathRoot/scripts/manifest.py
 
 pathMonetDB=$pathRoot/MonetDB
 pathMonetDBInstalled=$pathMonetDB/monetdb